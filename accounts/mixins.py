@@ -0,0 +1,44 @@
+"""
+Outils d'authentification pour les vues asynchrones (ASGI)
+"""
+from asgiref.sync import sync_to_async
+from django.contrib.auth.views import redirect_to_login
+
+from .models import UserProfile
+
+
+class AsyncLoginRequiredMixin:
+    """
+    Équivalent de LoginRequiredMixin pour les vues `async def`.
+    L'utilisateur (et donc la session) est chargé une seule fois dans un thread,
+    la suite de la vue peut ensuite lire request.user sans accès base synchrone.
+    """
+
+    login_url = '/accounts/login/'
+    redirect_field_name = 'next'
+
+    async def dispatch(self, request, *args, **kwargs):
+        is_authenticated = await sync_to_async(lambda: request.user.is_authenticated)()
+        if not is_authenticated:
+            return redirect_to_login(request.get_full_path(), self.login_url, self.redirect_field_name)
+        return await super().dispatch(request, *args, **kwargs)
+
+
+async def aget_or_create_profile(request):
+    """
+    Version asynchrone de _get_or_create_profile (ORM async de Django) :
+    récupère (ou crée) le UserProfile de l'utilisateur connecté
+    et synchronise son id dans la session (user_profile_id).
+    """
+    profile = await UserProfile.objects.filter(user=request.user).afirst()
+    if not profile:
+        if not request.session.session_key:
+            await sync_to_async(request.session.save)()
+        profile = await UserProfile.objects.acreate(
+            user=request.user,
+            session_key=request.session.session_key or '',
+            profile_type=request.session.get('profile_type', 'beginner'),
+            market_preference=request.session.get('market_preference', 'crypto'),
+        )
+    request.session['user_profile_id'] = profile.id
+    return profile
@@ -1,4 +1,9 @@
 from django.contrib import admin
+from .models import Kline
 
-# No models to register for api_services app
 
+@admin.register(Kline)
+class KlineAdmin(admin.ModelAdmin):
+    list_display = ['symbol', 'interval', 'open_time', 'open', 'high', 'low', 'close', 'volume']
+    list_filter = ['interval']
+    search_fields = ['symbol']
@@ -0,0 +1,531 @@
+"""
+Client asyncio pour l'API Binance Spot
+Même interface que BinanceAPIService, mais non bloquant (httpx.AsyncClient) :
+sous ASGI, une vue peut lancer ses appels amont avec asyncio.gather sans
+immobiliser un thread par requête.
+"""
+import asyncio
+import random
+import threading
+import time
+import weakref
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import DatabaseError
+
+from . import json_codec, kline_store
+from .binance_service import (
+    BinanceAPIService, _cache, _order_books, _popular_pairs, _published_depth, _published_price,
+    _published_snapshot, _published_ticker, _published_trades, _tickers, _with_live_kline,
+)
+from .circuit_breaker import CircuitOpen, breakers, is_outage, last_known_good
+from .http import get_timeout
+from .rate_limit import RateLimitExceeded, limiter, request_weight
+from .ranking import BY_VOLUME
+from .records import klines_from_api, trades_from_api
+from .snapshot import TickerSnapshot
+from .symbols import SymbolRegistry
+
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Erreurs amont gérées comme côté synchrone (valeur par défaut + log)
+UPSTREAM_ERRORS = (httpx.HTTPError, RateLimitExceeded, CircuitOpen)
+
+
+class _LoopState:
+    """Client HTTP et requêtes en vol propres à une boucle d'événements"""
+
+    def __init__(self):
+        pool_size = getattr(settings, 'BINANCE_HTTP_POOL_SIZE', 20)
+        self.client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+            headers={'Accept': 'application/json'},
+        )
+        self.inflight: Dict[Tuple, asyncio.Future] = {}
+        self.refreshing: Dict[Tuple, asyncio.Task] = {}  # rafraîchissements en arrière-plan
+
+
+# Un AsyncClient ne peut pas être partagé entre boucles d'événements
+_loop_states: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopState]" = weakref.WeakKeyDictionary()
+
+
+def _get_loop_state() -> _LoopState:
+    loop = asyncio.get_running_loop()
+    state = _loop_states.get(loop)
+    if state is None:
+        state = _LoopState()
+        _loop_states[loop] = state
+    return state
+
+
+async def _off_loop(func, *args) -> Any:
+    """
+    Lecture des données publiées par le démon de flux hors de la boucle : le
+    cache partagé est un FileBasedCache (lecture disque, unpickling, et écriture
+    pour mark_watched), qui bloquerait toutes les requêtes en cours.
+    """
+    return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+
+def _retry_delay(attempt: int, response: Optional[httpx.Response]) -> Optional[float]:
+    """
+    Délai avant la prochaine tentative (backoff exponentiel + jitter),
+    ou None s'il ne faut pas réessayer (Retry-After trop long).
+    """
+    if response is not None:
+        retry_after = response.headers.get('Retry-After')
+        if retry_after:
+            try:
+                delay = float(retry_after)
+            except ValueError:
+                delay = None
+            if delay is not None:
+                if delay > getattr(settings, 'BINANCE_HTTP_MAX_RETRY_AFTER', 5):
+                    return None
+                return delay
+    backoff = getattr(settings, 'BINANCE_HTTP_BACKOFF', 0.3) * (2 ** attempt)
+    return backoff + random.uniform(0, getattr(settings, 'BINANCE_HTTP_BACKOFF_JITTER', 0.2))
+
+
+def _refresh_in_background(key: Tuple, coroutine) -> None:
+    """
+    Lance un rafraîchissement stale-while-revalidate, sauf s'il y en a déjà un
+    pour cette clé sur la boucle courante. Les erreurs sont journalisées :
+    l'ancienne valeur reste servie jusqu'à la fin de sa fenêtre de péremption.
+    """
+    state = _get_loop_state()
+    if key in state.refreshing or key in state.inflight:
+        coroutine.close()
+        return
+
+    async def run():
+        try:
+            await coroutine
+        except Exception as e:
+            print(f"Rafraîchissement du cache en échec ({key[0]}): {e}")
+        finally:
+            state.refreshing.pop(key, None)
+
+    state.refreshing[key] = asyncio.ensure_future(run())
+
+
+class AsyncBinanceAPIService:
+    """Service asynchrone pour récupérer les données de l'API Binance"""
+
+    BASE_URL = BinanceAPIService.BASE_URL
+    CACHE_TTL = BinanceAPIService.CACHE_TTL
+    DEFAULT_CACHE_TTL = BinanceAPIService.DEFAULT_CACHE_TTL
+    CACHE_STALE = BinanceAPIService.CACHE_STALE
+
+    # Helpers de formatage communs avec le client synchrone
+    format_price_change = staticmethod(BinanceAPIService.format_price_change)
+    format_volume = staticmethod(BinanceAPIService.format_volume)
+    format_price = staticmethod(BinanceAPIService.format_price)
+    get_cache_stats = staticmethod(BinanceAPIService.get_cache_stats)
+    get_breaker_status = staticmethod(BinanceAPIService.get_breaker_status)
+    get_degraded_endpoints = staticmethod(BinanceAPIService.get_degraded_endpoints)
+    get_as_of = staticmethod(BinanceAPIService.get_as_of)
+    get_rate_limit_status = staticmethod(BinanceAPIService.get_rate_limit_status)
+    has_budget = staticmethod(BinanceAPIService.has_budget)
+    get_budget_wait = staticmethod(BinanceAPIService.get_budget_wait)
+    clear_cache = staticmethod(BinanceAPIService.clear_cache)
+
+    @staticmethod
+    async def _http_get(endpoint: str, path: str, params: Dict) -> Any:
+        """GET avec retries sur erreurs de connexion et 429/5xx. Lève httpx.HTTPError ou RateLimitExceeded."""
+        client = _get_loop_state().client
+        connect, read = get_timeout(endpoint)
+        timeout = httpx.Timeout(read, connect=connect)
+        retries = getattr(settings, 'BINANCE_HTTP_RETRIES', 3)
+
+        attempt = 0
+        while True:
+            response = None
+            delay = limiter.reserve(request_weight(path, params))
+            if delay > 0:
+                await asyncio.sleep(delay)
+            try:
+                response = await client.get(
+                    f"{AsyncBinanceAPIService.BASE_URL}{path}", params=params, timeout=timeout
+                )
+                limiter.update_from_headers(response.status_code, response.headers)
+                if response.status_code not in RETRY_STATUSES:
+                    response.raise_for_status()
+                    return json_codec.loads(response.content)
+                error = httpx.HTTPStatusError(
+                    f"HTTP {response.status_code}", request=response.request, response=response
+                )
+            except (httpx.ConnectError, httpx.ConnectTimeout) as e:
+                error = e
+
+            delay = _retry_delay(attempt, response) if attempt < retries else None
+            if delay is None:
+                raise error
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    @staticmethod
+    async def _request(endpoint: str, path: str, params: Optional[Dict] = None,
+                       allow_stale: bool = True, fallback: bool = True) -> Any:
+        """
+        Équivalent asynchrone de BinanceAPIService._request : même cache partagé,
+        stale-while-revalidate (rafraîchissement dans une tâche de fond),
+        déduplication des appels concurrents d'une même boucle d'événements,
+        mêmes disjoncteurs et même repli sur la dernière réponse valide.
+        """
+        params = params or {}
+        key = (endpoint, tuple(sorted(params.items())))
+        hit, value = _cache.lookup(key)
+        if hit:
+            return value
+
+        if allow_stale and AsyncBinanceAPIService.CACHE_STALE.get(endpoint, 0):
+            stale, value = _cache.lookup(key, stale_ok=True)
+            if stale:
+                _refresh_in_background(key, AsyncBinanceAPIService._load(endpoint, path, params, key))
+                return value
+
+        try:
+            return await AsyncBinanceAPIService._load(endpoint, path, params, key)
+        except UPSTREAM_ERRORS as e:
+            if not fallback or not (isinstance(e, (CircuitOpen, RateLimitExceeded)) or is_outage(e)):
+                raise
+            saved = await sync_to_async(last_known_good.load)(endpoint, params)
+            if saved is None:
+                raise
+            ttl = AsyncBinanceAPIService.CACHE_TTL.get(endpoint, AsyncBinanceAPIService.DEFAULT_CACHE_TTL)
+            _cache.set(key, saved['data'], ttl, AsyncBinanceAPIService.CACHE_STALE.get(endpoint, 0),
+                       fetched_at=saved['stored_at'])
+            return saved['data']
+
+    @staticmethod
+    async def _load(endpoint: str, path: str, params: Dict, key: Tuple) -> Any:
+        """Appel amont dédupliqué par boucle d'événements, résultat mis en cache"""
+        state = _get_loop_state()
+        future = state.inflight.get(key)
+        if future is not None:
+            _cache.record_miss(coalesced=True)
+            return await asyncio.shield(future)
+
+        _cache.record_miss()
+        future = asyncio.get_running_loop().create_future()
+        state.inflight[key] = future
+        breaker = breakers.get(endpoint)
+        try:
+            breaker.before_call()
+            started = time.monotonic()
+            try:
+                value = await AsyncBinanceAPIService._http_get(endpoint, path, params)
+            except Exception as e:
+                breaker.record(time.monotonic() - started, e)
+                raise
+            except BaseException:
+                breaker.release()  # annulation : ni succès ni échec
+                raise
+            breaker.record(time.monotonic() - started)
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # marqué comme récupéré si personne n'attendait
+            raise
+        else:
+            # Écriture sur disque hors de la boucle, sans attendre
+            asyncio.get_running_loop().run_in_executor(None, last_known_good.save, endpoint, params, value)
+            ttl = AsyncBinanceAPIService.CACHE_TTL.get(endpoint, AsyncBinanceAPIService.DEFAULT_CACHE_TTL)
+            _cache.set(key, value, ttl, AsyncBinanceAPIService.CACHE_STALE.get(endpoint, 0))
+            future.set_result(value)
+            return value
+        finally:
+            state.inflight.pop(key, None)
+
+    @staticmethod
+    async def _derived(key: Tuple, endpoint: str, loader) -> Any:
+        """
+        Objet construit à partir de réponses amont (instantané, référentiel, klines
+        stockées), mis en cache avec le TTL et la fenêtre de péremption de
+        `endpoint`. loader() est une coroutine ; un résultat vide n'est pas mis en cache.
+        """
+        hit, value = _cache.lookup(key)
+        if hit:
+            return value
+
+        async def load():
+            value = await loader()
+            if value:
+                ttl = AsyncBinanceAPIService.CACHE_TTL.get(endpoint, AsyncBinanceAPIService.DEFAULT_CACHE_TTL)
+                _cache.set(key, value, ttl, AsyncBinanceAPIService.CACHE_STALE.get(endpoint, 0))
+            return value
+
+        stale, value = _cache.lookup(key, stale_ok=True)
+        if stale:
+            _refresh_in_background(key, load())
+            return value
+        return await load()
+
+    @staticmethod
+    async def fetch_many(calls: Dict[str, Tuple], deadline: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Équivalent asynchrone de BinanceAPIService.fetch_many :
+        calls = {'nom': (coroutine_function, arg1, ...)}, résultats partiels (None)
+        pour les appels en erreur ou non terminés à l'échéance.
+        """
+        if deadline is None:
+            deadline = getattr(settings, 'BINANCE_FETCH_DEADLINE', 8)
+
+        tasks = {name: asyncio.ensure_future(call[0](*call[1:])) for name, call in calls.items()}
+        if tasks:
+            await asyncio.wait(tasks.values(), timeout=deadline)
+
+        results = {}
+        for name, task in tasks.items():
+            if not task.done():
+                task.cancel()
+                print(f"Erreur API Binance ({name}): délai de {deadline}s dépassé")
+                results[name] = None
+            elif task.exception() is not None:
+                print(f"Erreur API Binance ({name}): {task.exception()}")
+                results[name] = None
+            else:
+                results[name] = task.result()
+        return results
+
+    @staticmethod
+    async def get_24hr_ticker(symbol: Optional[str] = None) -> Dict:
+        """
+        Récupère les statistiques de prix sur 24h
+        Endpoint: /api/v3/ticker/24hr
+        """
+        published = await _off_loop(_published_ticker, symbol)
+        if published:
+            return published
+
+        params = {}
+        if symbol:
+            params['symbol'] = symbol
+
+        try:
+            return _tickers(await AsyncBinanceAPIService._request('ticker_24hr', '/api/v3/ticker/24hr', params))
+        except UPSTREAM_ERRORS as e:
+            print(f"Erreur API Binance (24hr ticker): {e}")
+            return {} if symbol else []
+
+    @staticmethod
+    async def get_ticker_snapshot() -> TickerSnapshot:
+        """
+        Tickers 24h de toutes les paires, indexés par symbole
+        Endpoint: /api/v3/ticker/24hr
+        """
+        published = await _off_loop(_published_snapshot)
+        if published:
+            return published
+
+        async def load():
+            try:
+                tickers = await AsyncBinanceAPIService._request(
+                    'ticker_24hr', '/api/v3/ticker/24hr', allow_stale=False
+                )
+            except UPSTREAM_ERRORS as e:
+                print(f"Erreur API Binance (ticker snapshot): {e}")
+                return TickerSnapshot()
+            return TickerSnapshot(tickers, fetched_at=AsyncBinanceAPIService.get_as_of('ticker_24hr'))
+
+        return await AsyncBinanceAPIService._derived(('ticker_snapshot',), 'ticker_24hr', load)
+
+    @staticmethod
+    async def get_popular_pairs(limit: Optional[int] = None, by: str = BY_VOLUME,
+                                snapshot: Optional[TickerSnapshot] = None) -> List[str]:
+        """Paires les plus actives, comme BinanceAPIService.get_popular_pairs"""
+        if snapshot is None:
+            snapshot = await AsyncBinanceAPIService.get_ticker_snapshot()
+        registry = await AsyncBinanceAPIService.get_symbol_registry()
+        return _popular_pairs(snapshot, limit, by, registry)
+
+    @staticmethod
+    async def get_exchange_info() -> Dict:
+        """
+        Récupère les informations sur l'exchange
+        Endpoint: /api/v3/exchangeInfo
+        """
+        try:
+            return await AsyncBinanceAPIService._request('exchange_info', '/api/v3/exchangeInfo')
+        except UPSTREAM_ERRORS as e:
+            print(f"Erreur API Binance (exchange info): {e}")
+            return {}
+
+    @staticmethod
+    async def get_symbol_registry() -> SymbolRegistry:
+        """
+        Référentiel des paires indexé par symbole, cotation et base
+        Endpoint: /api/v3/exchangeInfo
+        """
+        async def load():
+            try:
+                exchange_info = await AsyncBinanceAPIService._request(
+                    'exchange_info', '/api/v3/exchangeInfo', allow_stale=False
+                )
+            except UPSTREAM_ERRORS as e:
+                print(f"Erreur API Binance (symbol registry): {e}")
+                return SymbolRegistry()
+            return SymbolRegistry(exchange_info, fetched_at=AsyncBinanceAPIService.get_as_of('exchange_info'))
+
+        return await AsyncBinanceAPIService._derived(('symbol_registry',), 'exchange_info', load)
+
+    @staticmethod
+    async def get_klines(symbol: str, interval: str = '1d', limit: int = 30) -> List:
+        """
+        Récupère les données de chandelier (klines/candlesticks)
+        Endpoint: /api/v3/klines
+        """
+        params = {
+            'symbol': symbol,
+            'interval': interval,
+            'limit': limit
+        }
+
+        try:
+            if kline_store.is_enabled(interval):
+                klines = await AsyncBinanceAPIService._get_stored_klines(symbol, interval, limit)
+            else:
+                klines = klines_from_api(await AsyncBinanceAPIService._request('klines', '/api/v3/klines', params))
+            return await _off_loop(_with_live_kline, symbol, interval, klines)
+        except UPSTREAM_ERRORS as e:
+            print(f"Erreur API Binance (klines): {e}")
+            return []
+
+    @staticmethod
+    async def _get_stored_klines(symbol: str, interval: str, limit: int) -> List:
+        """Klines via le stockage local (lectures/écritures en base hors de la boucle)"""
+        return await AsyncBinanceAPIService._derived(
+            ('klines_stored', symbol, interval, limit), 'klines',
+            lambda: AsyncBinanceAPIService._load_stored_klines(symbol, interval, limit),
+        )
+
+    @staticmethod
+    async def _load_stored_klines(symbol: str, interval: str, limit: int) -> List:
+        now_ms = int(time.time() * 1000)
+        try:
+            stored, params = await sync_to_async(kline_store.plan)(symbol, interval, limit, now_ms)
+        except DatabaseError:
+            stored, params = [], {'symbol': symbol, 'interval': interval, 'limit': limit}
+
+        try:
+            fetched = await AsyncBinanceAPIService._request('klines', '/api/v3/klines', params, allow_stale=False)
+        except UPSTREAM_ERRORS:
+            if stored:
+                return klines_from_api(stored[-limit:])
+            raise
+
+        try:
+            klines = await sync_to_async(kline_store.merge)(symbol, interval, stored, fetched or [], limit, now_ms)
+        except DatabaseError:
+            klines = (stored + (fetched or []))[-limit:]
+        return klines_from_api(klines)
+
+    @staticmethod
+    async def get_ticker_price(symbol: Optional[str] = None) -> Dict:
+        """
+        Récupère le prix actuel d'un symbole
+        Endpoint: /api/v3/ticker/price
+        """
+        published = await _off_loop(_published_price, symbol)
+        if published:
+            return published
+
+        params = {}
+        if symbol:
+            params['symbol'] = symbol
+
+        try:
+            return await AsyncBinanceAPIService._request('ticker_price', '/api/v3/ticker/price', params)
+        except UPSTREAM_ERRORS as e:
+            print(f"Erreur API Binance (ticker price): {e}")
+            return {} if symbol else []
+
+    @staticmethod
+    async def get_order_book(symbol: str, limit: int = 20) -> Dict:
+        """
+        Récupère le carnet d'ordres (depth)
+        Endpoint: /api/v3/depth
+        """
+        depth = await _off_loop(_published_depth, symbol, limit)
+        if depth is not None:
+            return depth
+
+        # Le carnet local ne bloque jamais : chargement en arrière-plan
+        if _order_books is not None:
+            depth = _order_books.get_depth(symbol, limit)
+            if depth is not None:
+                return depth
+
+        params = {
+            'symbol': symbol,
+            'limit': limit
+        }
+
+        try:
+            return await AsyncBinanceAPIService._request('order_book', '/api/v3/depth', params)
+        except UPSTREAM_ERRORS as e:
+            print(f"Erreur API Binance (order book): {e}")
+            return {}
+
+    @staticmethod
+    async def get_recent_trades(symbol: str, limit: int = 20) -> List:
+        """
+        Récupère les transactions récentes
+        Endpoint: /api/v3/trades
+        """
+        trades = await _off_loop(_published_trades, symbol, limit)
+        if trades is not None:
+            return trades
+
+        params = {
+            'symbol': symbol,
+            'limit': limit
+        }
+
+        try:
+            return trades_from_api(await AsyncBinanceAPIService._request('recent_trades', '/api/v3/trades', params))
+        except UPSTREAM_ERRORS as e:
+            print(f"Erreur API Binance (recent trades): {e}")
+            return []
+
+
+class SyncBinanceAdapter:
+    """
+    Adaptateur synchrone du client asyncio.
+    Les coroutines tournent sur une boucle d'événements dédiée (thread de fond),
+    ce qui conserve le pool de connexions httpx d'un appel à l'autre.
+
+    Usage: SyncBinanceAdapter().get_24hr_ticker('BTCUSDT')
+    """
+
+    _loop: Optional[asyncio.AbstractEventLoop] = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def _get_loop(cls) -> asyncio.AbstractEventLoop:
+        if cls._loop is None:
+            with cls._lock:
+                if cls._loop is None:
+                    loop = asyncio.new_event_loop()
+                    threading.Thread(
+                        target=loop.run_forever, name='binance-async-loop', daemon=True
+                    ).start()
+                    cls._loop = loop
+        return cls._loop
+
+    def __getattr__(self, name):
+        attr = getattr(AsyncBinanceAPIService, name)
+        if not asyncio.iscoroutinefunction(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            future = asyncio.run_coroutine_threadsafe(attr(*args, **kwargs), self._get_loop())
+            return future.result()
+
+        call.__name__ = name
+        call.__doc__ = attr.__doc__
+        return call
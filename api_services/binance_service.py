@@ -2,15 +2,343 @@
 Service pour interagir avec l'API Binance Spot
 Documentation: https://binance-docs.github.io/apidocs/spot/en/
 """
+import time
+
 import requests
+from concurrent.futures import ThreadPoolExecutor, wait
 from django.conf import settings
-from typing import List, Dict, Optional
+from django.utils.module_loading import import_string
+from typing import Any, Callable, List, Dict, Optional, Tuple
+
+from . import json_codec, kline_store, market_data, ranking
+from .cache import MarketDataCache
+from .circuit_breaker import CircuitOpen, breakers, is_outage, last_known_good
+from .http import get_session, get_timeout
+from .order_book import OrderBookManager
+from .rate_limit import RateLimitExceeded, limiter, request_weight
+from .records import Kline, Ticker, Trade, klines_from_api, tickers_from_api, trades_from_api
+from .snapshot import TickerSnapshot
+from .symbols import SymbolRegistry
+
+
+# Cache partagé par tous les appels du processus
+_cache = MarketDataCache(getattr(settings, 'BINANCE_CACHE_MAX_ENTRIES', 1024))
+
+
+class _WorkerPool(ThreadPoolExecutor):
+    """
+    Pool de threads hors requête : chaque tâche (qui peut lire ou écrire les
+    klines stockées) ferme ses connexions à la base comme une requête Django.
+    """
+
+    def submit(self, fn, /, *args, **kwargs):
+        return super().submit(kline_store.closing_connections, fn, *args, **kwargs)
+
+
+# Pool borné pour les appels amont concurrents des requêtes (fetch_many). Un
+# appel dépassé à l'échéance du lot n'est pas interrompu : il garde son thread
+# jusqu'au timeout HTTP. Ce pool lui est réservé pour que ces appels ne
+# retardent pas les tâches de fond ; voir BINANCE_FETCH_WORKERS.
+_fetch_executor = _WorkerPool(
+    max_workers=getattr(settings, 'BINANCE_FETCH_WORKERS', 16),
+    thread_name_prefix='binance-fetch',
+)
+
+# Tâches de fond : rafraîchissements stale-while-revalidate, instantanés des carnets
+_executor = _WorkerPool(
+    max_workers=getattr(settings, 'BINANCE_BACKGROUND_WORKERS', 8),
+    thread_name_prefix='binance-background',
+)
+
+
+def _build_order_books() -> Optional[OrderBookManager]:
+    """Carnets d'ordres locaux, si une source de flux diff-depth est configurée"""
+    source_path = getattr(settings, 'BINANCE_ORDER_BOOK_SOURCE', '')
+    if not source_path:
+        return None
+    snapshot_limit = getattr(settings, 'BINANCE_ORDER_BOOK_SNAPSHOT_LIMIT', 1000)
+    return OrderBookManager(
+        source=import_string(source_path)(),
+        fetch_snapshot=lambda symbol: BinanceAPIService._request(
+            'order_book_snapshot', '/api/v3/depth', {'symbol': symbol, 'limit': snapshot_limit}
+        ),
+        executor=_executor,
+        max_symbols=getattr(settings, 'BINANCE_ORDER_BOOK_MAX_SYMBOLS', 20),
+        idle_timeout=getattr(settings, 'BINANCE_ORDER_BOOK_IDLE_TIMEOUT', 60),
+    )
+
+
+# Carnets d'ordres des symboles consultés (None si désactivé)
+_order_books = _build_order_books()
+
+
+# Données publiées par le démon de flux (api_services.market_data) : relues
+# au plus une fois par seconde et par processus
+PUBLISHED_TTL = 1
+
+
+def _published(key: str, convert: Optional[Callable[[Dict], Any]] = None) -> Any:
+    """Données publiées sous `key` si elles sont fraîches, sinon None"""
+    def load():
+        payload = market_data.read_published(key)
+        if payload is None:
+            return None
+        return convert(payload) if convert else payload['data']
+
+    return _cache.get_or_fetch(('published', key), PUBLISHED_TTL, load)
+
+
+def _published_snapshot() -> Optional[TickerSnapshot]:
+    """Table des prix tenue par le démon de flux"""
+    return _published(
+        market_data.TICKERS_KEY,
+        lambda payload: TickerSnapshot(payload['data'], fetched_at=payload['published_at']),
+    )
+
+
+def _published_ticker(symbol: Optional[str]) -> Any:
+    """Ticker 24h (ou liste complète) depuis la table publiée, None si indisponible"""
+    snapshot = _published_snapshot()
+    if not snapshot:
+        return None
+    return snapshot.get(symbol) if symbol else snapshot.tickers
+
+
+def _published_price(symbol: Optional[str]) -> Any:
+    """Prix au format /api/v3/ticker/price depuis la table publiée, None si indisponible"""
+    snapshot = _published_snapshot()
+    if not snapshot:
+        return None
+    if not symbol:
+        return [{'symbol': t.symbol, 'price': t['lastPrice']} for t in snapshot.tickers]
+    ticker = snapshot.get(symbol)
+    return {'symbol': ticker['symbol'], 'price': ticker['lastPrice']} if ticker else None
+
+
+def _daemon_running() -> bool:
+    """
+    True si le démon de flux publie (table des prix fraîche). Sinon les vues
+    ne lui signalent pas les symboles consultés : aucune écriture dans le cache
+    partagé pour un démon absent.
+    """
+    return _published_snapshot() is not None
+
+
+def _published_depth(symbol: str, limit: int) -> Optional[Dict]:
+    """Carnet publié par le démon ; signale le symbole comme consulté"""
+    if not _daemon_running():
+        return None
+    market_data.mark_watched(symbol)
+    depth = _published(market_data.depth_key(symbol))
+    if depth is None:
+        return None
+    return {'lastUpdateId': depth['lastUpdateId'], 'bids': depth['bids'][:limit], 'asks': depth['asks'][:limit]}
+
+
+def _published_trades(symbol: str, limit: int) -> Optional[List[Trade]]:
+    """Trades récents publiés par le démon ; signale le symbole comme consulté"""
+    if not _daemon_running():
+        return None
+    market_data.mark_watched(symbol)
+    trades = _published(market_data.trades_key(symbol))
+    return trades_from_api(trades[-limit:]) if trades is not None else None
+
+
+def _with_live_kline(symbol: str, interval: str, klines: List[Kline]) -> List[Kline]:
+    """Remplace (ou ajoute) le chandelier en cours par celui du flux, s'il est publié"""
+    live = _published(market_data.kline_key(symbol, interval)) if klines else None
+    if not live:
+        return klines
+    live = Kline.from_api(live)
+    last_open = klines[-1].open_time
+    if live.open_time == last_open:
+        return klines[:-1] + [live]
+    if live.open_time - last_open == kline_store.INTERVAL_MS.get(interval):
+        return klines[1:] + [live]
+    return klines
+
+
+def _popular_pairs(snapshot: TickerSnapshot, limit: Optional[int], by: str,
+                   registry: Optional[SymbolRegistry] = None) -> List[str]:
+    """
+    Top des paires de l'instantané (BinanceAPIService.get_popular_pairs).
+    Un référentiel vide (exchangeInfo indisponible) laisse le précédent en place.
+    """
+    limit = limit if limit is not None else BinanceAPIService.POPULAR_PAIRS_COUNT
+    if snapshot:
+        ranked = ranking.get_pair_ranking(
+            snapshot,
+            quotes=BinanceAPIService.POPULAR_QUOTES,
+            size=max(limit, BinanceAPIService.POPULAR_PAIRS_COUNT),
+            min_quote_volume=BinanceAPIService.MOVERS_MIN_QUOTE_VOLUME,
+            registry=registry or None,
+        ).top(limit, by)
+        if ranked:
+            return ranked
+    return BinanceAPIService.FALLBACK_POPULAR_PAIRS[:limit]
+
+
+def _tickers(data: Any) -> Any:
+    """Réponse /api/v3/ticker/24hr (un symbole ou tous) en enregistrements Ticker"""
+    if isinstance(data, list):
+        return tickers_from_api(data)
+    return Ticker.from_api(data) if data else data
 
 
 class BinanceAPIService:
     """Service pour récupérer les données de l'API Binance"""
     
     BASE_URL = settings.BINANCE_API_BASE_URL
+
+    # Durée de vie (secondes) des réponses en cache, par endpoint
+    CACHE_TTL = getattr(settings, 'BINANCE_CACHE_TTL', {})
+    DEFAULT_CACHE_TTL = 2
+
+    # Stale-while-revalidate : durée (secondes, après le TTL) pendant laquelle une
+    # réponse expirée est encore servie, le temps d'un rafraîchissement en arrière-plan
+    CACHE_STALE = getattr(settings, 'BINANCE_CACHE_STALE', {})
+
+    # Paires populaires : classement dynamique de l'instantané (api_services.ranking)
+    POPULAR_PAIRS_COUNT = getattr(settings, 'BINANCE_POPULAR_PAIRS_COUNT', 15)
+    POPULAR_QUOTES = tuple(getattr(settings, 'BINANCE_POPULAR_QUOTES', ('USDT',)))
+    MOVERS_MIN_QUOTE_VOLUME = getattr(settings, 'BINANCE_MOVERS_MIN_QUOTE_VOLUME', 1_000_000)
+    # Utilisées seulement si l'instantané des tickers est indisponible
+    FALLBACK_POPULAR_PAIRS = [
+        'BTCUSDT', 'ETHUSDT', 'BNBUSDT', 'XRPUSDT', 'SOLUSDT',
+        'DOGEUSDT', 'ADAUSDT', 'TRXUSDT', 'LINKUSDT', 'AVAXUSDT',
+        'DOTUSDT', 'LTCUSDT', 'UNIUSDT', 'ATOMUSDT', 'ETCUSDT',
+    ]
+
+    @staticmethod
+    def _request(endpoint: str, path: str, params: Optional[Dict] = None, allow_stale: bool = True,
+                 fallback: bool = True) -> Any:
+        """
+        Appel GET vers Binance via le cache partagé.
+        Les requêtes identiques (même endpoint, mêmes paramètres) sont servies
+        depuis le cache tant que le TTL n'est pas expiré, et les appels
+        concurrents sur une même clé ne déclenchent qu'une seule requête amont.
+        Seuls les défauts de cache consomment du poids Binance : chaque appel
+        amont passe d'abord par le limiteur (RateLimitExceeded si le budget est épuisé).
+        Une réponse expirée depuis moins de CACHE_STALE[endpoint] secondes est
+        retournée tout de suite et rafraîchie en arrière-plan (sauf allow_stale=False).
+        Chaque endpoint a son disjoncteur (api_services.circuit_breaker) : ouvert,
+        l'appel échoue sans attendre Binance. En cas de panne, la dernière réponse
+        valide conservée est servie (sauf fallback=False), datée par get_as_of().
+        Lève requests.exceptions.RequestException en cas d'erreur (jamais mise en cache).
+        """
+        params = params or {}
+        key = (endpoint, tuple(sorted(params.items())))
+        ttl = BinanceAPIService.CACHE_TTL.get(endpoint, BinanceAPIService.DEFAULT_CACHE_TTL)
+        stale_ttl = BinanceAPIService.CACHE_STALE.get(endpoint, 0)
+
+        breaker = breakers.get(endpoint)
+
+        def load():
+            breaker.before_call()
+            started = time.monotonic()
+            try:
+                limiter.acquire(request_weight(path, params))
+                response = get_session().get(
+                    f"{BinanceAPIService.BASE_URL}{path}", params=params, timeout=get_timeout(endpoint)
+                )
+                limiter.update_from_headers(response.status_code, response.headers)
+                response.raise_for_status()
+                value = json_codec.loads(response.content)
+            except Exception as e:
+                breaker.record(time.monotonic() - started, e)
+                raise
+            breaker.record(time.monotonic() - started)
+            last_known_good.save(endpoint, params, value)
+            return value
+
+        try:
+            return _cache.get_or_fetch(key, ttl, load, stale_ttl, _executor if allow_stale else None)
+        except requests.exceptions.RequestException as e:
+            if not fallback or not (isinstance(e, (CircuitOpen, RateLimitExceeded)) or is_outage(e)):
+                raise
+            saved = last_known_good.load(endpoint, params)
+            if saved is None:
+                raise
+            # Remise en cache avec sa date d'origine : get_as_of() en donne l'âge réel
+            _cache.set(key, saved['data'], ttl, stale_ttl, fetched_at=saved['stored_at'])
+            return saved['data']
+
+    @staticmethod
+    def get_as_of(endpoint: str, params: Optional[Dict] = None) -> Optional[float]:
+        """Date (timestamp) de la réponse en cache pour cet appel, None si absente"""
+        return _cache.fetched_at((endpoint, tuple(sorted((params or {}).items()))))
+
+    @staticmethod
+    def fetch_many(calls: Dict[str, Tuple], deadline: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Exécute plusieurs appels en parallèle sur le pool dédié (_fetch_executor).
+        
+        calls: {'nom': (méthode, arg1, arg2, ...)}, par exemple
+            {'ticker': (BinanceAPIService.get_24hr_ticker, 'BTCUSDT'),
+             'klines_1h': (BinanceAPIService.get_klines, 'BTCUSDT', '1h', 24)}
+        deadline: durée maximale (secondes) pour l'ensemble du lot.
+        
+        Retourne {'nom': résultat}. Les appels en erreur ou non terminés à
+        l'échéance valent None : le résultat est partiel mais jamais bloquant.
+        """
+        if deadline is None:
+            deadline = getattr(settings, 'BINANCE_FETCH_DEADLINE', 8)
+
+        futures = {}
+        for name, call in calls.items():
+            func: Callable = call[0]
+            futures[name] = _fetch_executor.submit(func, *call[1:])
+
+        wait(futures.values(), timeout=deadline)
+
+        results = {}
+        for name, future in futures.items():
+            if not future.done():
+                future.cancel()
+                print(f"Erreur API Binance ({name}): délai de {deadline}s dépassé")
+                results[name] = None
+                continue
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                print(f"Erreur API Binance ({name}): {e}")
+                results[name] = None
+        return results
+
+    @staticmethod
+    def get_rate_limit_status() -> Dict:
+        """Budget de poids Binance restant (voir api_services.rate_limit)"""
+        return limiter.status()
+
+    @staticmethod
+    def has_budget(path: str, params: Optional[Dict] = None) -> bool:
+        """True si un appel à cet endpoint peut partir immédiatement sans dépasser le budget"""
+        return limiter.has_budget(request_weight(path, params))
+
+    @staticmethod
+    def get_budget_wait(path: str, params: Optional[Dict] = None) -> float:
+        """Délai (s) avant qu'un appel à cet endpoint tienne dans le budget"""
+        return limiter.wait_time(request_weight(path, params))
+
+    @staticmethod
+    def get_breaker_status() -> Dict:
+        """État des disjoncteurs par endpoint (voir api_services.circuit_breaker)"""
+        return breakers.status()
+
+    @staticmethod
+    def get_degraded_endpoints() -> List[str]:
+        """Endpoints dont le disjoncteur est ouvert ou semi-ouvert (mode dégradé)"""
+        return breakers.degraded()
+
+    @staticmethod
+    def get_cache_stats() -> Dict:
+        """Statistiques du cache (hits, misses, appels amont évités...)"""
+        return _cache.stats()
+
+    @staticmethod
+    def clear_cache() -> None:
+        """Vide le cache des données de marché"""
+        _cache.invalidate()
     
     @staticmethod
     def get_24hr_ticker(symbol: Optional[str] = None) -> Dict:
@@ -18,35 +346,86 @@ class BinanceAPIService:
         Récupère les statistiques de prix sur 24h
         Endpoint: /api/v3/ticker/24hr
         """
-        url = f"{BinanceAPIService.BASE_URL}/api/v3/ticker/24hr"
+        published = _published_ticker(symbol)
+        if published:
+            return published
+
         params = {}
         if symbol:
             params['symbol'] = symbol
             
         try:
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            return response.json()
+            return _tickers(BinanceAPIService._request('ticker_24hr', '/api/v3/ticker/24hr', params))
         except requests.exceptions.RequestException as e:
             print(f"Erreur API Binance (24hr ticker): {e}")
             return {} if symbol else []
     
+    @staticmethod
+    def get_ticker_snapshot() -> TickerSnapshot:
+        """
+        Récupère les tickers 24h de toutes les paires en un seul appel
+        et les indexe par symbole.
+        Endpoint: /api/v3/ticker/24hr
+        
+        À utiliser dès qu'une vue a besoin de plusieurs symboles : le coût
+        reste d'un seul appel amont (mis en cache) quel que soit leur nombre.
+        L'instantané est servi en stale-while-revalidate ; son attribut
+        fetched_at indique l'âge réel des données.
+        """
+        published = _published_snapshot()
+        if published:
+            return published
+
+        ttl = BinanceAPIService.CACHE_TTL.get('ticker_24hr', BinanceAPIService.DEFAULT_CACHE_TTL)
+        stale_ttl = BinanceAPIService.CACHE_STALE.get('ticker_24hr', 0)
+
+        def load():
+            # Jamais de réponse périmée : fetched_at doit dater les données
+            # (la dernière réponse valide d'une panne garde sa date d'origine)
+            tickers = BinanceAPIService._request('ticker_24hr', '/api/v3/ticker/24hr', allow_stale=False)
+            return TickerSnapshot(tickers, fetched_at=BinanceAPIService.get_as_of('ticker_24hr'))
+
+        try:
+            return _cache.get_or_fetch(('ticker_snapshot',), ttl, load, stale_ttl, _executor)
+        except requests.exceptions.RequestException as e:
+            print(f"Erreur API Binance (ticker snapshot): {e}")
+            return TickerSnapshot()
+    
     @staticmethod
     def get_exchange_info() -> Dict:
         """
         Récupère les informations sur l'exchange
         Endpoint: /api/v3/exchangeInfo
         """
-        url = f"{BinanceAPIService.BASE_URL}/api/v3/exchangeInfo"
-        
         try:
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            return response.json()
+            return BinanceAPIService._request('exchange_info', '/api/v3/exchangeInfo')
         except requests.exceptions.RequestException as e:
             print(f"Erreur API Binance (exchange info): {e}")
             return {}
     
+    @staticmethod
+    def get_symbol_registry() -> SymbolRegistry:
+        """
+        Référentiel des paires (actifs, statut, tickSize, stepSize) indexé
+        par symbole, actif de cotation et actif de base.
+        Endpoint: /api/v3/exchangeInfo
+        
+        Reconstruit au plus une fois par TTL 'exchange_info' ; en cas d'erreur,
+        retourne un référentiel vide (non mis en cache).
+        """
+        ttl = BinanceAPIService.CACHE_TTL.get('exchange_info', BinanceAPIService.DEFAULT_CACHE_TTL)
+        stale_ttl = BinanceAPIService.CACHE_STALE.get('exchange_info', 0)
+
+        def load():
+            exchange_info = BinanceAPIService._request('exchange_info', '/api/v3/exchangeInfo', allow_stale=False)
+            return SymbolRegistry(exchange_info, fetched_at=BinanceAPIService.get_as_of('exchange_info'))
+
+        try:
+            return _cache.get_or_fetch(('symbol_registry',), ttl, load, stale_ttl, _executor)
+        except requests.exceptions.RequestException as e:
+            print(f"Erreur API Binance (symbol registry): {e}")
+            return SymbolRegistry()
+    
     @staticmethod
     def get_klines(symbol: str, interval: str = '1d', limit: int = 30) -> List:
         """
@@ -54,8 +433,13 @@ class BinanceAPIService:
         Endpoint: /api/v3/klines
         
         Intervals possibles: 1m, 3m, 5m, 15m, 30m, 1h, 2h, 4h, 6h, 8h, 12h, 1d, 3d, 1w, 1M
+        
+        Les chandeliers clôturés sont conservés en base (api_services.kline_store) :
+        seuls les chandeliers plus récents que le dernier stocké sont redemandés.
+        Le chandelier en cours est pris dans le flux temps réel s'il est publié.
+        Retourne des enregistrements Kline (api_services.records), convertis
+        une fois par chargement.
         """
-        url = f"{BinanceAPIService.BASE_URL}/api/v3/klines"
         params = {
             'symbol': symbol,
             'interval': interval,
@@ -63,9 +447,19 @@ class BinanceAPIService:
         }
         
         try:
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            return response.json()
+            if kline_store.is_enabled(interval):
+                ttl = BinanceAPIService.CACHE_TTL.get('klines', BinanceAPIService.DEFAULT_CACHE_TTL)
+                klines = _cache.get_or_fetch(
+                    ('klines_stored', symbol, interval, limit), ttl,
+                    lambda: klines_from_api(kline_store.get_klines(
+                        symbol, interval, limit,
+                        lambda p: BinanceAPIService._request('klines', '/api/v3/klines', p, allow_stale=False),
+                    )),
+                    BinanceAPIService.CACHE_STALE.get('klines', 0), _executor,
+                )
+            else:
+                klines = klines_from_api(BinanceAPIService._request('klines', '/api/v3/klines', params))
+            return _with_live_kline(symbol, interval, klines)
         except requests.exceptions.RequestException as e:
             print(f"Erreur API Binance (klines): {e}")
             return []
@@ -76,15 +470,16 @@ class BinanceAPIService:
         Récupère le prix actuel d'un symbole
         Endpoint: /api/v3/ticker/price
         """
-        url = f"{BinanceAPIService.BASE_URL}/api/v3/ticker/price"
+        published = _published_price(symbol)
+        if published:
+            return published
+
         params = {}
         if symbol:
             params['symbol'] = symbol
             
         try:
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            return response.json()
+            return BinanceAPIService._request('ticker_price', '/api/v3/ticker/price', params)
         except requests.exceptions.RequestException as e:
             print(f"Erreur API Binance (ticker price): {e}")
             return {} if symbol else []
@@ -94,17 +489,27 @@ class BinanceAPIService:
         """
         Récupère le carnet d'ordres (depth)
         Endpoint: /api/v3/depth
+        
+        Servi depuis le démon de flux (api_services.market_data) ou le carnet
+        local (api_services.order_book) quand il est synchronisé ; sinon appel
+        REST, le temps que le carnet se charge.
         """
-        url = f"{BinanceAPIService.BASE_URL}/api/v3/depth"
+        depth = _published_depth(symbol, limit)
+        if depth is not None:
+            return depth
+
+        if _order_books is not None:
+            depth = _order_books.get_depth(symbol, limit)
+            if depth is not None:
+                return depth
+
         params = {
             'symbol': symbol,
             'limit': limit
         }
         
         try:
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            return response.json()
+            return BinanceAPIService._request('order_book', '/api/v3/depth', params)
         except requests.exceptions.RequestException as e:
             print(f"Erreur API Binance (order book): {e}")
             return {}
@@ -115,28 +520,35 @@ class BinanceAPIService:
         Récupère les transactions récentes
         Endpoint: /api/v3/trades
         """
-        url = f"{BinanceAPIService.BASE_URL}/api/v3/trades"
+        trades = _published_trades(symbol, limit)
+        if trades is not None:
+            return trades
+
         params = {
             'symbol': symbol,
             'limit': limit
         }
         
         try:
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            return response.json()
+            return trades_from_api(BinanceAPIService._request('recent_trades', '/api/v3/trades', params))
         except requests.exceptions.RequestException as e:
             print(f"Erreur API Binance (recent trades): {e}")
             return []
     
     @staticmethod
-    def get_popular_pairs() -> List[str]:
-        """Retourne une liste des paires les plus populaires"""
-        return [
-            'BTCUSDT', 'ETHUSDT', 'BNBUSDT', 'XRPUSDT', 'ADAUSDT',
-            'DOGEUSDT', 'SOLUSDT', 'MATICUSDT', 'DOTUSDT', 'LTCUSDT',
-            'AVAXUSDT', 'LINKUSDT', 'UNIUSDT', 'ATOMUSDT', 'ETCUSDT'
-        ]
+    def get_popular_pairs(limit: Optional[int] = None, by: str = ranking.BY_VOLUME,
+                          snapshot: Optional[TickerSnapshot] = None) -> List[str]:
+        """
+        Paires les plus actives : top `limit` (défaut POPULAR_PAIRS_COUNT) par
+        volume 24h en actif de cotation, ou by='change' par variation absolue
+        parmi les paires assez liquides (api_services.ranking).
+        Calculé sur l'instantané des tickers (passer celui de la vue s'il est
+        déjà chargé) et le référentiel exchangeInfo (paires ouvertes au trading) ;
+        liste de repli si l'instantané est indisponible.
+        """
+        if snapshot is None:
+            snapshot = BinanceAPIService.get_ticker_snapshot()
+        return _popular_pairs(snapshot, limit, by, BinanceAPIService.get_symbol_registry())
     
     @staticmethod
     def format_price_change(price_change_percent: str) -> str:
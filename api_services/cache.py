@@ -0,0 +1,198 @@
+"""
+Cache mémoire partagé pour les données de marché Binance
+- TTL par entrée
+- LRU borné avec éviction
+- Single-flight : un seul appel amont par clé, les autres appelants attendent
+- Stale-while-revalidate : une valeur expirée depuis peu est servie tout de
+  suite pendant qu'un seul rafraîchissement tourne en arrière-plan
+"""
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Executor
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class _InFlight:
+    """Requête amont en cours, partagée par tous les appelants d'une même clé"""
+
+    __slots__ = ('event', 'value', 'error')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class MarketDataCache:
+    """Cache LRU thread-safe avec TTL et déduplication des requêtes concurrentes"""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        # clé -> (expire_at, stale_until, valeur, fetched_at) ; fetched_at en time.time()
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._inflight: Dict[Hashable, _InFlight] = {}
+        self._lock = threading.Lock()
+
+        # Compteurs
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0  # appels servis par une requête déjà en vol
+        self.evictions = 0
+        self.stale_hits = 0  # valeurs expirées servies pendant un rafraîchissement
+        self.refreshes = 0   # rafraîchissements lancés en arrière-plan
+        self.refresh_errors = 0
+
+    def get_or_fetch(self, key: Hashable, ttl: float, loader: Callable[[], Any],
+                     stale_ttl: float = 0.0, executor: Optional[Executor] = None) -> Any:
+        """
+        Retourne la valeur en cache si elle est encore fraîche, sinon appelle loader().
+        Si un autre thread charge déjà la même clé, on attend son résultat.
+        Les exceptions du loader ne sont jamais mises en cache : elles sont
+        propagées au thread leader et à tous ceux qui l'attendaient.
+
+        stale_ttl / executor : une valeur expirée depuis moins de stale_ttl secondes
+        est retournée immédiatement, et un seul rafraîchissement est soumis à
+        l'executor (les erreurs de ce rafraîchissement laissent l'ancienne valeur).
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[2]
+                if entry[1] > now and executor is not None:
+                    self._entries.move_to_end(key)
+                    self.stale_hits += 1
+                    if key not in self._inflight:
+                        flight = _InFlight()
+                        self._inflight[key] = flight
+                        self.refreshes += 1
+                        executor.submit(self._refresh, key, ttl, stale_ttl, loader, flight)
+                    return entry[2]
+                del self._entries[key]
+
+            flight = self._inflight.get(key)
+            if flight is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                flight = _InFlight()
+                self._inflight[key] = flight
+                self.misses += 1
+                leader = True
+
+        if not leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            value = loader()
+        except BaseException as e:
+            flight.error = e
+            raise
+        else:
+            flight.value = value
+            self.set(key, value, ttl, stale_ttl)
+            return value
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.event.set()
+
+    def _refresh(self, key: Hashable, ttl: float, stale_ttl: float,
+                 loader: Callable[[], Any], flight: _InFlight) -> None:
+        """Rafraîchissement en arrière-plan d'une valeur servie périmée"""
+        try:
+            value = loader()
+        except Exception as e:
+            flight.error = e
+            with self._lock:
+                self.refresh_errors += 1
+            print(f"Rafraîchissement du cache en échec ({key[0]}): {e}")
+        else:
+            flight.value = value
+            self.set(key, value, ttl, stale_ttl)
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.event.set()
+
+    def lookup(self, key: Hashable, stale_ok: bool = False) -> Tuple[bool, Any]:
+        """
+        Lecture non bloquante : (True, valeur) si la clé est fraîche (ou encore
+        dans sa fenêtre de péremption avec stale_ok), sinon (False, None).
+        Utilisé par le client asyncio, qui gère lui-même sa déduplication.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (entry[0] > now or (stale_ok and entry[1] > now)):
+                self._entries.move_to_end(key)
+                if entry[0] > now:
+                    self.hits += 1
+                else:
+                    self.stale_hits += 1
+                return True, entry[2]
+            return False, None
+
+    def fetched_at(self, key: Hashable) -> Optional[float]:
+        """Date (time.time()) du chargement de la valeur en cache, None si absente"""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry[3] if entry is not None else None
+
+    def record_miss(self, coalesced: bool = False) -> None:
+        """Comptabilise un défaut de cache résolu hors de get_or_fetch()"""
+        with self._lock:
+            if coalesced:
+                self.coalesced += 1
+            else:
+                self.misses += 1
+
+    def set(self, key: Hashable, value: Any, ttl: float, stale_ttl: float = 0.0,
+            fetched_at: Optional[float] = None) -> None:
+        """
+        Insère (ou remplace) une valeur et applique la limite LRU.
+        La valeur est fraîche pendant ttl, puis servable périmée pendant stale_ttl.
+        fetched_at : date des données si elles ne viennent pas d'être chargées.
+        """
+        if ttl <= 0:
+            return
+        expire_at = time.monotonic() + ttl
+        with self._lock:
+            self._entries[key] = (expire_at, expire_at + stale_ttl, value, fetched_at or time.time())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable = None) -> None:
+        """Supprime une clé, ou vide tout le cache si aucune clé n'est donnée"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Statistiques d'utilisation du cache"""
+        with self._lock:
+            lookups = self.hits + self.misses + self.coalesced + self.stale_hits
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'coalesced': self.coalesced,
+                'evictions': self.evictions,
+                'stale_hits': self.stale_hits,
+                'refreshes': self.refreshes,
+                'refresh_errors': self.refresh_errors,
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+                'in_flight': len(self._inflight),
+                'hit_ratio': (self.hits + self.coalesced + self.stale_hits) / lookups if lookups else 0.0,
+            }
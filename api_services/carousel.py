@@ -0,0 +1,169 @@
+"""
+Carrousel de la page d'accueil, précalculé et partagé entre utilisateurs
+Le carrousel (paires les plus actives, ticker 24h et mini-courbe SVG des
+dernières 24h, voir downsample.py) est le même pour tous : il est construit par une tâche de fond
+(python manage.py refresh_carousel) et publié dans le cache partagé
+(alias BINANCE_CAROUSEL_CACHE). La page d'accueil ne fait plus que lire ce
+jeu de données ; son temps de réponse ne dépend plus du nombre de paires.
+
+Sans la tâche de fond, le premier affichage construit le carrousel, et une
+version plus vieille que BINANCE_CAROUSEL_REFRESH_INTERVAL est servie le temps
+d'un rafraîchissement en arrière-plan. Une seule construction à la fois par
+processus, menée par le thread qui l'a lancée ; les autres attendent son
+résultat. Après un échec (carrousel vide), aucune nouvelle tentative avant
+BINANCE_CAROUSEL_RETRY_DELAY secondes.
+"""
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import InvalidCacheBackendError
+
+from .binance_service import BinanceAPIService
+from .downsample import get_sparkline
+from .records import Ticker
+
+
+CAROUSEL_KEY = 'carousel'
+
+
+def _store():
+    """Cache partagé entre processus, ou None s'il n'est pas configuré"""
+    alias = getattr(settings, 'BINANCE_CAROUSEL_CACHE', None)
+    if not alias:
+        return None
+    try:
+        return caches[alias]
+    except InvalidCacheBackendError:
+        return None
+
+
+def carousel_item(symbol: str, ticker: Ticker, sparkline: Optional[Dict]) -> Dict:
+    """Élément du carrousel à partir du ticker 24h et de la mini-courbe (chemins SVG)"""
+    return {
+        'symbol': symbol,
+        'price': ticker.get('lastPrice', '0'),
+        'change': ticker.get('priceChangePercent', '0'),
+        'volume': BinanceAPIService.format_volume(ticker.get('volume', '0')),
+        'high': ticker.get('highPrice', '0'),
+        'low': ticker.get('lowPrice', '0'),
+        'sparkline': sparkline or {},
+    }
+
+
+def build_carousel(size: Optional[int] = None) -> List[Dict]:
+    """
+    Construit le carrousel : un instantané des tickers et les mini-courbes des
+    paires en parallèle (fetch_many). Paires sans ticker ignorées.
+    """
+    size = size or getattr(settings, 'BINANCE_CAROUSEL_SIZE', 10)
+    snapshot = BinanceAPIService.get_ticker_snapshot()
+    symbols = [s for s in BinanceAPIService.get_popular_pairs(size, snapshot=snapshot) if snapshot.get(s)]
+    interval = getattr(settings, 'BINANCE_SPARKLINE_INTERVAL', '15m')
+    limit = getattr(settings, 'BINANCE_SPARKLINE_LIMIT', 96)
+    points = getattr(settings, 'BINANCE_SPARKLINE_POINTS', 48)
+    sparklines = BinanceAPIService.fetch_many({
+        symbol: (get_sparkline, symbol, interval, points, limit) for symbol in symbols
+    })
+    return [carousel_item(symbol, snapshot.get(symbol), sparklines.get(symbol)) for symbol in symbols]
+
+
+def read_carousel() -> Optional[Dict]:
+    """Carrousel publié : {'data': [...], 'published_at': timestamp}, ou None"""
+    store = _store()
+    if store is None:
+        return None
+    try:
+        return store.get(CAROUSEL_KEY)
+    except Exception as e:
+        print(f"Cache du carrousel indisponible: {e}")
+        return None
+
+
+def refresh_carousel() -> List[Dict]:
+    """Reconstruit et publie le carrousel ; un carrousel vide (Binance injoignable) n'est pas publié"""
+    items = build_carousel()
+    store = _store()
+    if items and store is not None:
+        try:
+            store.set(
+                CAROUSEL_KEY, {'data': items, 'published_at': time.time()},
+                timeout=getattr(settings, 'BINANCE_CAROUSEL_MAX_AGE', 600),
+            )
+        except Exception as e:
+            print(f"Carrousel non publié: {e}")
+    return items
+
+
+class _Build:
+    """Construction du carrousel en cours, partagée par les requêtes qui l'attendent"""
+
+    __slots__ = ('event', 'items')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.items: List[Dict] = []
+
+
+_build: Optional[_Build] = None  # construction en cours dans ce processus
+_retry_at = 0.0                  # time.monotonic() avant lequel on ne reconstruit pas après un échec
+_build_lock = threading.Lock()   # protège _build et _retry_at, jamais tenu pendant la construction
+
+
+def _join_build() -> Tuple[Optional[_Build], bool]:
+    """
+    (construction, True si l'appelant doit la mener) : la construction en cours,
+    sinon une nouvelle ; (None, False) pendant le délai qui suit un échec.
+    """
+    global _build
+    with _build_lock:
+        if _build is not None:
+            return _build, False
+        if time.monotonic() < _retry_at:
+            return None, False
+        _build = _Build()
+        return _build, True
+
+
+def _run_build(build: _Build) -> None:
+    """Mène la construction `build` (thread qui l'a lancée) et libère ceux qui l'attendent"""
+    global _build, _retry_at
+    items: List[Dict] = []
+    try:
+        items = refresh_carousel()
+    except Exception as e:
+        print(f"Rafraîchissement du carrousel impossible: {e}")
+    finally:
+        build.items = items
+        with _build_lock:
+            _build = None
+            _retry_at = 0.0 if items else time.monotonic() + getattr(settings, 'BINANCE_CAROUSEL_RETRY_DELAY', 10)
+        build.event.set()
+
+
+def get_carousel() -> List[Dict]:
+    """
+    Carrousel pour la page d'accueil, depuis le cache partagé.
+    Absent : construit sur place (les requêtes concurrentes attendent la même
+    construction ; liste vide pendant le délai qui suit un échec). Plus vieux que
+    BINANCE_CAROUSEL_REFRESH_INTERVAL : servi tel quel, et rafraîchi en arrière-plan.
+    """
+    payload = read_carousel()
+    if payload is None:
+        build, leader = _join_build()
+        if build is None:
+            return []
+        if leader:
+            _run_build(build)
+        else:
+            build.event.wait()
+        return build.items
+
+    refresh_interval = getattr(settings, 'BINANCE_CAROUSEL_REFRESH_INTERVAL', 30)
+    if time.time() - payload['published_at'] > refresh_interval:
+        build, leader = _join_build()
+        if leader:
+            threading.Thread(target=_run_build, args=(build,), name='carousel-refresh', daemon=True).start()
+    return payload['data']
@@ -0,0 +1,280 @@
+"""
+Disjoncteurs par endpoint Binance et dernières réponses valides persistées
+
+Quand Binance est lent ou indisponible, chaque appel attendait son timeout
+complet avant d'échouer. Un disjoncteur par endpoint :
+- s'ouvre après N échecs consécutifs (timeouts, erreurs de connexion, 5xx,
+  429/418) ou dépassements de la latence cible (SLO) ;
+- tant qu'il est ouvert, les appels échouent immédiatement (CircuitOpen) ;
+- après reset_timeout, un seul appel de test passe (semi-ouvert) : succès,
+  le disjoncteur se referme ; échec, il se rouvre pour un nouveau délai.
+
+Pendant ce temps, BinanceAPIService sert la dernière réponse valide de
+l'appel, conservée dans un cache persistant (alias BINANCE_LKG_CACHE).
+
+Une erreur 4xx (symbole inconnu...) est neutre quand le disjoncteur est fermé :
+elle ne remet pas à zéro les échecs en cours, sans quoi une requête invalide
+glissée entre deux timeouts masquerait la panne. En semi-ouvert, elle prouve
+que Binance répond : le disjoncteur se referme.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+import requests
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import InvalidCacheBackendError
+
+from .rate_limit import RateLimitExceeded
+
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+# Réponses HTTP qui signalent une panne ou une surcharge côté Binance
+OUTAGE_STATUSES = frozenset({418, 429})
+
+
+class CircuitOpen(requests.exceptions.RequestException):
+    """Appel refusé localement : le disjoncteur de l'endpoint est ouvert"""
+
+    def __init__(self, endpoint: str, retry_after: float = 0.0):
+        super().__init__(f"Disjoncteur ouvert pour {endpoint} (nouvel essai dans {retry_after:.0f}s)")
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+
+
+def is_outage(error: BaseException) -> bool:
+    """
+    True si l'erreur compte comme un échec pour le disjoncteur.
+    Les refus locaux (limiteur, disjoncteur) et les erreurs 4xx (symbole
+    inconnu, paramètre invalide) n'en sont pas : Binance a bien répondu.
+    """
+    if isinstance(error, (RateLimitExceeded, CircuitOpen)):
+        return False
+    response = getattr(error, 'response', None)
+    status = getattr(response, 'status_code', None)
+    if status is not None:
+        return status >= 500 or status in OUTAGE_STATUSES
+    return True
+
+
+class CircuitBreaker:
+    """Disjoncteur d'un endpoint (thread-safe)"""
+
+    def __init__(self, name: str, failure_threshold: int = 3, reset_timeout: float = 30.0,
+                 latency_slo: Optional[float] = None):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.latency_slo = latency_slo
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0     # time.monotonic() de la dernière ouverture
+        self._probing = False     # appel de test en cours (semi-ouvert)
+
+        self.opens = 0
+        self.rejected = 0
+        self.slow_calls = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def before_call(self) -> None:
+        """
+        À appeler avant chaque requête amont. Lève CircuitOpen si le
+        disjoncteur est ouvert, ou semi-ouvert avec un test déjà en cours.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if self._state == OPEN:
+                retry_after = self._opened_at + self.reset_timeout - now
+                if retry_after > 0:
+                    self.rejected += 1
+                    raise CircuitOpen(self.name, retry_after)
+                self._state = HALF_OPEN
+                self._probing = False
+            if self._state == HALF_OPEN:
+                if self._probing:
+                    self.rejected += 1
+                    raise CircuitOpen(self.name, self.reset_timeout)
+                self._probing = True
+
+    def record(self, elapsed: float, error: Optional[BaseException] = None) -> None:
+        """Résultat d'un appel autorisé par before_call() : durée (s) et erreur éventuelle"""
+        slow = self.latency_slo is not None and elapsed > self.latency_slo
+        with self._lock:
+            self._probing = False
+            if isinstance(error, (RateLimitExceeded, CircuitOpen)):
+                return  # refus local : rien n'a été appris sur Binance
+            if slow:
+                self.slow_calls += 1
+            if (error is not None and is_outage(error)) or slow:
+                self._failures += 1
+                if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                    if self._state != OPEN:
+                        self.opens += 1
+                        print(f"Disjoncteur Binance ouvert ({self.name}) après {self._failures} échec(s)")
+                    self._state = OPEN
+                    self._opened_at = time.monotonic()
+                return
+            if error is not None and self._state == CLOSED:
+                return  # 4xx : Binance répond, mais ce n'est pas un succès
+            if self._state != CLOSED:
+                print(f"Disjoncteur Binance refermé ({self.name})")
+            self._state = CLOSED
+            self._failures = 0
+
+    def release(self) -> None:
+        """Appel abandonné sans résultat (annulation) : libère le créneau de test"""
+        with self._lock:
+            self._probing = False
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            retry_in = 0.0
+            if self._state == OPEN:
+                retry_in = max(0.0, self._opened_at + self.reset_timeout - time.monotonic())
+            return {
+                'state': self._state,
+                'failures': self._failures,
+                'retry_in': retry_in,
+                'opens': self.opens,
+                'rejected': self.rejected,
+                'slow_calls': self.slow_calls,
+            }
+
+
+class BreakerRegistry:
+    """Un disjoncteur par endpoint, créé à la première utilisation"""
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30.0,
+                 latency_slo: Optional[Dict[str, float]] = None):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.latency_slo = latency_slo or {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, endpoint: str) -> CircuitBreaker:
+        breaker = self._breakers.get(endpoint)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.get(endpoint)
+                if breaker is None:
+                    breaker = CircuitBreaker(
+                        endpoint,
+                        failure_threshold=self.failure_threshold,
+                        reset_timeout=self.reset_timeout,
+                        latency_slo=self.latency_slo.get(endpoint, self.latency_slo.get('default')),
+                    )
+                    self._breakers[endpoint] = breaker
+        return breaker
+
+    def degraded(self) -> List[str]:
+        """Endpoints dont le disjoncteur n'est pas fermé"""
+        return sorted(name for name, breaker in list(self._breakers.items()) if breaker.state != CLOSED)
+
+    def status(self) -> Dict[str, Dict]:
+        return {name: breaker.status() for name, breaker in list(self._breakers.items())}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._breakers.clear()
+
+
+class LastKnownGoodStore:
+    """
+    Dernière réponse valide de chaque appel, dans un cache Django persistant
+    (partagé entre processus et conservé au redémarrage). Les écritures d'une
+    même clé sont espacées d'au moins write_interval secondes ; les dates
+    d'écriture plus anciennes que write_interval sont oubliées au fil de l'eau.
+    """
+
+    def __init__(self, alias: Optional[str] = None, endpoints=(), write_interval: float = 30.0,
+                 max_age: Optional[float] = None):
+        self.alias = alias
+        self.endpoints = frozenset(endpoints)
+        self.write_interval = write_interval
+        self.max_age = max_age
+        # clé -> time.monotonic() de la dernière écriture, de la plus ancienne à la plus récente
+        self._written: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _store(self):
+        if not self.alias:
+            return None
+        try:
+            return caches[self.alias]
+        except InvalidCacheBackendError:
+            return None
+
+    @staticmethod
+    def key(endpoint: str, params: Optional[Dict] = None) -> str:
+        digest = hashlib.sha1(repr(sorted((params or {}).items())).encode()).hexdigest()
+        return f"lkg:{endpoint}:{digest}"
+
+    def save(self, endpoint: str, params: Optional[Dict], value: Any) -> None:
+        """Enregistre une réponse valide (sans effet si l'endpoint n'est pas conservé)"""
+        if endpoint not in self.endpoints or value in (None, {}, []):
+            return
+        store = self._store()
+        if store is None:
+            return
+        key = self.key(endpoint, params)
+        now = time.monotonic()
+        with self._lock:
+            written = self._written.get(key)
+            if written is not None and now - written < self.write_interval:
+                return
+            self._written[key] = now
+            self._written.move_to_end(key)
+            while self._written:
+                oldest = next(iter(self._written))
+                if now - self._written[oldest] < self.write_interval:
+                    break
+                del self._written[oldest]
+        try:
+            store.set(key, {'data': value, 'stored_at': time.time()}, timeout=self.max_age)
+        except Exception as e:
+            print(f"Dernière réponse valide non enregistrée ({endpoint}): {e}")
+
+    def reset(self) -> None:
+        """Oublie les dates d'écriture (les réponses conservées restent dans le cache)"""
+        with self._lock:
+            self._written.clear()
+
+    def load(self, endpoint: str, params: Optional[Dict] = None) -> Optional[Dict]:
+        """{'data': réponse, 'stored_at': timestamp}, ou None si rien n'est conservé"""
+        if endpoint not in self.endpoints:
+            return None
+        store = self._store()
+        if store is None:
+            return None
+        try:
+            return store.get(self.key(endpoint, params))
+        except Exception as e:
+            print(f"Dernière réponse valide illisible ({endpoint}): {e}")
+            return None
+
+
+# Partagés par les clients synchrone et asynchrone du processus
+breakers = BreakerRegistry(
+    failure_threshold=getattr(settings, 'BINANCE_BREAKER_FAILURES', 3),
+    reset_timeout=getattr(settings, 'BINANCE_BREAKER_RESET_TIMEOUT', 30),
+    latency_slo=getattr(settings, 'BINANCE_BREAKER_LATENCY_SLO', {}),
+)
+
+last_known_good = LastKnownGoodStore(
+    alias=getattr(settings, 'BINANCE_LKG_CACHE', None),
+    endpoints=getattr(settings, 'BINANCE_LKG_ENDPOINTS', ()),
+    write_interval=getattr(settings, 'BINANCE_LKG_WRITE_INTERVAL', 30),
+    max_age=getattr(settings, 'BINANCE_LKG_MAX_AGE', None),
+)
@@ -0,0 +1,16 @@
+"""
+Processeurs de contexte des templates
+"""
+from .circuit_breaker import breakers
+
+
+def market_status(request):
+    """
+    Mode dégradé : endpoints Binance dont le disjoncteur est ouvert. Les pages
+    affichent alors les dernières données valides, signalées par un bandeau.
+    """
+    degraded = breakers.degraded()
+    return {
+        'market_degraded': bool(degraded),
+        'degraded_endpoints': degraded,
+    }
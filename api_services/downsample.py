@@ -0,0 +1,108 @@
+"""
+Réduction des séries de prix pour l'affichage (NumPy)
+- lttb() : Largest-Triangle-Three-Buckets, garde `points` points d'une série
+  en conservant sa forme visuelle (pics et creux), là où un pas régulier les
+  manquerait ; le premier et le dernier point sont toujours gardés
+- sparkline_path() : chemins SVG (ligne et aire) d'une mini-courbe, dessinée
+  côté serveur : la page n'embarque plus la série ni de code de graphique
+- get_sparkline() : mini-courbe d'un symbole, en cache par (symbole, intervalle, points)
+"""
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .binance_service import BinanceAPIService, _cache
+from .records import Kline, closes
+
+
+def lttb_indices(values: Sequence[float], points: int) -> np.ndarray:
+    """
+    Indices des points retenus par LTTB (croissants). Série inchangée si elle
+    a déjà au plus `points` points (ou si points < 3).
+    Seaux égaux entre le premier et le dernier point ; dans chaque seau, on garde
+    le point qui forme le plus grand triangle avec le point retenu précédent et
+    la moyenne du seau suivant (aires calculées sur tout le seau à la fois).
+    """
+    y = np.asarray(values, dtype=np.float64)
+    size = len(y)
+    if points >= size or points < 3:
+        return np.arange(size)
+    x = np.arange(size, dtype=np.float64)
+
+    # points - 2 seaux sur [1, size - 1) ; edges[i]:edges[i + 1] = seau i.
+    # Bornes en arithmétique entière : linspace().astype() tronque parfois
+    # 4.999... en 4 et décale un seau d'un point
+    edges = 1 + np.arange(points - 1, dtype=np.int64) * (size - 2) // (points - 2)
+    counts = np.diff(edges)
+    avg_x = np.add.reduceat(x[:size - 1], edges[:-1]) / counts
+    avg_y = np.add.reduceat(y[:size - 1], edges[:-1]) / counts
+    # Le « seau suivant » du dernier seau est le dernier point
+    avg_x = np.append(avg_x[1:], x[-1])
+    avg_y = np.append(avg_y[1:], y[-1])
+
+    selected = np.empty(points, dtype=np.int64)
+    selected[0], selected[-1] = 0, size - 1
+    a = 0
+    for i in range(points - 2):
+        start, stop = edges[i], edges[i + 1]
+        bx, by = x[start:stop], y[start:stop]
+        areas = np.abs((x[a] - avg_x[i]) * (by - y[a]) - (x[a] - bx) * (avg_y[i] - y[a]))
+        a = start + int(np.argmax(areas))
+        selected[i + 1] = a
+    return selected
+
+
+def lttb(values: Sequence[float], points: int) -> List[float]:
+    """Série réduite à `points` points par LTTB"""
+    values = list(values)
+    return [values[i] for i in lttb_indices(values, points)]
+
+
+def downsample_klines(klines: Sequence[Kline], points: int) -> List[float]:
+    """Prix de clôture d'une série de klines, réduits à `points` points"""
+    return lttb(closes(klines), points)
+
+
+def sparkline_path(values: Sequence[float], width: int = 300, height: int = 100,
+                   padding: int = 2) -> Dict[str, str]:
+    """
+    Chemins SVG d'une mini-courbe dans un repère width x height (viewBox),
+    coordonnées entières : 'line' (tracé seul) et 'area' (même tracé, fermé
+    par l'extérieur du repère : un seul <path> avec fill et stroke dessine
+    l'aire et la ligne sans bord visible en bas ni sur les côtés).
+    Série plate : ligne horizontale au milieu. Série vide : chemins vides.
+    """
+    y = np.asarray(values, dtype=np.float64)
+    if not len(y):
+        return {'line': '', 'area': ''}
+    low, high = float(y.min()), float(y.max())
+    if high > low:
+        ys = height - padding - (y - low) / (high - low) * (height - 2 * padding)
+    else:
+        ys = np.full(len(y), height / 2)
+    xs = np.linspace(0, width, len(y))
+    coords = np.rint(np.column_stack((xs, ys))).astype(np.int64).tolist()
+    line = 'M' + 'L'.join(f"{px} {py}" for px, py in coords)
+    outside = height + 2 * padding
+    area = (f"{line}L{width + padding} {coords[-1][1]}L{width + padding} {outside}"
+            f"L{-padding} {outside}L{-padding} {coords[0][1]}Z")
+    return {'line': line, 'area': area}
+
+
+def get_sparkline(symbol: str, interval: str = '1h', points: int = 24, limit: Optional[int] = None,
+                  width: int = 300, height: int = 100) -> Dict:
+    """
+    Mini-courbe d'un symbole : {'prices': série réduite, 'line', 'area', 'width', 'height'}.
+    Calculée à partir des `limit` dernières klines (défaut : points) et mise en
+    cache par (symbole, intervalle, points), avec le TTL des klines.
+    """
+    limit = limit or points
+
+    def build():
+        prices = downsample_klines(BinanceAPIService.get_klines(symbol, interval, limit), points)
+        sparkline = sparkline_path(prices, width, height)
+        sparkline.update({'prices': prices, 'width': width, 'height': height})
+        return sparkline
+
+    ttl = BinanceAPIService.CACHE_TTL.get('klines', BinanceAPIService.DEFAULT_CACHE_TTL)
+    return _cache.get_or_fetch(('sparkline', symbol, interval, points, limit, width, height), ttl, build)
@@ -0,0 +1,83 @@
+"""
+Session HTTP partagée pour les appels à Binance
+- Une session requests par processus (connexions keep-alive réutilisées)
+- Pool de connexions configurable
+- Retries avec backoff exponentiel + jitter sur 429/5xx, en respectant Retry-After
+"""
+import os
+import threading
+from typing import Optional, Tuple
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import MaxRetryError, ResponseError
+from urllib3.util.retry import Retry
+
+
+DEFAULT_TIMEOUT = (3.05, 10)  # (connexion, lecture) en secondes
+
+
+class BinanceRetry(Retry):
+    """
+    Retry urllib3 qui abandonne si Binance demande d'attendre trop longtemps :
+    un Retry-After de plusieurs minutes (ban IP) ne doit pas bloquer un worker.
+    """
+
+    MAX_RETRY_AFTER = getattr(settings, 'BINANCE_HTTP_MAX_RETRY_AFTER', 5)  # secondes
+
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+        if response is not None and self.respect_retry_after_header:
+            retry_after = self.get_retry_after(response)
+            if retry_after is not None and retry_after > self.MAX_RETRY_AFTER:
+                # Avec raise_on_status=False, urllib3 rend la réponse 429 telle quelle
+                raise MaxRetryError(_pool, url, ResponseError(f"Retry-After trop long ({retry_after:.0f}s)"))
+        return super().increment(method, url, response, error, _pool, _stacktrace)
+
+
+_session: Optional[requests.Session] = None
+_session_pid: Optional[int] = None
+_session_lock = threading.Lock()
+
+
+def _build_session() -> requests.Session:
+    pool_size = getattr(settings, 'BINANCE_HTTP_POOL_SIZE', 20)
+    retry = BinanceRetry(
+        total=getattr(settings, 'BINANCE_HTTP_RETRIES', 3),
+        connect=getattr(settings, 'BINANCE_HTTP_RETRIES', 3),
+        read=0,  # pas de retry sur timeout de lecture : on ne double pas la latence
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(['GET']),
+        backoff_factor=getattr(settings, 'BINANCE_HTTP_BACKOFF', 0.3),
+        backoff_jitter=getattr(settings, 'BINANCE_HTTP_BACKOFF_JITTER', 0.2),
+        respect_retry_after_header=True,
+        raise_on_status=False,  # la dernière réponse est rendue, raise_for_status() s'en charge
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({'Accept': 'application/json', 'Connection': 'keep-alive'})
+    return session
+
+
+def get_session() -> requests.Session:
+    """
+    Retourne la session partagée du processus courant.
+    Recréée après un fork (workers gunicorn/uwsgi) pour ne pas partager de sockets.
+    """
+    global _session, _session_pid
+    pid = os.getpid()
+    if _session is None or _session_pid != pid:
+        with _session_lock:
+            if _session is None or _session_pid != pid:
+                _session = _build_session()
+                _session_pid = pid
+    return _session
+
+
+def get_timeout(endpoint: str) -> Tuple[float, float]:
+    """Timeout (connexion, lecture) configuré pour un endpoint"""
+    timeouts = getattr(settings, 'BINANCE_HTTP_TIMEOUTS', {})
+    return timeouts.get(endpoint, timeouts.get('default', DEFAULT_TIMEOUT))
@@ -0,0 +1,135 @@
+"""
+Codec JSON commun : réponses Binance en entrée, réponses de l'application en sortie
+- orjson s'il est installé (pip install orjson), sinon le module json standard ;
+  forçable avec le setting JSON_CODEC ('auto', 'orjson' ou 'json')
+- les nombres de Binance arrivent en chaînes ("lastPrice": "64000.01000000") :
+  number() / numbers() ne convertissent que les champs dont l'appelant a besoin
+- FastJsonResponse : JsonResponse sérialisée par le codec, Decimal compris ;
+  les enregistrements de api_services.records sont écrits au format Binance
+- NaN et infinis : écrits null et refusés en lecture par les deux moteurs
+  (json les accepterait, mais « NaN » n'est pas du JSON valide pour le navigateur)
+"""
+import json
+import math
+from decimal import Decimal, InvalidOperation
+from typing import Any, Dict, Iterable, Union
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+
+from .records import Record
+
+try:
+    import orjson
+except ImportError:  # dépendance optionnelle
+    orjson = None
+
+
+def _backend() -> str:
+    wanted = getattr(settings, 'JSON_CODEC', 'auto')
+    if wanted == 'json' or orjson is None:
+        return 'json'
+    return 'orjson'
+
+
+BACKEND = _backend()
+
+
+def _default(obj: Any) -> Any:
+    """Types hors JSON : Decimal en nombre, enregistrements via to_api(), le reste comme DjangoJSONEncoder"""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, Record):
+        return obj.to_api()
+    return DjangoJSONEncoder().default(obj)
+
+
+def _finite(obj: Any) -> Any:
+    """Copie de obj où les nombres non finis sont remplacés par None (comme orjson)"""
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, Decimal):
+        return obj if obj.is_finite() else None
+    if isinstance(obj, dict):
+        return {key: _finite(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_finite(value) for value in obj]
+    if isinstance(obj, Record):
+        return _finite(obj.to_api())
+    return obj
+
+
+def _reject_constant(name: str) -> None:
+    raise ValueError(f"Valeur JSON invalide : {name}")
+
+
+class _Encoder(DjangoJSONEncoder):
+    """Encodeur du repli json standard : Decimal en nombre, comme avec orjson"""
+
+    def default(self, obj: Any) -> Any:
+        if isinstance(obj, Decimal):
+            return float(obj)
+        if isinstance(obj, Record):
+            return obj.to_api()
+        return super().default(obj)
+
+
+def loads(data: Union[bytes, bytearray, str]) -> Any:
+    """Décode un document JSON (bytes ou str). Lève ValueError s'il est invalide."""
+    if BACKEND == 'orjson':
+        return orjson.loads(data)
+    return json.loads(data, parse_constant=_reject_constant)
+
+
+def dumps(obj: Any) -> bytes:
+    """
+    Encode en JSON UTF-8 (bytes). Decimal est écrit comme un nombre, ainsi que
+    le faisaient les vues avec float() ; dates et UUID comme DjangoJSONEncoder ;
+    NaN et infinis comme null.
+    """
+    if BACKEND == 'orjson':
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    try:
+        text = json.dumps(obj, cls=_Encoder, ensure_ascii=False, separators=(',', ':'), allow_nan=False)
+    except ValueError:
+        # NaN ou infini quelque part : null, comme orjson (cas rare, seconde passe)
+        text = json.dumps(_finite(obj), cls=_Encoder, ensure_ascii=False, separators=(',', ':'))
+    return text.encode('utf-8')
+
+
+def number(value: Any, default: Any = 0.0, decimal: bool = False) -> Any:
+    """Chaîne numérique Binance -> float (ou Decimal), default si absente ou invalide"""
+    try:
+        if decimal:
+            return Decimal(value if isinstance(value, str) else str(value))
+        return float(value)
+    except (TypeError, ValueError, InvalidOperation):
+        return default
+
+
+def numbers(record: Dict, fields: Iterable[str], default: Any = 0.0, decimal: bool = False) -> Dict[str, Any]:
+    """{champ: nombre} pour les seuls `fields` d'une réponse Binance"""
+    if not decimal:
+        get = record.get
+        try:
+            return {field: float(get(field)) for field in fields}
+        except (TypeError, ValueError):
+            pass  # champ absent ou invalide : conversion champ par champ
+    return {field: number(record.get(field), default, decimal) for field in fields}
+
+
+class FastJsonResponse(HttpResponse):
+    """
+    Remplaçant de django.http.JsonResponse (même signature) sérialisé par
+    le codec : plus rapide avec orjson, et Decimal accepté tel quel.
+    """
+
+    def __init__(self, data: Any, safe: bool = True, **kwargs):
+        if safe and not isinstance(data, dict):
+            raise TypeError(
+                'In order to allow non-dict objects to be serialized set the '
+                'safe parameter to False.'
+            )
+        kwargs.setdefault('content_type', 'application/json')
+        super().__init__(content=dumps(data), **kwargs)
@@ -0,0 +1,138 @@
+"""
+Stockage local et incrémental des klines Binance
+Les chandeliers clôturés ne changent plus : on les conserve en base (modèle Kline)
+et on ne redemande à Binance que ceux postérieurs au dernier chandelier stocké
+(en pratique : le chandelier en cours). Une fenêtre incomplète ou trouée est
+rechargée en entier en un seul appel. Une fenêtre complète demandée mais
+rendue plus courte par Binance commence au premier chandelier du symbole
+(paire récente) : elle est marquée comme début d'historique et n'est plus
+redemandée en entier.
+"""
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import requests
+from django.conf import settings
+from django.db import DatabaseError, close_old_connections
+
+
+# Durée des intervalles Binance (ms). 1M est de longueur variable : jamais stocké.
+INTERVAL_MS = {
+    '1m': 60_000, '3m': 180_000, '5m': 300_000, '15m': 900_000, '30m': 1_800_000,
+    '1h': 3_600_000, '2h': 7_200_000, '4h': 14_400_000, '6h': 21_600_000,
+    '8h': 28_800_000, '12h': 43_200_000, '1d': 86_400_000, '3d': 259_200_000,
+    '1w': 604_800_000, '1M': 2_592_000_000,
+}
+STORABLE_INTERVALS = frozenset(INTERVAL_MS) - {'1M'}
+
+MAX_KLINES_PER_CALL = 1000  # limite Binance
+
+
+def is_enabled(interval: str) -> bool:
+    """True si cet intervalle passe par le stockage local"""
+    return getattr(settings, 'BINANCE_KLINE_STORE', True) and interval in STORABLE_INTERVALS
+
+
+def closing_connections(func: Callable, *args, **kwargs):
+    """
+    Exécute func dans un thread hors requête (pools de binance_service) comme
+    une requête Django : les connexions périmées ou en erreur sont fermées
+    avant et après (CONN_MAX_AGE), au lieu de rester ouvertes par thread.
+    """
+    close_old_connections()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        close_old_connections()
+
+
+def plan(symbol: str, interval: str, limit: int, now_ms: int) -> Tuple[List[List], Dict]:
+    """
+    Lit les chandeliers clôturés stockés et décide de l'appel amont à faire.
+    Retourne (klines stockées au format API, paramètres de l'appel /api/v3/klines).
+    """
+    from .models import Kline
+
+    step = INTERVAL_MS[interval]
+    rows = list(
+        Kline.objects.filter(symbol=symbol, interval=interval, close_time__lt=now_ms)
+        .order_by('-open_time')[:limit]
+    )
+    rows.reverse()
+
+    full_window = {'symbol': symbol, 'interval': interval, 'limit': limit}
+    # Il faut au moins limit - 1 chandeliers clôturés (le dernier est celui en
+    # cours), sauf si l'historique du symbole commence dans la fenêtre
+    if not rows or (len(rows) < limit - 1 and not rows[0].first):
+        return [], full_window
+
+    # Détection de trous dans la fenêtre stockée
+    for previous, current in zip(rows, rows[1:]):
+        if current.open_time - previous.open_time != step:
+            return [], full_window
+
+    # Trop de chandeliers manquants depuis le dernier stocké pour un seul appel
+    missing = (now_ms - rows[-1].open_time) // step
+    if missing >= MAX_KLINES_PER_CALL:
+        return [], full_window
+
+    return [r.to_api() for r in rows], {
+        'symbol': symbol,
+        'interval': interval,
+        'startTime': rows[-1].open_time + step,
+        'limit': MAX_KLINES_PER_CALL,
+    }
+
+
+def merge(symbol: str, interval: str, stored: List[List], fetched: List[List],
+          limit: int, now_ms: int) -> List[List]:
+    """
+    Enregistre les chandeliers clôturés reçus et retourne la fenêtre demandée
+    (stockés + nouveaux, y compris le chandelier en cours).
+    Une fenêtre complète (aucun chandelier stocké) plus courte que limit
+    commence au premier chandelier de l'historique : il est marqué `first`.
+    """
+    from .models import Kline
+
+    closed = [k for k in fetched if int(k[6]) < now_ms]
+    if closed:
+        Kline.objects.bulk_create(
+            [Kline.from_api(symbol, interval, k) for k in closed],
+            ignore_conflicts=True,
+        )
+        if not stored and len(fetched) < limit:
+            Kline.objects.filter(
+                symbol=symbol, interval=interval, open_time=int(closed[0][0])
+            ).update(first=True)
+
+    last_open = stored[-1][0] if stored else None
+    newer = [k for k in fetched if last_open is None or k[0] > last_open]
+    return (stored + newer)[-limit:]
+
+
+def get_klines(symbol: str, interval: str, limit: int,
+               fetch: Callable[[Dict], List], now_ms: Optional[int] = None) -> List[List]:
+    """
+    Klines via le stockage local. `fetch(params)` fait l'appel /api/v3/klines.
+    Si Binance est injoignable, on renvoie les chandeliers stockés s'il y en a.
+    """
+    now_ms = now_ms or int(time.time() * 1000)
+    try:
+        stored, params = plan(symbol, interval, limit, now_ms)
+    except DatabaseError as e:
+        # Table absente (migrations non appliquées) : on se passe du stockage
+        print(f"Stockage des klines indisponible: {e}")
+        return fetch({'symbol': symbol, 'interval': interval, 'limit': limit})
+
+    try:
+        fetched = fetch(params)
+    except requests.exceptions.RequestException:
+        if stored:
+            return stored[-limit:]
+        raise
+
+    try:
+        return merge(symbol, interval, stored, fetched or [], limit, now_ms)
+    except DatabaseError as e:
+        print(f"Stockage des klines indisponible: {e}")
+        return (stored + (fetched or []))[-limit:]
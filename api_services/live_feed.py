@@ -0,0 +1,170 @@
+"""
+Flux temps réel par symbole (Server-Sent Events, déploiement ASGI)
+Une seule boucle de lecture amont par symbole et par processus, quel que soit
+le nombre de pages ouvertes : chaque LiveFeed relit ses sections (ticker,
+carnet, trades) toutes les BINANCE_LIVE_FEED_INTERVAL secondes et ne pousse
+aux abonnés que les sections qui ont changé.
+- chaque abonné garde la dernière version de chaque section (un client lent
+  saute des versions intermédiaires au lieu d'accumuler une file)
+- la boucle s'arrête quand le dernier abonné se déconnecte
+- un flux est borné dans le temps (BINANCE_LIVE_FEED_MAX_AGE) : le navigateur
+  se reconnecte de lui-même (EventSource), ce qui libère aussi les abonnés
+  dont la déconnexion n'aurait pas été vue
+"""
+import asyncio
+import time
+import weakref
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional
+
+from django.conf import settings
+
+from . import json_codec
+
+
+# Sections d'un symbole : {'ticker': {...}, 'order_book': {...}, ...}
+Loader = Callable[[str], Awaitable[Dict[str, Any]]]
+
+
+class Subscriber:
+    """Abonné à un LiveFeed : dernières sections non encore envoyées"""
+
+    def __init__(self):
+        self.pending: Dict[str, bytes] = {}
+        self.ready = asyncio.Event()
+
+    def push(self, sections: Dict[str, bytes]) -> None:
+        self.pending.update(sections)
+        self.ready.set()
+
+    async def next(self, timeout: float) -> Dict[str, bytes]:
+        """Sections modifiées depuis le dernier appel ({} après `timeout` secondes sans changement)"""
+        try:
+            await asyncio.wait_for(self.ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            return {}
+        self.ready.clear()
+        sections, self.pending = self.pending, {}
+        return sections
+
+
+class LiveFeed:
+    """Boucle de lecture d'un symbole, partagée par tous ses abonnés"""
+
+    def __init__(self, symbol: str, loader: Loader, interval: float = 1.0):
+        self.symbol = symbol
+        self.loader = loader
+        self.interval = interval
+        self.subscribers: "set[Subscriber]" = set()
+        self.sections: Dict[str, bytes] = {}  # dernière version publiée de chaque section
+        self.reads = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def subscribe(self) -> Subscriber:
+        """Nouvel abonné, qui reçoit d'abord l'état courant complet"""
+        subscriber = Subscriber()
+        if self.sections:
+            subscriber.push(self.sections)
+        self.subscribers.add(subscriber)
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        self.subscribers.discard(subscriber)
+        if not self.subscribers and self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def refresh(self) -> Dict[str, bytes]:
+        """Relit les sections et publie celles qui ont changé"""
+        self.reads += 1
+        changed = {}
+        for name, value in (await self.loader(self.symbol)).items():
+            if value is None:
+                continue
+            encoded = json_codec.dumps(value)
+            if self.sections.get(name) != encoded:
+                self.sections[name] = encoded
+                changed[name] = encoded
+        if changed:
+            for subscriber in list(self.subscribers):
+                subscriber.push(changed)
+        return changed
+
+    async def _run(self) -> None:
+        while self.subscribers:
+            started = time.monotonic()
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Flux temps réel {self.symbol} en échec: {e}")
+            await asyncio.sleep(max(0.0, self.interval - (time.monotonic() - started)))
+
+
+class LiveFeedHub:
+    """LiveFeed par symbole d'une boucle d'événements"""
+
+    def __init__(self):
+        self.feeds: Dict[str, LiveFeed] = {}
+
+    def feed(self, symbol: str, loader: Loader) -> LiveFeed:
+        feed = self.feeds.get(symbol)
+        if feed is None:
+            feed = LiveFeed(symbol, loader, getattr(settings, 'BINANCE_LIVE_FEED_INTERVAL', 1.0))
+            self.feeds[symbol] = feed
+        return feed
+
+    def release(self, feed: LiveFeed, subscriber: Subscriber) -> None:
+        feed.unsubscribe(subscriber)
+        if not feed.subscribers:
+            self.feeds.pop(feed.symbol, None)
+
+    def stats(self) -> Dict[str, int]:
+        return {symbol: len(feed.subscribers) for symbol, feed in self.feeds.items()}
+
+
+# Les tâches et événements asyncio sont propres à une boucle
+_hubs: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, LiveFeedHub]" = weakref.WeakKeyDictionary()
+
+
+def get_hub() -> LiveFeedHub:
+    loop = asyncio.get_running_loop()
+    hub = _hubs.get(loop)
+    if hub is None:
+        hub = LiveFeedHub()
+        _hubs[loop] = hub
+    return hub
+
+
+def sse_event(event: str, data: bytes) -> bytes:
+    """Message SSE (data déjà encodée en JSON, sur une ligne)"""
+    return b'event: ' + event.encode() + b'\ndata: ' + data + b'\n\n'
+
+
+async def stream_events(symbol: str, loader: Loader) -> AsyncIterator[bytes]:
+    """
+    Messages SSE d'un symbole : état courant à la connexion, puis une section
+    par message à chaque changement ; commentaire de maintien toutes les
+    BINANCE_LIVE_FEED_HEARTBEAT secondes. Fin après BINANCE_LIVE_FEED_MAX_AGE.
+    """
+    heartbeat = getattr(settings, 'BINANCE_LIVE_FEED_HEARTBEAT', 15)
+    deadline = time.monotonic() + getattr(settings, 'BINANCE_LIVE_FEED_MAX_AGE', 300)
+    hub = get_hub()
+    feed = hub.feed(symbol, loader)
+    subscriber = feed.subscribe()
+    try:
+        # Délai de reconnexion du navigateur (ms)
+        yield b'retry: 2000\n\n'
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            sections = await subscriber.next(min(heartbeat, remaining))
+            if not sections:
+                yield b': ping\n\n'
+            for name, data in sections.items():
+                yield sse_event(name, data)
+    finally:
+        hub.release(feed, subscriber)
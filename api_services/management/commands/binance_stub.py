@@ -0,0 +1,55 @@
+"""
+Commande: python manage.py binance_stub
+Démarre un serveur local compatible Binance (voir api_services/stub_server.py)
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from api_services.stub_server import StubConfig, record_fixtures, start_stub_server
+
+
+class Command(BaseCommand):
+    help = "Serveur Binance local (fixtures enregistrées ou synthétiques) pour tests et benchmarks hors ligne"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=9000)
+        parser.add_argument('--latency', type=float, default=0, help="latence ajoutée par requête (ms)")
+        parser.add_argument('--jitter', type=float, default=0, help="variation aléatoire de la latence (± ms)")
+        parser.add_argument('--error-rate', type=float, default=0.0, help="proportion de réponses 503 (0-1)")
+        parser.add_argument('--weight-limit', type=int, default=6000, help="poids max par minute avant 429")
+        parser.add_argument('--fixtures', default=None, help="dossier de fixtures JSON enregistrées")
+        parser.add_argument('--symbols', type=int, default=None, help="nombre de paires synthétiques")
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--record', nargs='*', metavar='SYMBOL',
+                            help="enregistre les réponses réelles de Binance dans --fixtures puis quitte")
+        parser.add_argument('--verbose', action='store_true')
+
+    def handle(self, *args, **options):
+        if options['record'] is not None:
+            if not options['fixtures']:
+                self.stderr.write("--record nécessite --fixtures")
+                return
+            symbols = options['record'] or ['BTCUSDT', 'ETHUSDT']
+            record_fixtures(options['fixtures'], symbols)
+            self.stdout.write(self.style.SUCCESS(f"Fixtures enregistrées dans {options['fixtures']}"))
+            return
+
+        config = StubConfig(
+            latency_ms=options['latency'],
+            jitter_ms=options['jitter'],
+            error_rate=options['error_rate'],
+            weight_limit=options['weight_limit'],
+            fixtures_dir=options['fixtures'],
+            symbol_count=options['symbols'],
+            seed=options['seed'],
+        )
+        server, url = start_stub_server(options['host'], options['port'], config, options['verbose'])
+        self.stdout.write(self.style.SUCCESS(f"Bouchon Binance sur {url} ({len(server.fixtures.symbols)} paires)"))
+        self.stdout.write(f"Lancer l'application avec BINANCE_API_BASE_URL={url}")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            server.shutdown()
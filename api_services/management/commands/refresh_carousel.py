@@ -0,0 +1,36 @@
+"""
+Commande: python manage.py refresh_carousel
+Tâche de fond du carrousel de la page d'accueil (voir api_services/carousel.py)
+"""
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api_services.carousel import refresh_carousel
+
+
+class Command(BaseCommand):
+    help = "Reconstruit périodiquement le carrousel de la page d'accueil et le publie dans le cache partagé"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=float, default=None,
+                            help="période de rafraîchissement (s, défaut: BINANCE_CAROUSEL_REFRESH_INTERVAL)")
+        parser.add_argument('--once', action='store_true', help="un seul rafraîchissement, puis sortie")
+
+    def handle(self, *args, **options):
+        interval = options['interval'] or getattr(settings, 'BINANCE_CAROUSEL_REFRESH_INTERVAL', 30)
+        try:
+            while True:
+                started = time.monotonic()
+                items = refresh_carousel()
+                elapsed = time.monotonic() - started
+                if items:
+                    self.stdout.write(f"Carrousel publié : {len(items)} paires en {elapsed:.2f}s")
+                else:
+                    self.stderr.write("Carrousel vide (Binance injoignable ?), non publié")
+                if options['once']:
+                    break
+                time.sleep(max(0.0, interval - elapsed))
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,50 @@
+"""
+Commande: python manage.py stream_market_data
+Démon de flux temps réel Binance (voir api_services/market_data.py)
+"""
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils.module_loading import import_string
+
+from api_services.market_data import MarketDataDaemon
+from api_services.streams import ReplayTransport
+
+
+class Command(BaseCommand):
+    help = "Suit les flux WebSocket Binance et publie prix, carnets et trades pour les vues"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--ws-url', default=None, help="URL des flux (défaut: BINANCE_WS_BASE_URL)")
+        parser.add_argument('--transport', default=None,
+                            help="chemin d'une classe de transport (défaut: WebSocket)")
+        parser.add_argument('--replay', default=None, metavar='FILE',
+                            help="rejoue des messages enregistrés (JSON, un par ligne) au lieu de Binance")
+        parser.add_argument('--interval', type=float, default=None, help="période de publication (s)")
+        parser.add_argument('--stats-every', type=float, default=30, help="période d'affichage des statistiques (s)")
+
+    def handle(self, *args, **options):
+        transport = None
+        if options['replay']:
+            transport = ReplayTransport.from_file(options['replay'])
+        elif options['transport']:
+            transport = import_string(options['transport'])()
+
+        daemon = MarketDataDaemon(
+            transport=transport,
+            base_url=options['ws_url'],
+            publish_interval=options['interval'],
+        )
+        self.stdout.write(self.style.SUCCESS(f"Flux Binance: {daemon.client.base_url}"))
+
+        worker = threading.Thread(target=daemon.run, name='market-data-publisher', daemon=True)
+        worker.start()
+        try:
+            while worker.is_alive():
+                time.sleep(options['stats_every'])
+                self.stdout.write(str(daemon.stats()))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            daemon.stop()
@@ -0,0 +1,381 @@
+"""
+Données de marché temps réel publiées par le démon de flux
+(python manage.py stream_market_data)
+
+Le démon suit les flux WebSocket Binance :
+- !miniTicker@arr pour toutes les paires (table des prix)
+- <symbol>@depth, @trade et @kline_<intervalle> pour les symboles consultés
+et publie régulièrement ses données dans un cache partagé entre processus
+(alias BINANCE_STREAM_CACHE). Les processus de l'application lisent ces
+données au lieu d'appeler Binance, tant qu'elles ont moins de
+BINANCE_STREAM_MAX_AGE secondes ; au-delà (démon arrêté), ils reviennent
+aux appels REST.
+
+Tant que le démon publie, les vues signalent les symboles consultés
+(mark_watched, au plus une écriture par symbole et par quart de
+BINANCE_STREAM_WATCH_TTL dans chaque processus) : le démon s'abonne à leurs
+flux détaillés et s'en désabonne quand ils ne sont plus vus.
+"""
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import InvalidCacheBackendError
+
+from .order_book import BinanceDepthStreamSource, OrderBookManager
+from .streams import StreamClient
+
+
+TICKERS_KEY = 'tickers'
+WATCHED_KEY = 'watched'
+ALL_TICKERS_STREAM = '!miniTicker@arr'
+TRADES_KEPT = 50
+DEPTH_PUBLISHED = 50
+
+
+def depth_key(symbol: str) -> str:
+    return f"depth:{symbol}"
+
+
+def trades_key(symbol: str) -> str:
+    return f"trades:{symbol}"
+
+
+def kline_key(symbol: str, interval: str) -> str:
+    return f"kline:{symbol}:{interval}"
+
+
+def _store():
+    """Cache partagé entre processus, ou None s'il n'est pas configuré"""
+    alias = getattr(settings, 'BINANCE_STREAM_CACHE', None)
+    if not alias:
+        return None
+    try:
+        return caches[alias]
+    except InvalidCacheBackendError:
+        return None
+
+
+def read_published(key: str, max_age: Optional[float] = None) -> Optional[Dict]:
+    """
+    Données publiées par le démon : {'data': ..., 'published_at': timestamp},
+    ou None si absentes ou plus vieilles que max_age secondes.
+    """
+    store = _store()
+    if store is None:
+        return None
+    if max_age is None:
+        max_age = getattr(settings, 'BINANCE_STREAM_MAX_AGE', 10)
+    try:
+        payload = store.get(key)
+    except Exception as e:
+        print(f"Cache de flux indisponible: {e}")
+        return None
+    if not payload or time.time() - payload['published_at'] > max_age:
+        return None
+    return payload
+
+
+# Dernier signalement de chaque symbole par ce processus (limite les écritures)
+_watch_marks: Dict[str, float] = {}
+_watch_lock = threading.Lock()
+
+
+def mark_watched(symbol: str) -> None:
+    """Signale au démon qu'un symbole est consulté"""
+    store = _store()
+    if store is None or not symbol:
+        return
+    watch_ttl = getattr(settings, 'BINANCE_STREAM_WATCH_TTL', 60)
+    now = time.time()
+    with _watch_lock:
+        if now - _watch_marks.get(symbol, 0) < watch_ttl / 4:
+            return
+        _watch_marks[symbol] = now
+    try:
+        watched = store.get(WATCHED_KEY) or {}
+        watched = {s: t for s, t in watched.items() if now - t <= watch_ttl}
+        watched[symbol] = now
+        store.set(WATCHED_KEY, watched, timeout=None)
+    except Exception as e:
+        print(f"Cache de flux indisponible: {e}")
+
+
+def watched_symbols() -> List[str]:
+    """Symboles consultés récemment, du plus récent au plus ancien"""
+    store = _store()
+    if store is None:
+        return []
+    watch_ttl = getattr(settings, 'BINANCE_STREAM_WATCH_TTL', 60)
+    now = time.time()
+    watched = store.get(WATCHED_KEY) or {}
+    recent = [(t, s) for s, t in watched.items() if now - t <= watch_ttl]
+    return [s for _, s in sorted(recent, reverse=True)]
+
+
+def _mini_ticker_update(ticker: Dict, data: Dict) -> None:
+    """Met à jour un ticker 24h (format REST) avec un événement 24hrMiniTicker"""
+    close, open_ = float(data['c']), float(data['o'])
+    change = close - open_
+    ticker.update({
+        'symbol': data['s'],
+        'lastPrice': data['c'],
+        'openPrice': data['o'],
+        'highPrice': data['h'],
+        'lowPrice': data['l'],
+        'volume': data['v'],
+        'quoteVolume': data['q'],
+        'priceChange': f"{change:.8f}",
+        'priceChangePercent': f"{(change / open_ * 100) if open_ else 0:.3f}",
+        'closeTime': data['E'],
+    })
+
+
+def _trade_from_stream(data: Dict) -> Dict:
+    """Événement trade -> format /api/v3/trades"""
+    return {
+        'id': data['t'],
+        'price': data['p'],
+        'qty': data['q'],
+        'quoteQty': f"{float(data['p']) * float(data['q']):.8f}",
+        'time': data['T'],
+        'isBuyerMaker': data['m'],
+        'isBestMatch': data.get('M', True),
+    }
+
+
+def _kline_from_stream(k: Dict) -> List:
+    """Événement kline -> format /api/v3/klines"""
+    return [k['t'], k['o'], k['h'], k['l'], k['c'], k['v'], k['T'], k['q'], k['n'], k['V'], k['Q'], '0']
+
+
+class MarketDataDaemon:
+    """
+    Tient à jour la table des prix, les carnets, trades et chandeliers en cours
+    des symboles consultés, et les publie dans le cache partagé.
+
+    fetch(endpoint, path, params) fait un appel REST (resynchronisation) ;
+    par défaut BinanceAPIService._request sans valeur périmée ni dernière réponse
+    conservée (limiteur de poids inclus).
+    """
+
+    def __init__(self, transport=None, base_url: Optional[str] = None,
+                 fetch: Optional[Callable[..., Any]] = None, store=None,
+                 publish_interval: Optional[float] = None, kline_intervals: Optional[List[str]] = None,
+                 max_symbols: Optional[int] = None):
+        if fetch is None:
+            from .binance_service import BinanceAPIService
+
+            def fetch(endpoint, path, params=None):
+                return BinanceAPIService._request(endpoint, path, params, allow_stale=False, fallback=False)
+        self.fetch = fetch
+        self.store = store if store is not None else _store()
+        self.publish_interval = publish_interval or getattr(settings, 'BINANCE_STREAM_PUBLISH_INTERVAL', 1)
+        self.kline_intervals = kline_intervals or getattr(settings, 'BINANCE_STREAM_KLINE_INTERVALS', ['1h', '1d'])
+        self.max_symbols = max_symbols or getattr(settings, 'BINANCE_STREAM_MAX_SYMBOLS', 20)
+        self.max_age = getattr(settings, 'BINANCE_STREAM_MAX_AGE', 10)
+
+        self.client = StreamClient(
+            base_url, transport,
+            on_message=self._on_message,
+            on_connect=self._on_connect,
+            on_disconnect=self._on_disconnect,
+            name='binance-market-stream',
+        )
+        self.depth_source = BinanceDepthStreamSource(client=self.client)
+        self._snapshot_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='depth-snapshot')
+        self.order_books = OrderBookManager(
+            self.depth_source,
+            fetch_snapshot=lambda symbol: self.fetch(
+                'order_book_snapshot', '/api/v3/depth',
+                {'symbol': symbol, 'limit': getattr(settings, 'BINANCE_ORDER_BOOK_SNAPSHOT_LIMIT', 1000)},
+            ),
+            executor=self._snapshot_executor,
+            max_symbols=self.max_symbols,
+            idle_timeout=getattr(settings, 'BINANCE_STREAM_WATCH_TTL', 60),
+        )
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self.tickers: Dict[str, Dict] = {}
+        self.trades: Dict[str, deque] = {}
+        self.last_trade_id: Dict[str, int] = {}
+        self.klines: Dict[tuple, List] = {}
+        self.watched: List[str] = []
+
+        # Resynchronisations REST en attente
+        self._resync_tickers = True
+        self._resync_trades = set()
+
+        self.trade_gaps = 0
+        self.publishes = 0
+
+    # -- flux ---------------------------------------------------------------
+
+    def _symbol_streams(self, symbol: str) -> List[str]:
+        lower = symbol.lower()
+        return [f"{lower}@trade"] + [f"{lower}@kline_{interval}" for interval in self.kline_intervals]
+
+    def _on_connect(self) -> None:
+        # Des événements ont pu être perdus pendant la coupure
+        with self._lock:
+            self._resync_tickers = True
+            self._resync_trades |= set(self.watched)
+
+    def _on_disconnect(self) -> None:
+        self.depth_source.handle_disconnect()
+
+    def _on_message(self, stream: str, data) -> None:
+        if stream == ALL_TICKERS_STREAM:
+            with self._lock:
+                for event in data:
+                    _mini_ticker_update(self.tickers.setdefault(event['s'], {}), event)
+        elif stream.endswith('@trade'):
+            self._on_trade(data)
+        elif '@kline_' in stream:
+            kline = data['k']
+            with self._lock:
+                self.klines[(data['s'], kline['i'])] = _kline_from_stream(kline)
+        elif '@depth' in stream:
+            self.depth_source.handle_message(stream, data)
+
+    def _on_trade(self, data: Dict) -> None:
+        symbol, trade_id = data['s'], data['t']
+        with self._lock:
+            if symbol not in self.watched:
+                return
+            last = self.last_trade_id.get(symbol)
+            if last is not None and trade_id <= last:
+                return  # doublon (après une resynchronisation)
+            if last is not None and trade_id != last + 1:
+                # Trou dans les identifiants de trade : on recharge en REST
+                self.trade_gaps += 1
+                self._resync_trades.add(symbol)
+            self.trades.setdefault(symbol, deque(maxlen=TRADES_KEPT)).append(_trade_from_stream(data))
+            self.last_trade_id[symbol] = trade_id
+
+    # -- boucle principale ----------------------------------------------------
+
+    def _sync_watched(self) -> None:
+        """Abonne les symboles nouvellement consultés, désabonne les autres"""
+        watched = watched_symbols()[:self.max_symbols]
+        with self._lock:
+            added = [s for s in watched if s not in self.watched]
+            removed = [s for s in self.watched if s not in watched]
+            self.watched = watched
+            self._resync_trades |= set(added)
+            for symbol in removed:
+                self.trades.pop(symbol, None)
+                self.last_trade_id.pop(symbol, None)
+                for interval in self.kline_intervals:
+                    self.klines.pop((symbol, interval), None)
+
+        for symbol in added:
+            self.client.subscribe(self._symbol_streams(symbol))
+        for symbol in removed:
+            self.client.unsubscribe(self._symbol_streams(symbol))
+
+        # Garde les carnets des symboles consultés (abonnement + instantané)
+        for symbol in watched:
+            self.order_books.get_depth(symbol, 1)
+        self.order_books.prune()
+
+    def _resync(self) -> None:
+        """Resynchronisations REST demandées (démarrage, reconnexion, trou de séquence)"""
+        with self._lock:
+            resync_tickers = self._resync_tickers
+            symbols = list(self._resync_trades)
+
+        if resync_tickers:
+            try:
+                tickers = self.fetch('ticker_24hr', '/api/v3/ticker/24hr')
+            except Exception as e:
+                print(f"Resynchronisation des tickers impossible: {e}")
+            else:
+                with self._lock:
+                    self.tickers = {t['symbol']: dict(t) for t in tickers if t.get('symbol')}
+                    self._resync_tickers = False
+
+        for symbol in symbols:
+            try:
+                trades = self.fetch('recent_trades', '/api/v3/trades', {'symbol': symbol, 'limit': TRADES_KEPT})
+            except Exception as e:
+                print(f"Resynchronisation des trades {symbol} impossible: {e}")
+                continue
+            with self._lock:
+                self._resync_trades.discard(symbol)
+                if symbol not in self.watched:
+                    continue
+                # Les trades reçus par le flux pendant l'appel sont conservés
+                streamed = [t for t in self.trades.get(symbol, ()) if not trades or t['id'] > trades[-1]['id']]
+                self.trades[symbol] = deque(list(trades) + streamed, maxlen=TRADES_KEPT)
+                if self.trades[symbol]:
+                    self.last_trade_id[symbol] = self.trades[symbol][-1]['id']
+
+    def publish(self) -> None:
+        """Écrit l'état courant dans le cache partagé"""
+        now = time.time()
+        entries = {}
+        with self._lock:
+            if self.tickers and not self._resync_tickers:
+                entries[TICKERS_KEY] = [dict(t) for t in self.tickers.values()]
+            for symbol in self.watched:
+                if symbol in self.trades and symbol not in self._resync_trades:
+                    entries[trades_key(symbol)] = list(self.trades[symbol])
+                for interval in self.kline_intervals:
+                    kline = self.klines.get((symbol, interval))
+                    if kline:
+                        entries[kline_key(symbol, interval)] = kline
+        for symbol in self.watched:
+            depth = self.order_books.get_depth(symbol, DEPTH_PUBLISHED)
+            if depth is not None:
+                entries[depth_key(symbol)] = depth
+
+        if self.store is not None and entries:
+            self.store.set_many(
+                {key: {'data': data, 'published_at': now} for key, data in entries.items()},
+                timeout=self.max_age * 3,
+            )
+        self.publishes += 1
+
+    def step(self) -> None:
+        """Un cycle : abonnements, resynchronisations, publication"""
+        self._sync_watched()
+        self._resync()
+        self.publish()
+
+    def run(self) -> None:
+        """Démarre le flux et publie jusqu'à stop()"""
+        self.client.subscribe([ALL_TICKERS_STREAM])
+        self.order_books.start()
+        self.client.start()
+        while not self._stop.is_set():
+            started = time.monotonic()
+            try:
+                self.step()
+            except Exception as e:
+                print(f"Démon de flux: cycle en erreur: {e}")
+            self._stop.wait(max(0.0, self.publish_interval - (time.monotonic() - started)))
+
+    def stop(self) -> None:
+        self._stop.set()
+        self.client.close()
+        self._snapshot_executor.shutdown(wait=False)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'connected': self.client.connected,
+                'streams': len(self.client.streams),
+                'messages': self.client.messages,
+                'reconnects': self.client.reconnects,
+                'tickers': len(self.tickers),
+                'watched': list(self.watched),
+                'trade_gaps': self.trade_gaps,
+                'order_book_resyncs': self.order_books.resyncs,
+                'publishes': self.publishes,
+            }
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.7 on 2026-10-17 23:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Kline',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('symbol', models.CharField(max_length=20)),
+                ('interval', models.CharField(max_length=4)),
+                ('open_time', models.BigIntegerField()),
+                ('open', models.CharField(max_length=32)),
+                ('high', models.CharField(max_length=32)),
+                ('low', models.CharField(max_length=32)),
+                ('close', models.CharField(max_length=32)),
+                ('volume', models.CharField(max_length=32)),
+                ('close_time', models.BigIntegerField()),
+                ('quote_volume', models.CharField(max_length=32)),
+                ('trades', models.IntegerField(default=0)),
+                ('taker_buy_base', models.CharField(max_length=32)),
+                ('taker_buy_quote', models.CharField(max_length=32)),
+            ],
+            options={
+                'verbose_name': 'Chandelier',
+                'verbose_name_plural': 'Chandeliers',
+                'indexes': [models.Index(fields=['symbol', 'interval', '-open_time'], name='api_service_symbol_1912ca_idx')],
+                'unique_together': {('symbol', 'interval', 'open_time')},
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-18 00:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_services', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='kline',
+            name='first',
+            field=models.BooleanField(default=False),
+        ),
+    ]
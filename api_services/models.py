@@ -1,4 +1,53 @@
 from django.db import models
 
-# This app doesn't need models - it's a service layer
 
+class Kline(models.Model):
+    """
+    Chandelier Binance clôturé, conservé localement (api_services.kline_store).
+    Les valeurs sont stockées telles que renvoyées par l'API (chaînes),
+    pour restituer exactement le format de /api/v3/klines.
+    """
+
+    symbol = models.CharField(max_length=20)
+    interval = models.CharField(max_length=4)
+    open_time = models.BigIntegerField()  # ms epoch
+    open = models.CharField(max_length=32)
+    high = models.CharField(max_length=32)
+    low = models.CharField(max_length=32)
+    close = models.CharField(max_length=32)
+    volume = models.CharField(max_length=32)
+    close_time = models.BigIntegerField()
+    quote_volume = models.CharField(max_length=32)
+    trades = models.IntegerField(default=0)
+    taker_buy_base = models.CharField(max_length=32)
+    taker_buy_quote = models.CharField(max_length=32)
+    first = models.BooleanField(default=False)  # premier chandelier de l'historique Binance
+
+    class Meta:
+        verbose_name = "Chandelier"
+        verbose_name_plural = "Chandeliers"
+        unique_together = ['symbol', 'interval', 'open_time']
+        indexes = [
+            models.Index(fields=['symbol', 'interval', '-open_time']),
+        ]
+
+    def __str__(self):
+        return f"{self.symbol} {self.interval} @ {self.open_time}"
+
+    @classmethod
+    def from_api(cls, symbol, interval, k):
+        """Construit une instance à partir d'une ligne /api/v3/klines"""
+        return cls(
+            symbol=symbol, interval=interval, open_time=int(k[0]),
+            open=k[1], high=k[2], low=k[3], close=k[4], volume=k[5],
+            close_time=int(k[6]), quote_volume=k[7], trades=int(k[8]),
+            taker_buy_base=k[9], taker_buy_quote=k[10],
+        )
+
+    def to_api(self):
+        """Ligne au format /api/v3/klines"""
+        return [
+            self.open_time, self.open, self.high, self.low, self.close, self.volume,
+            self.close_time, self.quote_volume, self.trades,
+            self.taker_buy_base, self.taker_buy_quote, '0',
+        ]
@@ -0,0 +1,424 @@
+"""
+Carnets d'ordres maintenus localement à partir du flux diff-depth Binance
+Procédure Binance (« How to manage a local order book correctly ») :
+1. s'abonner au flux <symbol>@depth et mettre les événements en tampon
+2. charger un instantané /api/v3/depth
+3. ignorer les événements dont u <= lastUpdateId de l'instantané
+4. le premier événement appliqué doit vérifier U <= lastUpdateId + 1 <= u
+5. ensuite chaque événement doit suivre le précédent (U == u précédent + 1),
+   sinon le carnet est désynchronisé et on recharge un instantané
+Une quantité nulle supprime le niveau de prix.
+
+Les carnets ne sont tenus que pour les symboles consultés récemment (LRU borné,
+expiration après inactivité) ; la source du flux est interchangeable
+(WebSocket Binance en production, rejeu local pour les tests).
+"""
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Executor
+from typing import Callable, Dict, Iterable, List, Optional
+
+from sortedcontainers import SortedDict
+
+from .streams import StreamClient
+
+
+class OrderBookOutOfSync(Exception):
+    """Trou dans la séquence des mises à jour : le carnet doit être rechargé"""
+
+
+class _BookSide:
+    """
+    Un côté du carnet : niveaux triés par prix (décroissant pour les bids).
+    SortedDict (sortedcontainers) clé de prix -> [prix, quantité] : insertion et
+    suppression en O(log n), là où une liste triée (insort / del) décale
+    tous les niveaux suivants.
+    """
+
+    __slots__ = ('descending', '_levels')
+
+    def __init__(self, descending: bool):
+        self.descending = descending
+        self._levels: "SortedDict[float, List[str]]" = SortedDict()  # clés croissantes
+
+    def _key(self, price: str) -> float:
+        return -float(price) if self.descending else float(price)
+
+    def clear(self) -> None:
+        self._levels.clear()
+
+    def update(self, price: str, qty: str) -> None:
+        """Insère, modifie ou supprime (quantité nulle) un niveau"""
+        key = self._key(price)
+        if float(qty) == 0:
+            self._levels.pop(key, None)
+            return
+        level = self._levels.get(key)
+        if level is None:
+            self._levels[key] = [price, qty]
+        else:
+            level[1] = qty
+
+    def top(self, limit: int) -> List[List[str]]:
+        """Les `limit` meilleurs niveaux, au format [prix, quantité] de l'API"""
+        return [list(level) for level in self._levels.values()[:limit]]
+
+    def __len__(self) -> int:
+        return len(self._levels)
+
+
+class LocalOrderBook:
+    """Carnet d'ordres d'un symbole, tenu à jour par les événements diff-depth"""
+
+    MAX_BUFFER = 1000  # événements gardés en attendant l'instantané
+
+    def __init__(self, symbol: str):
+        self.symbol = symbol
+        self.bids = _BookSide(descending=True)
+        self.asks = _BookSide(descending=False)
+        self.last_update_id = 0
+        self.synced = False
+        self.updated_at = 0.0
+        self._buffer: List[Dict] = []
+        self._first_applied = False
+
+    def load_snapshot(self, snapshot: Dict) -> None:
+        """
+        Initialise le carnet depuis /api/v3/depth puis rejoue les événements
+        en tampon. Lève OrderBookOutOfSync si l'instantané est plus ancien
+        que le premier événement disponible (il faut en recharger un).
+        """
+        self.bids.clear()
+        self.asks.clear()
+        for price, qty in snapshot.get('bids', []):
+            self.bids.update(price, qty)
+        for price, qty in snapshot.get('asks', []):
+            self.asks.update(price, qty)
+        self.last_update_id = int(snapshot['lastUpdateId'])
+        self._first_applied = False
+        self.synced = True
+        self.updated_at = time.time()
+
+        buffered, self._buffer = self._buffer, []
+        for event in buffered:
+            self.apply(event)
+
+    def apply(self, event: Dict) -> None:
+        """
+        Applique un événement diff-depth (champs U, u, b, a).
+        Avant l'instantané, l'événement est mis en tampon.
+        """
+        if not self.synced:
+            self._buffer.append(event)
+            if len(self._buffer) > self.MAX_BUFFER:
+                del self._buffer[0]
+            return
+
+        first_id, last_id = int(event['U']), int(event['u'])
+        if last_id <= self.last_update_id:
+            return  # déjà inclus dans l'instantané
+        if self._first_applied:
+            valid = first_id == self.last_update_id + 1
+        else:
+            valid = first_id <= self.last_update_id + 1 <= last_id
+        if not valid:
+            self.invalidate()
+            raise OrderBookOutOfSync(
+                f"{self.symbol}: attendu {self.last_update_id + 1}, reçu U={first_id} u={last_id}"
+            )
+
+        for price, qty in event.get('b', []):
+            self.bids.update(price, qty)
+        for price, qty in event.get('a', []):
+            self.asks.update(price, qty)
+        self.last_update_id = last_id
+        self._first_applied = True
+        self.updated_at = time.time()
+
+    def invalidate(self) -> None:
+        """Marque le carnet comme désynchronisé (rechargement nécessaire)"""
+        self.synced = False
+        self._buffer = []
+
+    def to_api(self, limit: int = 20) -> Dict:
+        """Carnet au format de /api/v3/depth"""
+        return {
+            'lastUpdateId': self.last_update_id,
+            'bids': self.bids.top(limit),
+            'asks': self.asks.top(limit),
+        }
+
+
+class DepthStreamSource:
+    """
+    Source d'événements diff-depth (interface).
+    start() reçoit deux rappels :
+      on_event(event)  -- un événement depthUpdate (champs s, U, u, b, a)
+      on_reset()       -- la connexion a été perdue : tous les carnets sont à recharger
+    """
+
+    def start(self, on_event: Callable[[Dict], None], on_reset: Callable[[], None]) -> None:
+        raise NotImplementedError
+
+    def subscribe(self, symbol: str) -> None:
+        raise NotImplementedError
+
+    def unsubscribe(self, symbol: str) -> None:
+        raise NotImplementedError
+
+    @property
+    def connected(self) -> bool:
+        """True si les événements arrivent (sinon les carnets ne sont pas servis)"""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class ReplayDepthSource(DepthStreamSource):
+    """
+    Source de rejeu : les événements sont poussés explicitement (push / replay),
+    de façon synchrone. Pour les tests et les benchmarks hors ligne.
+    """
+
+    def __init__(self, events: Optional[Iterable[Dict]] = None):
+        self.events = list(events or [])
+        self.subscriptions = set()
+        self._on_event = None
+        self._on_reset = None
+        self._connected = True
+
+    @classmethod
+    def from_file(cls, path) -> 'ReplayDepthSource':
+        """Événements enregistrés, un objet JSON par ligne (brut ou enveloppe de flux combiné)"""
+        events = []
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    message = json.loads(line)
+                    events.append(message.get('data', message))
+        return cls(events)
+
+    def start(self, on_event, on_reset) -> None:
+        self._on_event = on_event
+        self._on_reset = on_reset
+
+    def subscribe(self, symbol: str) -> None:
+        self.subscriptions.add(symbol)
+
+    def unsubscribe(self, symbol: str) -> None:
+        self.subscriptions.discard(symbol)
+
+    @property
+    def connected(self) -> bool:
+        return self._connected
+
+    def push(self, event: Dict) -> None:
+        """Transmet un événement s'il concerne un symbole suivi"""
+        if self._on_event and event.get('s') in self.subscriptions:
+            self._on_event(event)
+
+    def replay(self) -> int:
+        """Transmet tous les événements chargés ; retourne le nombre transmis"""
+        count = 0
+        for event in self.events:
+            if event.get('s') in self.subscriptions:
+                self.push(event)
+                count += 1
+        return count
+
+    def disconnect(self) -> None:
+        """Simule une coupure de connexion"""
+        self._connected = False
+        if self._on_reset:
+            self._on_reset()
+
+    def reconnect(self) -> None:
+        self._connected = True
+
+
+class BinanceDepthStreamSource(DepthStreamSource):
+    """
+    Flux diff-depth Binance (<symbol>@depth@100ms) sur une connexion combinée
+    (api_services.streams.StreamClient). Par défaut la source ouvre sa propre
+    connexion ; le démon de flux (stream_market_data) lui passe la sienne et
+    lui transmet les messages via handle_message() / handle_disconnect().
+    """
+
+    def __init__(self, base_url: Optional[str] = None, speed: str = '100ms',
+                 transport=None, client: Optional[StreamClient] = None):
+        self.speed = speed
+        self._owns_client = client is None
+        self.client = client or StreamClient(
+            base_url, transport,
+            on_message=self.handle_message,
+            on_disconnect=self.handle_disconnect,
+            name='binance-depth-stream',
+        )
+        self._on_event = None
+        self._on_reset = None
+
+    def stream_name(self, symbol: str) -> str:
+        return f"{symbol.lower()}@depth@{self.speed}"
+
+    def start(self, on_event, on_reset) -> None:
+        self._on_event = on_event
+        self._on_reset = on_reset
+        if self._owns_client:
+            self.client.start()
+
+    def subscribe(self, symbol: str) -> None:
+        self.client.subscribe([self.stream_name(symbol)])
+
+    def unsubscribe(self, symbol: str) -> None:
+        self.client.unsubscribe([self.stream_name(symbol)])
+
+    @property
+    def connected(self) -> bool:
+        return self.client.connected
+
+    def handle_message(self, stream: str, data) -> None:
+        if self._on_event and isinstance(data, dict) and data.get('e') == 'depthUpdate':
+            self._on_event(data)
+
+    def handle_disconnect(self) -> None:
+        if self._on_reset:
+            self._on_reset()
+
+    def close(self) -> None:
+        if self._owns_client:
+            self.client.close()
+
+
+class OrderBookManager:
+    """
+    Carnets locaux des symboles consultés récemment.
+    get_depth() sert le carnet depuis la mémoire quand il est synchronisé ;
+    sinon il déclenche (en arrière-plan) le chargement de l'instantané et
+    retourne None : l'appelant se rabat alors sur l'appel REST.
+    """
+
+    def __init__(self, source: DepthStreamSource, fetch_snapshot: Callable[[str], Dict],
+                 executor: Optional[Executor] = None, max_symbols: int = 20, idle_timeout: float = 60.0):
+        self.source = source
+        self.fetch_snapshot = fetch_snapshot
+        self.executor = executor
+        self.max_symbols = max_symbols
+        self.idle_timeout = idle_timeout
+        self._books: "OrderedDict[str, LocalOrderBook]" = OrderedDict()
+        self._last_seen: Dict[str, float] = {}
+        self._loading = set()
+        self._lock = threading.RLock()
+        self._started = False
+
+        self.served = 0
+        self.resyncs = 0
+
+    def _ensure_started(self) -> None:
+        if not self._started:
+            self._started = True
+            self.source.start(self._on_event, self._on_reset)
+
+    def start(self) -> None:
+        """Branche le gestionnaire sur sa source (sinon fait au premier get_depth)"""
+        with self._lock:
+            self._ensure_started()
+
+    def _on_event(self, event: Dict) -> None:
+        with self._lock:
+            book = self._books.get(event.get('s'))
+            if book is None:
+                return
+            try:
+                book.apply(event)
+            except OrderBookOutOfSync as e:
+                print(f"Carnet désynchronisé, rechargement: {e}")
+                self.resyncs += 1
+
+    def _on_reset(self) -> None:
+        with self._lock:
+            for book in self._books.values():
+                book.invalidate()
+
+    def _evict(self, now: float) -> None:
+        """Retire les symboles inactifs et ceux au-delà de la capacité (LRU)"""
+        for symbol in list(self._books):
+            if now - self._last_seen[symbol] > self.idle_timeout or len(self._books) > self.max_symbols:
+                self._books.pop(symbol)
+                self._last_seen.pop(symbol, None)
+                self.source.unsubscribe(symbol)
+            else:
+                break  # OrderedDict trié du moins au plus récemment consulté
+
+    def prune(self) -> None:
+        """Retire les symboles qui ne sont plus consultés"""
+        with self._lock:
+            self._evict(time.time())
+
+    def _bootstrap(self, symbol: str) -> None:
+        try:
+            snapshot = self.fetch_snapshot(symbol)
+            with self._lock:
+                book = self._books.get(symbol)
+                if book is not None and not book.synced:
+                    book.load_snapshot(snapshot)
+        except OrderBookOutOfSync as e:
+            print(f"Instantané trop ancien, nouvel essai au prochain appel: {e}")
+        except Exception as e:
+            print(f"Erreur chargement carnet {symbol}: {e}")
+        finally:
+            with self._lock:
+                self._loading.discard(symbol)
+
+    def get_depth(self, symbol: str, limit: int = 20) -> Optional[Dict]:
+        """Carnet (format /api/v3/depth) depuis la mémoire, ou None s'il n'est pas prêt"""
+        now = time.time()
+        with self._lock:
+            self._ensure_started()
+            book = self._books.get(symbol)
+            if book is None:
+                book = LocalOrderBook(symbol)
+                self._books[symbol] = book
+                self.source.subscribe(symbol)
+            self._books.move_to_end(symbol)
+            self._last_seen[symbol] = now
+            self._evict(now)
+
+            if not self.source.connected:
+                return None  # pas de flux : inutile de charger un instantané
+            if book.synced:
+                self.served += 1
+                return book.to_api(limit)
+
+            if symbol not in self._loading:
+                self._loading.add(symbol)
+                if self.executor is not None:
+                    self.executor.submit(self._bootstrap, symbol)
+                    return None
+            else:
+                return None
+
+        # Sans executor : chargement synchrone (tests)
+        self._bootstrap(symbol)
+        with self._lock:
+            if book.synced and self.source.connected:
+                self.served += 1
+                return book.to_api(limit)
+        return None
+
+    def stats(self) -> Dict:
+        """Symboles suivis et compteurs, pour le monitoring"""
+        with self._lock:
+            return {
+                'symbols': {s: {'synced': b.synced, 'last_update_id': b.last_update_id,
+                                'bids': len(b.bids), 'asks': len(b.asks)}
+                            for s, b in self._books.items()},
+                'connected': self.source.connected,
+                'served': self.served,
+                'resyncs': self.resyncs,
+            }
+
+    def close(self) -> None:
+        self.source.close()
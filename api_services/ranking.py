@@ -0,0 +1,122 @@
+"""
+Classement des paires les plus actives, calculé sur l'instantané des tickers
+Remplace la liste figée des « paires populaires » (qui contenait des paires
+retirées de la cote) : top-N par volume 24h en actif de cotation, ou par
+variation absolue (en %) parmi les paires assez liquides.
+- tri partiel par tas (heapq.nlargest) : O(n log N) au lieu d'un tri complet
+- l'éligibilité d'un symbole (ouvert au trading, cotation suivie, ni stablecoin
+  ni devise en base) est calculée une fois par symbole et réutilisée d'un
+  instantané à l'autre, tant que le référentiel exchangeInfo ne change pas
+- classement recalculé à chaque nouvel instantané seulement (aucun appel amont
+  propre : l'instantané est celui que la page utilise déjà, le référentiel
+  celui du service, en cache une heure)
+Les paires sans échanges (retirées, suspendues) ont un volume nul et sortent
+d'elles-mêmes du classement.
+"""
+import heapq
+import threading
+from typing import Dict, Iterable, List, Optional
+
+from .snapshot import TickerSnapshot
+from .symbols import FIAT_CURRENCIES, STABLECOINS, SymbolRegistry
+
+
+BY_VOLUME = 'volume'
+BY_CHANGE = 'change'
+
+
+class PairRanking:
+    """Top des paires d'un instantané, par volume ou par variation absolue"""
+
+    def __init__(self, quotes: Iterable[str] = ('USDT',), size: int = 50,
+                 min_quote_volume: float = 0.0, registry: Optional[SymbolRegistry] = None):
+        self.quotes = tuple(quotes)
+        self.size = size
+        self.min_quote_volume = min_quote_volume
+        self.registry = SymbolRegistry()
+        self._registry_source: Optional[SymbolRegistry] = None
+        self._registry_fetched_at: Optional[float] = None
+        self._eligible: Dict[str, bool] = {}
+        self._by_volume: List[str] = []
+        self._by_change: List[str] = []
+        self.fetched_at: Optional[float] = None
+        self.use_registry(registry)
+
+    def use_registry(self, registry: Optional[SymbolRegistry]) -> bool:
+        """
+        Adopte le référentiel s'il diffère de celui en place (autre objet, ou
+        rafraîchi depuis) et vide alors le cache d'éligibilité. True s'il a changé.
+        """
+        fetched_at = getattr(registry, 'fetched_at', None)
+        if registry is self._registry_source and fetched_at == self._registry_fetched_at:
+            return False
+        self.registry = registry or SymbolRegistry()
+        self._registry_source, self._registry_fetched_at = registry, fetched_at
+        self._eligible.clear()
+        return True
+
+    def _is_eligible(self, symbol: str) -> bool:
+        eligible = self._eligible.get(symbol)
+        if eligible is None:
+            info = self.registry.get(symbol)
+            if info is not None:
+                base, quote = info.base_asset, info.quote_asset
+                eligible = info.is_trading
+            else:
+                quote = self.registry.quote_of(symbol)
+                base, eligible = symbol[:-len(quote)], bool(quote)
+            eligible = (
+                eligible and quote in self.quotes and bool(base)
+                and base not in STABLECOINS and base not in FIAT_CURRENCIES
+            )
+            self._eligible[symbol] = eligible
+        return eligible
+
+    def update(self, snapshot: TickerSnapshot) -> None:
+        """Recalcule le classement à partir d'un nouvel instantané"""
+        candidates = [
+            t for t in snapshot.tickers
+            if t.quote_volume and self._is_eligible(t.symbol)
+        ]
+        by_volume = heapq.nlargest(self.size, candidates, key=lambda t: t.quote_volume)
+        liquid = [t for t in candidates if t.quote_volume >= self.min_quote_volume]
+        by_change = heapq.nlargest(self.size, liquid, key=lambda t: abs(t.price_change_percent or 0.0))
+        self._by_volume = [t.symbol for t in by_volume]
+        self._by_change = [t.symbol for t in by_change]
+        self.fetched_at = snapshot.fetched_at
+
+    def top(self, n: Optional[int] = None, by: str = BY_VOLUME) -> List[str]:
+        """n premiers symboles (au plus `size`), par volume ou par variation absolue"""
+        ranked = self._by_change if by == BY_CHANGE else self._by_volume
+        return ranked[:n] if n is not None else list(ranked)
+
+    def __len__(self) -> int:
+        return len(self._by_volume)
+
+
+_ranking: Optional[PairRanking] = None
+_ranking_snapshot: Optional[TickerSnapshot] = None  # instantané du classement (comparé par identité)
+_ranking_lock = threading.Lock()
+
+
+def get_pair_ranking(snapshot: TickerSnapshot, quotes: Iterable[str] = ('USDT',), size: int = 50,
+                     min_quote_volume: float = 0.0,
+                     registry: Optional[SymbolRegistry] = None) -> PairRanking:
+    """
+    Classement partagé du processus, recalculé seulement quand l'instantané
+    ou le référentiel change ; le cache d'éligibilité des symboles est conservé
+    tant que le référentiel reste le même. Sans référentiel (None, ex. exchangeInfo
+    indisponible), le précédent reste en place.
+    """
+    global _ranking, _ranking_snapshot
+    with _ranking_lock:
+        settings_key = (tuple(quotes), size, min_quote_volume)
+        if _ranking is None or (_ranking.quotes, _ranking.size, _ranking.min_quote_volume) != settings_key:
+            _ranking = PairRanking(quotes, size, min_quote_volume, registry)
+            _ranking_snapshot = None
+        elif registry is not None and _ranking.use_registry(registry):
+            _ranking_snapshot = None
+        if _ranking_snapshot is not snapshot:
+            _ranking.update(snapshot)
+            _ranking_snapshot = snapshot
+        return _ranking
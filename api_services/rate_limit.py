@@ -0,0 +1,173 @@
+"""
+Comptabilité des poids de requête Binance et limiteur côté client
+Binance limite le poids cumulé des requêtes par IP et par minute
+(REQUEST_WEIGHT, 6000/min par défaut) ; au-delà : 429 puis ban IP (418).
+Le limiteur est un token bucket alimenté au rythme du budget par minute,
+recalé sur l'en-tête X-MBX-USED-WEIGHT-1M renvoyé par Binance.
+"""
+import threading
+import time
+from typing import Dict, Mapping, Optional
+
+import requests
+from django.conf import settings
+
+
+class RateLimitExceeded(requests.exceptions.RequestException):
+    """Appel refusé localement : le budget de poids Binance est épuisé"""
+
+    def __init__(self, message: str, retry_after: float = 0.0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def request_weight(path: str, params: Optional[Mapping] = None) -> int:
+    """Poids Binance d'une requête (documentation Spot API)"""
+    params = params or {}
+    if path.endswith('/ticker/24hr'):
+        return 2 if 'symbol' in params else 80
+    if path.endswith('/ticker/price'):
+        return 2 if 'symbol' in params else 4
+    if path.endswith('/depth'):
+        limit = int(params.get('limit', 100))
+        if limit <= 100:
+            return 5
+        if limit <= 500:
+            return 25
+        if limit <= 1000:
+            return 50
+        return 250
+    if path.endswith('/trades'):
+        return 25
+    if path.endswith('/exchangeInfo'):
+        return 20
+    if path.endswith('/klines'):
+        return 2
+    return 1
+
+
+class WeightLimiter:
+    """
+    Token bucket sur le poids des requêtes.
+    - capacité = budget par minute (une fraction de la limite Binance)
+    - recharge continue à capacité / 60 jetons par seconde
+    - reserve() peut mettre le seau en négatif (réservation) : l'appelant attend
+      le délai retourné, ou reçoit RateLimitExceeded si ce délai dépasse max_wait
+    """
+
+    def __init__(self, limit: int = 6000, safety_ratio: float = 0.8, max_wait: float = 1.0):
+        self.limit = limit                         # limite Binance (poids / minute)
+        self.capacity = limit * safety_ratio       # budget que l'on s'autorise
+        self.refill_rate = self.capacity / 60.0    # jetons / seconde
+        self.max_wait = max_wait
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+        self.used_weight_1m: Optional[int] = None  # dernière valeur annoncée par Binance
+        self.banned_until = 0.0                    # time.monotonic() de fin de 429/418
+        self.rejected = 0
+        self.spent = 0
+
+    def reset(self) -> None:
+        """Seau plein, sans pause ni compteurs (tests, changement de clé API)"""
+        with self._lock:
+            self._tokens = self.capacity
+            self._updated = time.monotonic()
+            self.used_weight_1m = None
+            self.banned_until = 0.0
+            self.rejected = 0
+            self.spent = 0
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.refill_rate)
+        self._updated = now
+
+    def reserve(self, weight: int, max_wait: Optional[float] = None) -> float:
+        """
+        Réserve `weight` jetons. Retourne le délai (s) à attendre avant d'envoyer
+        la requête, ou lève RateLimitExceeded si l'attente dépasse max_wait.
+        """
+        max_wait = self.max_wait if max_wait is None else max_wait
+        with self._lock:
+            now = time.monotonic()
+            if self.banned_until > now:
+                self.rejected += 1
+                raise RateLimitExceeded(
+                    f"Binance a demandé une pause ({self.banned_until - now:.0f}s restantes)",
+                    self.banned_until - now,
+                )
+            self._refill(now)
+            delay = max(0.0, (weight - self._tokens) / self.refill_rate)
+            if delay > max_wait:
+                self.rejected += 1
+                raise RateLimitExceeded(f"Budget de poids épuisé (poids {weight})", delay)
+            self._tokens -= weight
+            self.spent += weight
+            return delay
+
+    def acquire(self, weight: int, max_wait: Optional[float] = None) -> None:
+        """Version bloquante de reserve() : attend si nécessaire"""
+        delay = self.reserve(weight, max_wait)
+        if delay > 0:
+            time.sleep(delay)
+
+    def update_from_headers(self, status_code: int, headers: Mapping[str, str]) -> None:
+        """Recale le seau sur le poids consommé annoncé par Binance (et gère 429/418)"""
+        used = headers.get('X-MBX-USED-WEIGHT-1M') or headers.get('x-mbx-used-weight-1m')
+        with self._lock:
+            now = time.monotonic()
+            if used is not None:
+                try:
+                    self.used_weight_1m = int(used)
+                except ValueError:
+                    pass
+                else:
+                    # Ne jamais croire avoir plus de jetons que ce que Binance nous laisse
+                    self._refill(now)
+                    self._tokens = min(self._tokens, self.capacity - self.used_weight_1m)
+            if status_code in (418, 429):
+                try:
+                    retry_after = float(headers.get('Retry-After') or 60)
+                except ValueError:
+                    retry_after = 60.0
+                self.banned_until = max(self.banned_until, now + retry_after)
+
+    def remaining(self) -> float:
+        """Jetons disponibles immédiatement"""
+        with self._lock:
+            self._refill(time.monotonic())
+            return max(0.0, self._tokens)
+
+    def wait_time(self, weight: int) -> float:
+        """Délai (s) avant qu'un appel de ce poids puisse partir sans attente"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            refill_wait = max(0.0, (weight - self._tokens) / self.refill_rate)
+            return max(refill_wait, self.banned_until - now)
+
+    def has_budget(self, weight: int) -> bool:
+        """True si un appel de ce poids peut partir sans attente"""
+        return self.wait_time(weight) == 0
+
+    def status(self) -> Dict:
+        """État du limiteur, pour les vues et le monitoring"""
+        now = time.monotonic()
+        return {
+            'limit': self.limit,
+            'budget': self.capacity,
+            'remaining': round(self.remaining(), 1),
+            'used_weight_1m': self.used_weight_1m,
+            'paused_for': max(0.0, round(self.banned_until - now, 1)),
+            'spent': self.spent,
+            'rejected': self.rejected,
+        }
+
+
+# Limiteur partagé par tous les clients Binance du processus
+limiter = WeightLimiter(
+    limit=getattr(settings, 'BINANCE_WEIGHT_LIMIT', 6000),
+    safety_ratio=getattr(settings, 'BINANCE_WEIGHT_SAFETY_RATIO', 0.8),
+    max_wait=getattr(settings, 'BINANCE_WEIGHT_MAX_WAIT', 1.0),
+)
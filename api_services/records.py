@@ -0,0 +1,260 @@
+"""
+Enregistrements compacts des données de marché : Ticker, Kline et Trade
+Binance renvoie des dicts (ou des listes) de chaînes numériques
+("lastPrice": "64000.01000000"). Les réponses sont converties une seule fois,
+à la frontière du service : les champs numériques d'un enregistrement tiennent
+dans un array('d') (8 octets par champ, sans objet Python par valeur), les
+autres dans des __slots__.
+
+Les attributs renvoient des nombres (ticker.last_price, kline.close : float,
+int pour les dates et compteurs, None si le champ est absent). Les chaînes
+reçues de Binance sont gardées telles quelles (slot _raw) : ticker.get('lastPrice'),
+trade['price'] et to_api() les restituent à l'identique (sérialisation JSON
+comprise, voir json_codec). Un enregistrement construit à partir de nombres
+(ex. klines agrégées par resample) formate ses champs depuis les floats.
+"""
+import math
+from array import array
+from operator import itemgetter
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+# Nature d'un champ numérique : type de l'attribut, format à la restitution
+INT, AMOUNT, PERCENT = range(3)
+
+NAN = float('nan')
+
+
+def _number(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return NAN
+
+
+def _format(kind: int, value: float) -> Any:
+    """Valeur au format Binance : entier, 8 décimales, 3 pour les pourcentages"""
+    if kind == INT:
+        return int(value)
+    if kind == PERCENT:
+        return f"{value:.3f}"
+    return f"{value:.8f}"
+
+
+def _field(index: int, kind: int) -> property:
+    if kind == INT:
+        def read(self):
+            value = self._values[index]
+            return None if math.isnan(value) else int(value)
+    else:
+        def read(self):
+            value = self._values[index]
+            return None if math.isnan(value) else value
+    return property(read)
+
+
+class Record:
+    """
+    Base des enregistrements.
+    FIELDS : champs numériques, ((nom Binance, attribut, nature), ...), dans _values ;
+    TEXT : autres champs, ((nom Binance, attribut), ...), dans les __slots__ de la classe.
+    """
+
+    __slots__ = ('_values', '_raw')
+    FIELDS: Tuple[Tuple[str, str, int], ...] = ()
+    TEXT: Tuple[Tuple[str, str], ...] = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for index, (_, attr, kind) in enumerate(cls.FIELDS):
+            setattr(cls, attr, _field(index, kind))
+        cls._NAMES = tuple(name for name, _, _ in cls.FIELDS)
+        cls._pick = itemgetter(*cls._NAMES) if len(cls._NAMES) > 1 else None
+        cls._BY_NAME = {name: (index, kind) for index, (name, _, kind) in enumerate(cls.FIELDS)}
+        cls._KINDS = tuple(kind for _, _, kind in cls.FIELDS)
+        cls._TEXT_BY_NAME = dict(cls.TEXT)
+
+    def __init__(self, values: Iterable[Any], *text, raw: Optional[Sequence[Any]] = None):
+        """
+        values : champs numériques dans l'ordre de FIELDS (None = absent) ; text : champs TEXT ;
+        raw : valeurs reçues de Binance dans l'ordre de FIELDS (restituées telles quelles)
+        """
+        self._raw = tuple(raw) if raw is not None else None
+        if not isinstance(values, array):
+            values = array('d', (NAN if v is None else v for v in values))
+        if len(values) < len(self.FIELDS):
+            values.extend([NAN] * (len(self.FIELDS) - len(values)))
+        self._values = values
+        for (_, attr), value in zip(self.TEXT, text):
+            setattr(self, attr, value)
+        for _, attr in self.TEXT[len(text):]:
+            setattr(self, attr, None)
+
+    def __getstate__(self):
+        return self._values, tuple(getattr(self, attr) for _, attr in self.TEXT), self._raw
+
+    def __setstate__(self, state):
+        values, text, raw = state if len(state) == 3 else (*state, None)
+        if isinstance(raw, dict):
+            # Ancien format conservé en cache : {index: chaîne} des seuls champs à restituer tels quels
+            raw = [raw.get(index) for index in range(len(self.FIELDS))]
+        self.__init__(values, *text, raw=raw)
+
+    def _text(self, index: int) -> Any:
+        """Champ `index` au format Binance (chaîne reçue si elle existe), None s'il est absent"""
+        if self._raw is not None and index < len(self._raw):
+            text = self._raw[index]
+            if text.__class__ is str:
+                return text
+        value = self._values[index]
+        return None if math.isnan(value) else _format(self._KINDS[index], value)
+
+    def __repr__(self) -> str:
+        shown = [f"{attr}={getattr(self, attr)!r}" for _, attr in self.TEXT]
+        shown += [f"{attr}={getattr(self, attr)!r}" for _, attr, _ in self.FIELDS[:4]]
+        return f"{type(self).__name__}({', '.join(shown)}, ...)"
+
+
+class _MappingRecord(Record):
+    """Enregistrement issu d'un objet JSON : lecture par nom de champ Binance"""
+
+    __slots__ = ()
+
+    @classmethod
+    def from_api(cls, data: Dict):
+        get = data.get
+        try:
+            raw = cls._pick(data)
+            values = array('d', map(float, raw))
+        except (KeyError, TypeError, ValueError):
+            # Champ absent ou invalide : conversion champ par champ
+            raw = [get(name) for name in cls._NAMES]
+            values = array('d', [_number(value) for value in raw])
+        return cls(values, *[get(name) for name, _ in cls.TEXT], raw=raw)
+
+    def get(self, name: str, default: Any = None) -> Any:
+        """Champ au format Binance (chaîne numérique), default s'il est absent"""
+        spec = self._BY_NAME.get(name)
+        if spec is None:
+            attr = self._TEXT_BY_NAME.get(name)
+            value = getattr(self, attr) if attr else None
+        else:
+            value = self._text(spec[0])
+        return default if value is None else value
+
+    def __getitem__(self, name: str) -> Any:
+        value = self.get(name)
+        if value is None:
+            raise KeyError(name)
+        return value
+
+    def __contains__(self, name) -> bool:
+        return self.get(name) is not None
+
+    def to_api(self) -> Dict[str, Any]:
+        """Objet au format de la réponse Binance (champs présents seulement)"""
+        result = {}
+        for name, attr in self.TEXT:
+            value = getattr(self, attr)
+            if value is not None:
+                result[name] = value
+        for index, name in enumerate(self._NAMES):
+            value = self._text(index)
+            if value is not None:
+                result[name] = value
+        return result
+
+
+class Ticker(_MappingRecord):
+    """Ticker 24h (/api/v3/ticker/24hr)"""
+
+    __slots__ = ('symbol',)
+    TEXT = (('symbol', 'symbol'),)
+    FIELDS = (
+        ('priceChange', 'price_change', AMOUNT),
+        ('priceChangePercent', 'price_change_percent', PERCENT),
+        ('weightedAvgPrice', 'weighted_avg_price', AMOUNT),
+        ('prevClosePrice', 'prev_close_price', AMOUNT),
+        ('lastPrice', 'last_price', AMOUNT),
+        ('lastQty', 'last_qty', AMOUNT),
+        ('bidPrice', 'bid_price', AMOUNT),
+        ('bidQty', 'bid_qty', AMOUNT),
+        ('askPrice', 'ask_price', AMOUNT),
+        ('askQty', 'ask_qty', AMOUNT),
+        ('openPrice', 'open_price', AMOUNT),
+        ('highPrice', 'high_price', AMOUNT),
+        ('lowPrice', 'low_price', AMOUNT),
+        ('volume', 'volume', AMOUNT),
+        ('quoteVolume', 'quote_volume', AMOUNT),
+        ('openTime', 'open_time', INT),
+        ('closeTime', 'close_time', INT),
+        ('firstId', 'first_id', INT),
+        ('lastId', 'last_id', INT),
+        ('count', 'count', INT),
+    )
+
+
+class Trade(_MappingRecord):
+    """Transaction (/api/v3/trades, ou flux <symbol>@trade converti)"""
+
+    __slots__ = ('is_buyer_maker', 'is_best_match')
+    TEXT = (('isBuyerMaker', 'is_buyer_maker'), ('isBestMatch', 'is_best_match'))
+    FIELDS = (
+        ('id', 'id', INT),
+        ('price', 'price', AMOUNT),
+        ('qty', 'qty', AMOUNT),
+        ('quoteQty', 'quote_qty', AMOUNT),
+        ('time', 'time', INT),
+    )
+
+
+class Kline(Record):
+    """Chandelier (/api/v3/klines), lu par attribut (k.close) ; le 12e champ (inutilisé) est ignoré"""
+
+    __slots__ = ()
+    FIELDS = (
+        ('openTime', 'open_time', INT),
+        ('open', 'open', AMOUNT),
+        ('high', 'high', AMOUNT),
+        ('low', 'low', AMOUNT),
+        ('close', 'close', AMOUNT),
+        ('volume', 'volume', AMOUNT),
+        ('closeTime', 'close_time', INT),
+        ('quoteVolume', 'quote_volume', AMOUNT),
+        ('trades', 'trades', INT),
+        ('takerBuyVolume', 'taker_buy_volume', AMOUNT),
+        ('takerBuyQuoteVolume', 'taker_buy_quote_volume', AMOUNT),
+    )
+
+    @classmethod
+    def from_api(cls, row: List) -> 'Kline':
+        row = row[:len(cls.FIELDS)]
+        try:
+            values = array('d', [float(value) for value in row])
+        except (TypeError, ValueError):
+            values = array('d', [_number(value) for value in row])
+        return cls(values, raw=row)
+
+    def to_api(self) -> List:
+        """Liste des 11 champs de /api/v3/klines"""
+        return [self._text(index) for index in range(len(self.FIELDS))]
+
+
+def tickers_from_api(tickers: Iterable) -> List[Ticker]:
+    """Tickers 24h convertis (les enregistrements déjà convertis sont repris tels quels)"""
+    return [t if isinstance(t, Ticker) else Ticker.from_api(t) for t in tickers or ()]
+
+
+def klines_from_api(klines: Iterable) -> List[Kline]:
+    """Chandeliers convertis (les enregistrements déjà convertis sont repris tels quels)"""
+    return [k if isinstance(k, Kline) else Kline.from_api(k) for k in klines or ()]
+
+
+def trades_from_api(trades: Iterable) -> List[Trade]:
+    """Transactions converties (les enregistrements déjà convertis sont repris tels quels)"""
+    return [t if isinstance(t, Trade) else Trade.from_api(t) for t in trades or ()]
+
+
+def closes(klines: Iterable[Kline]) -> List[float]:
+    """Prix de clôture (0.0 si absent)"""
+    return [k.close or 0.0 for k in klines]
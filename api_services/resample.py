@@ -0,0 +1,118 @@
+"""
+Agrégation locale de klines (NumPy)
+Construit les chandeliers d'un intervalle supérieur à partir d'une série plus
+fine déjà en mémoire (ex. 1w et 1M à partir du 1d), au lieu d'un appel Binance
+par intervalle.
+- open = ouverture du premier chandelier du seau, close = clôture du dernier
+- high / low = extrêmes du seau, volumes et nombre de trades = sommes
+- un chandelier sans prix complet (champ absent) est ignoré, et un seau qui
+  n'en contient aucun n'est pas produit : pas de mèche à zéro
+- seaux alignés comme chez Binance (UTC) : multiples de l'intervalle depuis
+  l'epoch, semaines commençant le lundi, mois calendaires pour 1M
+"""
+from array import array
+from typing import List, Optional
+
+import numpy as np
+
+from .kline_store import INTERVAL_MS
+from .records import Kline
+
+
+# 1970-01-01 était un jeudi : le premier lundi UTC est le 5 janvier
+_WEEK_ORIGIN_MS = 4 * INTERVAL_MS['1d']
+
+
+def _bucket_starts(open_times: np.ndarray, interval: str) -> np.ndarray:
+    """Début (ms) du seau de chaque chandelier"""
+    if interval == '1M':
+        months = open_times.astype('datetime64[ms]').astype('datetime64[M]')
+        return months.astype('datetime64[ms]').astype(np.int64)
+    step = INTERVAL_MS[interval]
+    origin = _WEEK_ORIGIN_MS if interval == '1w' else 0
+    return (open_times - origin) // step * step + origin
+
+
+def _bucket_ends(starts: np.ndarray, interval: str) -> np.ndarray:
+    """close_time (ms) de chaque seau : début du seau suivant - 1"""
+    if interval == '1M':
+        months = starts.astype('datetime64[ms]').astype('datetime64[M]') + 1
+        return months.astype('datetime64[ms]').astype(np.int64) - 1
+    return starts + INTERVAL_MS[interval] - 1
+
+
+def can_resample(base_interval: str, target_interval: str) -> bool:
+    """True si target peut être construit exactement à partir de base"""
+    if base_interval not in INTERVAL_MS or target_interval not in INTERVAL_MS:
+        return False
+    if base_interval == '1M':
+        return target_interval == '1M'
+    base = INTERVAL_MS[base_interval]
+    if target_interval == '1M':
+        # Un mois est toujours un nombre entier de jours
+        return INTERVAL_MS['1d'] % base == 0
+    target = INTERVAL_MS[target_interval]
+    if target == base:
+        return True
+    if target % base:
+        return False
+    # Seaux hebdomadaires décalés de 4 jours : la base doit diviser ce décalage
+    return target_interval != '1w' or _WEEK_ORIGIN_MS % base == 0
+
+
+def resample(klines: List[Kline], base_interval: str, target_interval: str,
+             limit: Optional[int] = None, drop_partial: bool = True) -> List[Kline]:
+    """
+    Agrège des klines `base_interval` (enregistrements Kline triés par date)
+    en klines `target_interval`.
+
+    drop_partial : écarte le premier seau s'il ne commence pas au début de
+    l'intervalle (historique tronqué). Le dernier seau est conservé même
+    incomplet, comme le chandelier en cours renvoyé par Binance.
+    limit : ne garde que les `limit` derniers chandeliers.
+    """
+    if not can_resample(base_interval, target_interval):
+        raise ValueError(f"Impossible de construire {target_interval} à partir de {base_interval}")
+    if not klines:
+        return []
+
+    open_times = np.fromiter((k.open_time for k in klines), dtype=np.int64, count=len(klines))
+    # Colonnes numériques : open, high, low, close, volume, quote volume,
+    # nombre de trades, taker buy base, taker buy quote (absent = NaN)
+    values = np.array([
+        (k.open, k.high, k.low, k.close, k.volume, k.quote_volume,
+         k.trades, k.taker_buy_volume, k.taker_buy_quote_volume)
+        for k in klines
+    ], dtype=np.float64)
+    complete = ~np.isnan(values[:, :4]).any(axis=1)
+    if not complete.all():
+        open_times, values = open_times[complete], values[complete]
+        if not len(open_times):
+            return []
+    # Volumes et trades absents : rien à ajouter à la somme
+    np.nan_to_num(values[:, 4:], copy=False)
+
+    starts = _bucket_starts(open_times, target_interval)
+    bucket_keys, first = np.unique(starts, return_index=True)
+    last = np.append(first[1:], len(starts)) - 1
+
+    opens = values[first, 0]
+    highs = np.maximum.reduceat(values[:, 1], first)
+    lows = np.minimum.reduceat(values[:, 2], first)
+    closes = values[last, 3]
+    sums = np.add.reduceat(values[:, 4:], first, axis=0)
+    close_times = _bucket_ends(bucket_keys, target_interval)
+
+    if drop_partial and open_times[first[0]] != bucket_keys[0]:
+        start = 1
+    else:
+        start = 0
+    if limit is not None:
+        start = max(start, len(bucket_keys) - limit)
+
+    # Colonnes dans l'ordre de Kline.FIELDS
+    columns = np.column_stack([
+        bucket_keys, opens, highs, lows, closes, sums[:, 0],
+        close_times, sums[:, 1], sums[:, 2], sums[:, 3], sums[:, 4],
+    ])[start:].astype(np.float64)
+    return [Kline(array('d', row)) for row in columns.tolist()]
@@ -0,0 +1,235 @@
+"""
+Index de recherche des paires : symboles, actifs de base et noms complets
+- index de préfixes : liste triée de (terme, symbole), parcourue par bisection
+- index de trigrammes : trigramme -> symboles, pour les sous-chaînes et la
+  recherche approchée (fautes de frappe : « BITCION » trouve BTC*)
+Les résultats sont classés par qualité de correspondance puis par volume
+(en actif de cotation). L'index est mis à jour par différence quand
+l'ensemble des symboles d'exchangeInfo change, sans reconstruction complète.
+"""
+import bisect
+import heapq
+import threading
+from collections import Counter
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from .snapshot import TickerSnapshot
+from .symbols import ASSET_NAMES, SymbolRegistry
+
+
+# Qualité de correspondance, de la meilleure à la moins bonne
+EXACT, PREFIX, NAME_PREFIX, SUBSTRING, FUZZY = range(5)
+
+# Part minimale des trigrammes de la requête retrouvés pour une correspondance approchée
+FUZZY_THRESHOLD = 0.4
+
+
+def _normalize(text: str) -> str:
+    return ' '.join((text or '').upper().split())
+
+
+def _trigrams(term: str, padded: bool = True) -> Set[str]:
+    """Trigrammes d'un terme ; avec padded, bornés par des espaces (début et fin de mot)"""
+    if padded:
+        term = f" {term} "
+    return {term[i:i + 3] for i in range(len(term) - 2)}
+
+
+class SymbolSearchIndex:
+    """Index des symboles pour la recherche et l'autocomplétion (thread-safe)"""
+
+    def __init__(self, names: Optional[Dict[str, str]] = None):
+        self.display_names = names or ASSET_NAMES
+        self.names = {asset: _normalize(name) for asset, name in self.display_names.items()}
+        self._entries: Dict[str, Tuple[str, str]] = {}  # symbole -> (base, cotation)
+        self._terms: Dict[str, List[Tuple[str, int]]] = {}  # symbole -> [(terme, qualité si préfixe)]
+        self._prefix: List[Tuple[str, str, int]] = []  # (terme, symbole, qualité) triés
+        self._haystack: Dict[str, str] = {}  # symbole -> termes joints (test de sous-chaîne)
+        self._trigrams: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, symbol) -> bool:
+        return symbol in self._entries
+
+    def _terms_for(self, symbol: str, base: str) -> List[Tuple[str, int]]:
+        terms = [(symbol, PREFIX)]
+        if base and base != symbol:
+            terms.append((base, PREFIX))
+        name = self.names.get(base)
+        if name and name not in (symbol, base):
+            terms.append((name, NAME_PREFIX))
+            words = name.split()
+            if len(words) > 1:
+                terms.extend((word, NAME_PREFIX) for word in words[1:])
+        return terms
+
+    def _add(self, symbol: str, base: str, quote: str) -> None:
+        terms = self._terms_for(symbol, base)
+        self._entries[symbol] = (base, quote)
+        self._terms[symbol] = terms
+        self._haystack[symbol] = '\n'.join(term for term, _ in terms)
+        for term, quality in terms:
+            bisect.insort(self._prefix, (term, symbol, quality))
+            for trigram in _trigrams(term):
+                self._trigrams.setdefault(trigram, set()).add(symbol)
+
+    def _remove(self, symbol: str) -> None:
+        self._entries.pop(symbol, None)
+        self._haystack.pop(symbol, None)
+        for term, quality in self._terms.pop(symbol, []):
+            i = bisect.bisect_left(self._prefix, (term, symbol, quality))
+            if i < len(self._prefix) and self._prefix[i] == (term, symbol, quality):
+                del self._prefix[i]
+            for trigram in _trigrams(term):
+                symbols = self._trigrams.get(trigram)
+                if symbols is not None:
+                    symbols.discard(symbol)
+                    if not symbols:
+                        del self._trigrams[trigram]
+
+    def update(self, pairs: Dict[str, Tuple[str, str]]) -> Tuple[int, int]:
+        """
+        Aligne l'index sur `pairs` ({symbole: (base, cotation)}) : seuls les
+        symboles ajoutés ou retirés sont traités. Retourne (ajoutés, retirés).
+        """
+        with self._lock:
+            removed = [s for s in self._entries if pairs.get(s) != self._entries[s]]
+            for symbol in removed:
+                self._remove(symbol)
+            added = [s for s in pairs if s not in self._entries]
+            for symbol in added:
+                base, quote = pairs[symbol]
+                self._add(symbol, base, quote)
+        return len(added), len(removed)
+
+    def _match(self, query: str, fuzzy: bool, limit: Optional[int]) -> Dict[str, int]:
+        """
+        {symbole: meilleure qualité de correspondance}. Les niveaux moins bons
+        ne sont explorés que s'il manque encore des résultats pour atteindre limit.
+        """
+        matches: Dict[str, int] = {}
+        limit = limit if limit is not None else float('inf')
+
+        def keep(symbol: str, quality: int) -> None:
+            if quality < matches.get(symbol, FUZZY + 1):
+                matches[symbol] = quality
+
+        if query in self._entries:
+            keep(query, EXACT)
+
+        # Préfixes : plage contiguë de la liste triée
+        i = bisect.bisect_left(self._prefix, (query,))
+        while i < len(self._prefix) and self._prefix[i][0].startswith(query):
+            _, symbol, quality = self._prefix[i]
+            keep(symbol, quality)
+            i += 1
+        if len(matches) >= limit:
+            return matches
+
+        # Sous-chaînes : intersection des trigrammes, puis vérification
+        inner = _trigrams(query, padded=False)
+        if inner:
+            candidates = None
+            for trigram in inner:
+                symbols = self._trigrams.get(trigram, set())
+                candidates = set(symbols) if candidates is None else candidates & symbols
+                if not candidates:
+                    break
+            for symbol in candidates or ():
+                if symbol not in matches and query in self._haystack[symbol]:
+                    matches[symbol] = SUBSTRING
+        else:
+            # Requête d'un ou deux caractères : pas de trigramme, parcours direct
+            for symbol, haystack in self._haystack.items():
+                if query in haystack and symbol not in matches:
+                    matches[symbol] = SUBSTRING
+
+        # Approché : part des trigrammes (bornés) de la requête retrouvés
+        if fuzzy and len(query) >= 4 and len(matches) < limit:
+            grams = _trigrams(query)
+            hits = Counter()
+            for trigram in grams:
+                hits.update(self._trigrams.get(trigram, ()))
+            needed = FUZZY_THRESHOLD * len(grams)
+            for symbol, count in hits.items():
+                if count >= needed and symbol not in matches:
+                    matches[symbol] = FUZZY
+        return matches
+
+    def search(self, query: str, limit: Optional[int] = 20,
+               volume: Optional[Callable[[str], float]] = None, fuzzy: bool = True) -> List[Tuple[str, int]]:
+        """
+        Symboles correspondant à la requête, classés par qualité de
+        correspondance puis par volume décroissant (volume(symbole)).
+        Retourne [(symbole, qualité)], au plus `limit` (None = tous).
+        """
+        query = _normalize(query)
+        if not query:
+            return []
+        with self._lock:
+            matches = self._match(query, fuzzy, limit)
+        volume = volume or (lambda symbol: 0.0)
+
+        def rank(item):
+            return item[1], -volume(item[0]), item[0]
+
+        if limit is None:
+            return sorted(matches.items(), key=rank)
+        return heapq.nsmallest(limit, matches.items(), key=rank)
+
+    def describe(self, symbol: str) -> Dict[str, str]:
+        """Actifs et nom complet d'un symbole indexé"""
+        base, quote = self._entries.get(symbol, ('', ''))
+        return {
+            'symbol': symbol,
+            'base_asset': base,
+            'quote_asset': quote,
+            'name': self.display_names.get(base, ''),
+        }
+
+
+def _pairs(registry: Optional[SymbolRegistry], snapshot: Optional[TickerSnapshot]) -> Dict[str, Tuple[str, str]]:
+    """Paires à indexer : ouvertes au trading, ou à défaut celles de l'instantané"""
+    if registry:
+        return {
+            info.symbol: (info.base_asset, info.quote_asset)
+            for info in registry.by_symbol.values() if info.is_trading
+        }
+    registry = registry if registry is not None else SymbolRegistry()
+    pairs = {}
+    for ticker in (snapshot.tickers if snapshot else ()):
+        symbol = ticker.symbol
+        if symbol:
+            quote = registry.quote_of(symbol)
+            pairs[symbol] = (symbol[:-len(quote)], quote)
+    return pairs
+
+
+_index = SymbolSearchIndex()
+# Source (référentiel ou instantané) et date de la dernière mise à jour de
+# _index. La source est gardée en référence et comparée par identité : un
+# nouvel instantané de même taille (ou à la même adresse) est bien détecté.
+_index_source = None
+_index_fetched_at = None
+_index_lock = threading.Lock()
+
+
+def get_search_index(registry: Optional[SymbolRegistry] = None,
+                     snapshot: Optional[TickerSnapshot] = None) -> SymbolSearchIndex:
+    """
+    Index partagé du processus, mis à jour (par différence) quand le
+    référentiel exchangeInfo change, ou à partir de l'instantané des tickers
+    tant que le référentiel est indisponible.
+    """
+    global _index_source, _index_fetched_at
+    source = registry if registry else snapshot
+    if not source:
+        return _index
+    with _index_lock:
+        if source is not _index_source or source.fetched_at != _index_fetched_at:
+            _index.update(_pairs(registry, snapshot))
+            _index_source, _index_fetched_at = source, source.fetched_at
+    return _index
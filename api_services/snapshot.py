@@ -0,0 +1,42 @@
+"""
+Instantané de tous les tickers 24h Binance, indexé par symbole
+"""
+import time
+from typing import Dict, Iterable, List, Optional
+
+from .records import Ticker, tickers_from_api
+
+
+class TickerSnapshot:
+    """
+    Résultat d'un seul appel /api/v3/ticker/24hr (sans symbole).
+    Permet de servir un nombre quelconque de symboles sans nouvel appel amont.
+    Les tickers sont convertis une fois en enregistrements Ticker (api_services.records).
+    """
+
+    def __init__(self, tickers: Optional[List[Dict]] = None, fetched_at: Optional[float] = None):
+        self.tickers: List[Ticker] = tickers_from_api(tickers)
+        self.by_symbol = {t.symbol: t for t in self.tickers if t.symbol}
+        self.fetched_at = fetched_at if fetched_at is not None else time.time()
+
+    def get(self, symbol: str, default=None) -> Optional[Ticker]:
+        """Ticker 24h d'un symbole (ou default s'il est inconnu)"""
+        return self.by_symbol.get((symbol or '').upper(), default)
+
+    def get_many(self, symbols: Iterable[str]) -> Dict[str, Ticker]:
+        """Tickers des symboles demandés, les symboles inconnus sont ignorés"""
+        result = {}
+        for symbol in symbols:
+            ticker = self.get(symbol)
+            if ticker:
+                result[ticker.symbol] = ticker
+        return result
+
+    def __contains__(self, symbol) -> bool:
+        return (symbol or '').upper() in self.by_symbol
+
+    def __len__(self) -> int:
+        return len(self.by_symbol)
+
+    def __bool__(self) -> bool:
+        return bool(self.by_symbol)
@@ -0,0 +1,229 @@
+"""
+Connexion aux flux combinés Binance (wss://stream.binance.com:9443/stream)
+- un thread de lecture par client, reconnexion avec backoff exponentiel + jitter
+- abonnements modifiés à chaud (SUBSCRIBE / UNSUBSCRIBE)
+- transport interchangeable : WebSocket réel (websocket-client), ou rejeu local pour les tests
+"""
+import json
+import queue
+import random
+import threading
+from typing import Callable, Iterable, List, Optional
+
+import websocket
+from django.conf import settings
+
+from . import json_codec
+
+
+# Coupure, fermeture par le serveur, timeout ou message illisible : on se reconnecte
+STREAM_ERRORS = (OSError, ValueError, websocket.WebSocketException)
+
+
+class WebSocketTransport:
+    """
+    Transport par défaut : connexion websocket-client (réponse aux ping et
+    messages fragmentés gérés par la bibliothèque)
+    """
+
+    def __init__(self, timeout: float = 10, read_timeout: float = 60):
+        self.timeout = timeout
+        self.read_timeout = read_timeout
+
+    def connect(self, url: str) -> websocket.WebSocket:
+        connection = websocket.create_connection(url, timeout=self.timeout)
+        connection.settimeout(self.read_timeout)
+        return connection
+
+
+class _ReplayConnection:
+    """Connexion factice : rend les messages prévus puis attend la fermeture"""
+
+    def __init__(self, transport: 'ReplayTransport', url: str, messages: List):
+        self.transport = transport
+        self.url = url
+        self.sent: List[dict] = []
+        self._queue: "queue.Queue" = queue.Queue()
+        for message in messages:
+            self._queue.put(message)
+        self.closed = False
+
+    def send(self, text: str) -> None:
+        self.sent.append(json.loads(text))
+
+    def recv(self) -> str:
+        message = self._queue.get()
+        if message is None:
+            self.closed = True
+            raise websocket.WebSocketConnectionClosedException("Connexion de rejeu fermée")
+        return message if isinstance(message, str) else json.dumps(message)
+
+    def push(self, message) -> None:
+        self._queue.put(message)
+
+    def close(self) -> None:
+        if not self.closed:
+            self._queue.put(None)
+
+
+class ReplayTransport:
+    """
+    Transport de test : chaque connexion rejoue `messages` (dicts ou JSON
+    texte, au format des flux combinés), puis reste ouverte sans rien recevoir.
+    push() injecte un message sur la connexion courante, drop() la coupe.
+    """
+
+    def __init__(self, messages: Optional[Iterable] = None):
+        self.messages = list(messages or [])
+        self.connections: List[_ReplayConnection] = []
+
+    @classmethod
+    def from_file(cls, path) -> 'ReplayTransport':
+        """Messages enregistrés, un objet JSON par ligne"""
+        with open(path, encoding='utf-8') as f:
+            return cls(line.strip() for line in f if line.strip())
+
+    def connect(self, url: str) -> _ReplayConnection:
+        connection = _ReplayConnection(self, url, self.messages)
+        self.connections.append(connection)
+        return connection
+
+    @property
+    def current(self) -> Optional[_ReplayConnection]:
+        return self.connections[-1] if self.connections else None
+
+    def push(self, message) -> None:
+        if self.current:
+            self.current.push(message)
+
+    def drop(self) -> None:
+        """Simule une coupure réseau"""
+        if self.current:
+            self.current.close()
+
+
+class StreamClient:
+    """
+    Abonnement à un ensemble de flux sur une connexion combinée.
+    on_message(stream, data) est appelé dans le thread de lecture ;
+    on_connect() après chaque (re)connexion, on_disconnect() après chaque coupure.
+    """
+
+    def __init__(self, base_url: Optional[str] = None, transport=None,
+                 on_message: Optional[Callable[[str, object], None]] = None,
+                 on_connect: Optional[Callable[[], None]] = None,
+                 on_disconnect: Optional[Callable[[], None]] = None,
+                 max_backoff: float = 30.0, name: str = 'binance-stream'):
+        base_url = base_url or getattr(settings, 'BINANCE_WS_BASE_URL', 'wss://stream.binance.com:9443')
+        self.base_url = base_url.rstrip('/')
+        self.transport = transport or WebSocketTransport()
+        self.on_message = on_message
+        self.on_connect = on_connect
+        self.on_disconnect = on_disconnect
+        self.max_backoff = max_backoff
+        self.name = name
+
+        self._streams = set()
+        self._lock = threading.Lock()
+        self._connection = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._request_id = 0
+
+        self.reconnects = 0
+        self.messages = 0
+
+    @property
+    def connected(self) -> bool:
+        return self._connection is not None
+
+    @property
+    def streams(self) -> set:
+        with self._lock:
+            return set(self._streams)
+
+    def _send(self, method: str, streams) -> None:
+        connection = self._connection
+        if connection is None or not streams:
+            return  # pris en compte à la prochaine connexion
+        with self._lock:
+            self._request_id += 1
+            request_id = self._request_id
+        try:
+            connection.send(json.dumps({'method': method, 'params': sorted(streams), 'id': request_id}))
+        except STREAM_ERRORS as e:
+            print(f"Flux Binance: envoi {method} impossible: {e}")
+
+    def subscribe(self, streams: Iterable[str]) -> None:
+        with self._lock:
+            added = set(streams) - self._streams
+            self._streams |= added
+        self._send('SUBSCRIBE', added)
+        if added:
+            self._wake.set()
+
+    def unsubscribe(self, streams: Iterable[str]) -> None:
+        with self._lock:
+            removed = set(streams) & self._streams
+            self._streams -= removed
+        self._send('UNSUBSCRIBE', removed)
+
+    def start(self) -> None:
+        """Lance le thread de lecture (idempotent)"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.run, name=self.name, daemon=True)
+            self._thread.start()
+
+    def run(self) -> None:
+        """Boucle de connexion / lecture, jusqu'à close()"""
+        attempt = 0
+        while not self._stop.is_set():
+            streams = self.streams
+            if not streams:
+                # Aucun flux demandé : pas de connexion
+                self._wake.wait(1.0)
+                self._wake.clear()
+                continue
+
+            url = f"{self.base_url}/stream?streams={'/'.join(sorted(streams))}"
+            connection = None
+            try:
+                connection = self.transport.connect(url)
+                self._connection = connection
+                attempt = 0
+                # Flux ajoutés pendant l'établissement de la connexion
+                self._send('SUBSCRIBE', self.streams - streams)
+                if self.on_connect:
+                    self.on_connect()
+                while not self._stop.is_set():
+                    message = json_codec.loads(connection.recv())
+                    if 'stream' not in message or not self.on_message:
+                        continue  # réponses aux SUBSCRIBE / UNSUBSCRIBE
+                    self.messages += 1
+                    try:
+                        self.on_message(message['stream'], message.get('data'))
+                    except Exception as e:
+                        print(f"Flux Binance: message {message['stream']} ignoré: {e}")
+            except STREAM_ERRORS as e:
+                if not self._stop.is_set():
+                    print(f"Flux Binance interrompu: {e}")
+            finally:
+                self._connection = None
+                if connection is not None:
+                    connection.close()
+                    if self.on_disconnect:
+                        self.on_disconnect()
+
+            if not self._stop.is_set():
+                self.reconnects += 1
+                delay = min(self.max_backoff, 2 ** attempt) * random.uniform(0.5, 1.0)
+                attempt += 1
+                self._stop.wait(delay)
+
+    def close(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        connection = self._connection
+        if connection is not None:
+            connection.close()
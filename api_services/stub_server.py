@@ -0,0 +1,430 @@
+"""
+Serveur local compatible avec l'API Binance Spot (sous-ensemble utilisé par l'application)
+Sert des fixtures enregistrées ou synthétiques, avec latence, jitter, taux d'erreur
+et en-têtes de poids configurables, pour tester et benchmarker sans réseau.
+
+Endpoints: /api/v3/ping, /time, /ticker/24hr, /ticker/price, /klines, /depth,
+/trades, /exchangeInfo
+
+Usage:
+    python manage.py binance_stub --port 9000 --latency 40 --jitter 20
+    BINANCE_API_BASE_URL=http://127.0.0.1:9000 python manage.py runserver
+"""
+import json
+import random
+import threading
+import time
+from collections import Counter, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from .kline_store import INTERVAL_MS
+from .rate_limit import request_weight
+
+
+DEFAULT_BASES = [
+    'BTC', 'ETH', 'BNB', 'XRP', 'ADA', 'DOGE', 'SOL', 'DOT', 'LTC', 'AVAX',
+    'LINK', 'UNI', 'ATOM', 'ETC', 'TRX', 'XLM', 'NEAR', 'APT', 'ARB', 'OP',
+]
+DEFAULT_QUOTES = ['USDT', 'USDC', 'BTC', 'EUR']
+
+# Ordres de grandeur réalistes (en USD) pour les actifs connus
+REFERENCE_PRICES = {
+    'BTC': 65000, 'ETH': 3200, 'BNB': 580, 'XRP': 0.55, 'ADA': 0.45, 'DOGE': 0.12,
+    'SOL': 150, 'DOT': 6.5, 'LTC': 80, 'AVAX': 30, 'LINK': 14, 'UNI': 8, 'ATOM': 7,
+    'ETC': 25, 'TRX': 0.12, 'XLM': 0.1, 'NEAR': 5, 'APT': 8, 'ARB': 0.8, 'OP': 1.8,
+    'USDT': 1, 'USDC': 1, 'EUR': 1.08,
+}
+
+
+class StubConfig:
+    """Paramètres du serveur bouchon"""
+
+    def __init__(self, latency_ms: float = 0, jitter_ms: float = 0, error_rate: float = 0.0,
+                 weight_limit: int = 6000, fixtures_dir: Optional[str] = None,
+                 symbol_count: Optional[int] = None, seed: int = 42):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.weight_limit = weight_limit  # poids max par minute, au-delà : 429
+        self.fixtures_dir = Path(fixtures_dir) if fixtures_dir else None
+        self.symbol_count = symbol_count
+        self.seed = seed
+
+
+class MarketFixtures:
+    """
+    Données servies par le bouchon.
+    Un fichier présent dans fixtures_dir prend le pas sur les données synthétiques :
+        ticker_24hr.json, exchangeInfo.json,
+        klines_<SYMBOL>_<interval>.json, depth_<SYMBOL>.json, trades_<SYMBOL>.json
+    Les données synthétiques sont déterministes (graine par symbole).
+    """
+
+    def __init__(self, config: StubConfig):
+        self.config = config
+        self.symbols = self._build_symbols()
+        self._pairs = {s[0]: s for s in self.symbols}
+
+    def _load(self, name: str):
+        if self.config.fixtures_dir:
+            path = self.config.fixtures_dir / name
+            if path.exists():
+                with open(path, encoding='utf-8') as f:
+                    return json.load(f)
+        return None
+
+    def _build_symbols(self) -> List[Tuple[str, str, str]]:
+        info = self._load('exchangeInfo.json')
+        if info:
+            return [(s['symbol'], s['baseAsset'], s['quoteAsset']) for s in info.get('symbols', [])]
+        symbols = [
+            (base + quote, base, quote)
+            for quote in DEFAULT_QUOTES for base in DEFAULT_BASES if base != quote
+        ]
+        if self.config.symbol_count:
+            # Symboles additionnels pour simuler la taille réelle du marché (~2500)
+            i = 0
+            while len(symbols) < self.config.symbol_count:
+                base = f"TK{i:04d}"
+                symbols.append((base + DEFAULT_QUOTES[i % len(DEFAULT_QUOTES)], base, DEFAULT_QUOTES[i % len(DEFAULT_QUOTES)]))
+                i += 1
+            symbols = symbols[:self.config.symbol_count]
+        return symbols
+
+    def _rng(self, symbol: str, salt: str = '') -> random.Random:
+        return random.Random(f"{self.config.seed}:{symbol}:{salt}")
+
+    def _base_price(self, symbol: str) -> float:
+        pair = self._pairs.get(symbol)
+        if pair and pair[1] in REFERENCE_PRICES and pair[2] in REFERENCE_PRICES:
+            return REFERENCE_PRICES[pair[1]] / REFERENCE_PRICES[pair[2]]
+        return round(10 ** self._rng(symbol).uniform(-4, 4.8), 8)
+
+    def known(self, symbol: str) -> bool:
+        return symbol in self._pairs
+
+    def ticker_24hr(self, symbol: str) -> Dict:
+        rng = self._rng(symbol, str(int(time.time())))  # évolue chaque seconde
+        price = self._base_price(symbol) * rng.uniform(0.98, 1.02)
+        change = rng.uniform(-12, 12)
+        open_price = price / (1 + change / 100)
+        volume = rng.uniform(1e3, 1e7)
+        now = int(time.time() * 1000)
+        return {
+            'symbol': symbol,
+            'priceChange': f"{price - open_price:.8f}",
+            'priceChangePercent': f"{change:.3f}",
+            'weightedAvgPrice': f"{(price + open_price) / 2:.8f}",
+            'prevClosePrice': f"{open_price:.8f}",
+            'lastPrice': f"{price:.8f}",
+            'lastQty': f"{rng.uniform(0.01, 10):.8f}",
+            'bidPrice': f"{price * 0.9999:.8f}",
+            'bidQty': f"{rng.uniform(0.1, 100):.8f}",
+            'askPrice': f"{price * 1.0001:.8f}",
+            'askQty': f"{rng.uniform(0.1, 100):.8f}",
+            'openPrice': f"{open_price:.8f}",
+            'highPrice': f"{max(price, open_price) * 1.03:.8f}",
+            'lowPrice': f"{min(price, open_price) * 0.97:.8f}",
+            'volume': f"{volume:.8f}",
+            'quoteVolume': f"{volume * price:.8f}",
+            'openTime': now - 86_400_000,
+            'closeTime': now,
+            'firstId': 1,
+            'lastId': 1000,
+            'count': rng.randint(100, 100_000),
+        }
+
+    def all_tickers(self) -> List[Dict]:
+        recorded = self._load('ticker_24hr.json')
+        if recorded is not None:
+            return recorded
+        return [self.ticker_24hr(s[0]) for s in self.symbols]
+
+    def one_ticker(self, symbol: str) -> Optional[Dict]:
+        recorded = self._load('ticker_24hr.json')
+        if recorded is not None:
+            return next((t for t in recorded if t.get('symbol') == symbol), None)
+        return self.ticker_24hr(symbol) if self.known(symbol) else None
+
+    def exchange_info(self) -> Dict:
+        recorded = self._load('exchangeInfo.json')
+        if recorded is not None:
+            return recorded
+        return {
+            'timezone': 'UTC',
+            'serverTime': int(time.time() * 1000),
+            'rateLimits': [
+                {'rateLimitType': 'REQUEST_WEIGHT', 'interval': 'MINUTE', 'intervalNum': 1,
+                 'limit': self.config.weight_limit},
+            ],
+            'symbols': [
+                {
+                    'symbol': symbol,
+                    'status': 'TRADING',
+                    'baseAsset': base,
+                    'quoteAsset': quote,
+                    'filters': [
+                        {'filterType': 'PRICE_FILTER', 'tickSize': '0.00000100'},
+                        {'filterType': 'LOT_SIZE', 'stepSize': '0.00100000'},
+                    ],
+                }
+                for symbol, base, quote in self.symbols
+            ],
+        }
+
+    def klines(self, symbol: str, interval: str, limit: int,
+               start_time: Optional[int] = None, end_time: Optional[int] = None) -> List[List]:
+        recorded = self._load(f"klines_{symbol}_{interval}.json")
+        if recorded is not None:
+            if start_time is not None:
+                recorded = [k for k in recorded if k[0] >= start_time]
+            if end_time is not None:
+                recorded = [k for k in recorded if k[0] <= end_time]
+            return recorded[:limit] if start_time is not None else recorded[-limit:]
+
+        step = INTERVAL_MS.get(interval, 86_400_000)
+        # Comme Binance, les semaines commencent le lundi (l'epoch est un jeudi)
+        origin = 4 * INTERVAL_MS['1d'] if interval == '1w' else 0
+        now = int(time.time() * 1000)
+        last_open = ((min(end_time, now) if end_time is not None else now) - origin) // step * step + origin
+        first_open = last_open - (limit - 1) * step
+        if start_time is not None:
+            first_open = max(first_open, -(-(start_time - origin) // step) * step + origin)
+            last_open = min(last_open, first_open + (limit - 1) * step)
+
+        result = []
+        base = self._base_price(symbol)
+        for open_time in range(first_open, last_open + 1, step):
+            rng = self._rng(symbol, f"{interval}:{open_time}")
+            o = base * rng.uniform(0.9, 1.1)
+            c = o * rng.uniform(0.97, 1.03)
+            h = max(o, c) * rng.uniform(1.0, 1.02)
+            l = min(o, c) * rng.uniform(0.98, 1.0)
+            v = rng.uniform(10, 10_000)
+            result.append([
+                open_time, f"{o:.8f}", f"{h:.8f}", f"{l:.8f}", f"{c:.8f}", f"{v:.8f}",
+                open_time + step - 1, f"{v * c:.8f}", rng.randint(10, 5000),
+                f"{v / 2:.8f}", f"{v * c / 2:.8f}", '0',
+            ])
+        return result
+
+    def depth(self, symbol: str, limit: int) -> Dict:
+        recorded = self._load(f"depth_{symbol}.json")
+        if recorded is not None:
+            return {
+                'lastUpdateId': recorded.get('lastUpdateId', 1),
+                'bids': recorded.get('bids', [])[:limit],
+                'asks': recorded.get('asks', [])[:limit],
+            }
+        price = float(self.ticker_24hr(symbol)['lastPrice'])
+        rng = self._rng(symbol, str(int(time.time())))
+        tick = price * 0.0001
+        return {
+            'lastUpdateId': int(time.time() * 10),
+            'bids': [[f"{price - tick * (i + 1):.8f}", f"{rng.uniform(0.01, 50):.8f}"] for i in range(limit)],
+            'asks': [[f"{price + tick * (i + 1):.8f}", f"{rng.uniform(0.01, 50):.8f}"] for i in range(limit)],
+        }
+
+    def trades(self, symbol: str, limit: int) -> List[Dict]:
+        recorded = self._load(f"trades_{symbol}.json")
+        if recorded is not None:
+            return recorded[-limit:]
+        price = float(self.ticker_24hr(symbol)['lastPrice'])
+        now = int(time.time() * 1000)
+        rng = self._rng(symbol, str(now // 1000))
+        result = []
+        for i in range(limit):
+            p = price * rng.uniform(0.999, 1.001)
+            q = rng.uniform(0.001, 5)
+            result.append({
+                'id': now - limit + i,
+                'price': f"{p:.8f}",
+                'qty': f"{q:.8f}",
+                'quoteQty': f"{p * q:.8f}",
+                'time': now - (limit - i) * 250,
+                'isBuyerMaker': rng.random() < 0.5,
+                'isBestMatch': True,
+            })
+        return result
+
+
+class _WeightCounter:
+    """Poids consommé sur la minute courante (comme X-MBX-USED-WEIGHT-1M)"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.minute = 0
+        self.used = 0
+
+    def add(self, weight: int) -> int:
+        with self.lock:
+            minute = int(time.time() // 60)
+            if minute != self.minute:
+                self.minute, self.used = minute, 0
+            self.used += weight
+            return self.used
+
+
+class BinanceStubHandler(BaseHTTPRequestHandler):
+    """Gestionnaire HTTP ; config, fixtures, poids et réponses injectées viennent de BinanceStubServer"""
+
+    protocol_version = 'HTTP/1.1'  # keep-alive, comme api.binance.com
+
+    def log_message(self, format, *args):
+        if getattr(self.server, 'verbose', False):
+            super().log_message(format, *args)
+
+    def _send(self, status: int, payload, headers: Optional[Dict[str, str]] = None):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json;charset=UTF-8')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        config: StubConfig = self.server.config
+        fixtures: MarketFixtures = self.server.fixtures
+        url = urlparse(self.path)
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        path = url.path
+
+        # Latence simulée
+        delay = config.latency_ms + random.uniform(-config.jitter_ms, config.jitter_ms)
+        if delay > 0:
+            time.sleep(delay / 1000)
+
+        self.server.hits[path] += 1
+        status, retry_after, injected_delay = self.server.next_injected()
+        if injected_delay:
+            time.sleep(injected_delay)
+
+        used = self.server.weights.add(request_weight(path, params))
+        headers = {'X-MBX-USED-WEIGHT-1M': str(used), 'X-MBX-USED-WEIGHT': str(used)}
+        if retry_after is not None:
+            headers['Retry-After'] = str(retry_after)
+        if status == 429:
+            return self._send(429, {'code': -1003, 'msg': 'Too many requests.'}, headers)
+        if status is not None:
+            return self._send(status, {'code': -1001, 'msg': 'Injected error (stub).'}, headers)
+        if used > config.weight_limit:
+            headers['Retry-After'] = str(60 - int(time.time()) % 60)
+            return self._send(429, {'code': -1003, 'msg': 'Too many requests.'}, headers)
+
+        if config.error_rate and random.random() < config.error_rate:
+            return self._send(503, {'code': -1001, 'msg': 'Service unavailable (stub).'}, headers)
+
+        symbol = params.get('symbol', '').upper()
+        limit = int(params.get('limit', 0) or 0)
+
+        if path == '/api/v3/ping':
+            return self._send(200, {}, headers)
+        if path == '/api/v3/time':
+            return self._send(200, {'serverTime': int(time.time() * 1000)}, headers)
+        if path == '/api/v3/exchangeInfo':
+            return self._send(200, fixtures.exchange_info(), headers)
+        if path in ('/api/v3/ticker/24hr', '/api/v3/ticker/price'):
+            if symbol:
+                ticker = fixtures.one_ticker(symbol)
+                if ticker is None:
+                    return self._send(400, {'code': -1121, 'msg': 'Invalid symbol.'}, headers)
+                tickers = [ticker]
+            else:
+                tickers = fixtures.all_tickers()
+            if path.endswith('price'):
+                tickers = [{'symbol': t['symbol'], 'price': t['lastPrice']} for t in tickers]
+            return self._send(200, tickers[0] if symbol else tickers, headers)
+
+        if path in ('/api/v3/klines', '/api/v3/depth', '/api/v3/trades'):
+            if not symbol or not fixtures.known(symbol):
+                return self._send(400, {'code': -1121, 'msg': 'Invalid symbol.'}, headers)
+            if path == '/api/v3/klines':
+                start = int(params['startTime']) if 'startTime' in params else None
+                end = int(params['endTime']) if 'endTime' in params else None
+                data = fixtures.klines(symbol, params.get('interval', '1d'), min(limit or 500, 1000), start, end)
+            elif path == '/api/v3/depth':
+                data = fixtures.depth(symbol, min(limit or 100, 5000))
+            else:
+                data = fixtures.trades(symbol, min(limit or 500, 1000))
+            return self._send(200, data, headers)
+
+        return self._send(404, {'code': -1, 'msg': 'Unknown endpoint (stub).'}, headers)
+
+
+class BinanceStubServer(ThreadingHTTPServer):
+    """
+    Serveur du bouchon (config, fixtures, poids consommé)
+    inject() programme les prochaines réponses (erreur, Retry-After, délai) ;
+    hits compte les requêtes reçues par chemin.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], config: StubConfig, verbose: bool = False):
+        super().__init__(address, BinanceStubHandler)
+        self.config = config
+        self.fixtures = MarketFixtures(config)
+        self.weights = _WeightCounter()
+        self.verbose = verbose
+        self.hits = Counter()
+        self._injected = deque()
+        self._injected_lock = threading.Lock()
+
+    def inject(self, status: Optional[int] = None, count: int = 1,
+               retry_after: Optional[int] = None, delay: float = 0.0) -> None:
+        """
+        Les count prochaines requêtes attendent delay secondes puis reçoivent
+        status (None : réponse normale), avec l'en-tête Retry-After s'il est donné.
+        """
+        with self._injected_lock:
+            self._injected.extend([(status, retry_after, delay)] * count)
+
+    def reset(self) -> None:
+        """Oublie les réponses injectées non consommées et les compteurs de requêtes"""
+        with self._injected_lock:
+            self._injected.clear()
+        self.hits.clear()
+
+    def next_injected(self) -> Tuple[Optional[int], Optional[int], float]:
+        with self._injected_lock:
+            return self._injected.popleft() if self._injected else (None, None, 0.0)
+
+
+def start_stub_server(host: str = '127.0.0.1', port: int = 0, config: Optional[StubConfig] = None,
+                      verbose: bool = False):
+    """
+    Démarre le bouchon dans un thread de fond.
+    Retourne (serveur, url_de_base) ; server.shutdown() pour l'arrêter.
+    """
+    server = BinanceStubServer((host, port), config or StubConfig(), verbose)
+    threading.Thread(target=server.serve_forever, name='binance-stub', daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def record_fixtures(fixtures_dir: str, symbols: List[str], base_url: str = 'https://api.binance.com',
+                    intervals: Tuple[str, ...] = ('1h', '1d', '1w')) -> None:
+    """Enregistre des réponses réelles de Binance dans fixtures_dir pour les rejouer hors ligne"""
+    import requests
+
+    out = Path(fixtures_dir)
+    out.mkdir(parents=True, exist_ok=True)
+
+    def save(name, path, params=None):
+        response = requests.get(f"{base_url}{path}", params=params or {}, timeout=30)
+        response.raise_for_status()
+        with open(out / name, 'w', encoding='utf-8') as f:
+            json.dump(response.json(), f)
+
+    save('exchangeInfo.json', '/api/v3/exchangeInfo')
+    save('ticker_24hr.json', '/api/v3/ticker/24hr')
+    for symbol in symbols:
+        for interval in intervals:
+            save(f"klines_{symbol}_{interval}.json", '/api/v3/klines',
+                 {'symbol': symbol, 'interval': interval, 'limit': 1000})
+        save(f"depth_{symbol}.json", '/api/v3/depth', {'symbol': symbol, 'limit': 100})
+        save(f"trades_{symbol}.json", '/api/v3/trades', {'symbol': symbol, 'limit': 500})
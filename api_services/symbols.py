@@ -0,0 +1,157 @@
+"""
+Référentiel des paires Binance construit à partir de /api/v3/exchangeInfo
+Les métadonnées (actifs de base et de cotation, statut, pas de prix et de
+quantité) sont lues une fois puis indexées : plus besoin de les deviner à
+partir du nom du symbole à chaque requête.
+"""
+import time
+from typing import Dict, List, Optional
+
+
+# Catégories d'actifs utilisées par les filtres de la recherche
+STABLECOINS = frozenset({'USDT', 'USDC', 'BUSD', 'DAI', 'TUSD', 'FDUSD'})
+FIAT_CURRENCIES = frozenset({'EUR', 'GBP', 'AUD', 'CAD', 'JPY', 'TRY', 'BRL', 'RUB'})
+CRYPTO_QUOTES = frozenset({'USDT', 'BUSD', 'BTC'})
+CATEGORIES = ('crypto', 'stablecoin', 'fiat')
+
+# Noms complets des actifs courants (exchangeInfo ne donne que les codes),
+# utilisés par l'index de recherche
+ASSET_NAMES = {
+    'BTC': 'Bitcoin', 'ETH': 'Ethereum', 'BNB': 'BNB', 'XRP': 'Ripple',
+    'ADA': 'Cardano', 'SOL': 'Solana', 'DOGE': 'Dogecoin', 'DOT': 'Polkadot',
+    'TRX': 'Tron', 'MATIC': 'Polygon', 'POL': 'Polygon', 'LTC': 'Litecoin',
+    'BCH': 'Bitcoin Cash', 'LINK': 'Chainlink', 'AVAX': 'Avalanche',
+    'XLM': 'Stellar', 'ATOM': 'Cosmos', 'UNI': 'Uniswap', 'ETC': 'Ethereum Classic',
+    'XMR': 'Monero', 'FIL': 'Filecoin', 'APT': 'Aptos', 'ARB': 'Arbitrum',
+    'OP': 'Optimism', 'NEAR': 'Near Protocol', 'ALGO': 'Algorand', 'VET': 'VeChain',
+    'ICP': 'Internet Computer', 'AAVE': 'Aave', 'SHIB': 'Shiba Inu', 'PEPE': 'Pepe',
+    'SUI': 'Sui', 'TON': 'Toncoin', 'HBAR': 'Hedera', 'EGLD': 'MultiversX',
+    'SAND': 'The Sandbox', 'MANA': 'Decentraland', 'AXS': 'Axie Infinity',
+    'USDT': 'Tether', 'USDC': 'USD Coin', 'BUSD': 'Binance USD', 'DAI': 'Dai',
+    'TUSD': 'TrueUSD', 'FDUSD': 'First Digital USD',
+    'EUR': 'Euro', 'GBP': 'Livre sterling', 'AUD': 'Dollar australien',
+    'CAD': 'Dollar canadien', 'JPY': 'Yen', 'TRY': 'Livre turque',
+    'BRL': 'Real brésilien', 'RUB': 'Rouble',
+}
+
+# Cotations fréquentes, seulement pour les symboles absents du référentiel
+_FALLBACK_QUOTES = sorted(STABLECOINS | FIAT_CURRENCIES | {'BTC', 'ETH', 'BNB'}, key=len, reverse=True)
+
+
+def _categories(base_asset: str, quote_asset: str) -> List[str]:
+    """Catégories (filtres de la recherche) d'une paire base/cotation"""
+    categories = []
+    if quote_asset in CRYPTO_QUOTES:
+        categories.append('crypto')
+    if base_asset in STABLECOINS or quote_asset in STABLECOINS:
+        categories.append('stablecoin')
+    if base_asset in FIAT_CURRENCIES or quote_asset in FIAT_CURRENCIES:
+        categories.append('fiat')
+    return categories
+
+
+class SymbolInfo:
+    """Métadonnées d'une paire"""
+
+    __slots__ = ('symbol', 'base_asset', 'quote_asset', 'status', 'tick_size', 'step_size')
+
+    def __init__(self, symbol: str, base_asset: str, quote_asset: str, status: str = 'TRADING',
+                 tick_size: Optional[str] = None, step_size: Optional[str] = None):
+        self.symbol = symbol
+        self.base_asset = base_asset
+        self.quote_asset = quote_asset
+        self.status = status
+        self.tick_size = tick_size
+        self.step_size = step_size
+
+    @classmethod
+    def from_api(cls, data: Dict) -> 'SymbolInfo':
+        """Construit l'objet depuis une entrée `symbols` d'exchangeInfo"""
+        filters = {f.get('filterType'): f for f in data.get('filters', [])}
+        return cls(
+            symbol=data['symbol'],
+            base_asset=data.get('baseAsset', ''),
+            quote_asset=data.get('quoteAsset', ''),
+            status=data.get('status', ''),
+            tick_size=filters.get('PRICE_FILTER', {}).get('tickSize'),
+            step_size=filters.get('LOT_SIZE', {}).get('stepSize'),
+        )
+
+    @property
+    def is_trading(self) -> bool:
+        return self.status == 'TRADING'
+
+    def __repr__(self) -> str:
+        return f"<SymbolInfo {self.symbol} {self.base_asset}/{self.quote_asset} {self.status}>"
+
+
+class SymbolRegistry:
+    """
+    Toutes les paires de l'exchange, indexées par symbole, par actif de cotation
+    et par actif de base. Les index par actif ne contiennent que les paires
+    ouvertes au trading, dans l'ordre renvoyé par Binance.
+    """
+
+    def __init__(self, exchange_info: Optional[Dict] = None, fetched_at: Optional[float] = None):
+        exchange_info = exchange_info or {}
+        self.by_symbol: Dict[str, SymbolInfo] = {}
+        self.by_quote: Dict[str, List[str]] = {}
+        self.by_base: Dict[str, List[str]] = {}
+        self.fetched_at = fetched_at if fetched_at is not None else time.time()
+
+        for data in exchange_info.get('symbols', []):
+            if not data.get('symbol'):
+                continue
+            info = SymbolInfo.from_api(data)
+            self.by_symbol[info.symbol] = info
+            if info.is_trading:
+                self.by_quote.setdefault(info.quote_asset, []).append(info.symbol)
+                self.by_base.setdefault(info.base_asset, []).append(info.symbol)
+
+        # Ensembles précalculés pour les filtres « type » de la recherche
+        self.by_category: Dict[str, set] = {name: set() for name in CATEGORIES}
+        for info in self.by_symbol.values():
+            for name in _categories(info.base_asset, info.quote_asset):
+                self.by_category[name].add(info.symbol)
+
+    def get(self, symbol: str) -> Optional[SymbolInfo]:
+        """Métadonnées d'un symbole (None s'il est inconnu)"""
+        return self.by_symbol.get((symbol or '').upper())
+
+    def quote_of(self, symbol: str) -> str:
+        """
+        Actif de cotation d'un symbole. Pour un symbole absent du référentiel
+        (exchangeInfo indisponible), on se rabat sur les suffixes fréquents.
+        """
+        info = self.get(symbol)
+        if info:
+            return info.quote_asset
+        symbol = (symbol or '').upper()
+        for quote in _FALLBACK_QUOTES:
+            if symbol.endswith(quote) and symbol != quote:
+                return quote
+        return symbol[-4:] if len(symbol) >= 4 else 'USDT'
+
+    def symbols_for_quote(self, quote_asset: str) -> List[str]:
+        """Paires ouvertes cotées dans cet actif"""
+        return self.by_quote.get((quote_asset or '').upper(), [])
+
+    def symbols_for_base(self, base_asset: str) -> List[str]:
+        """Paires ouvertes ayant cet actif pour base"""
+        return self.by_base.get((base_asset or '').upper(), [])
+
+    def in_category(self, symbol: str, category: str) -> bool:
+        """True si le symbole appartient à la catégorie ('crypto', 'stablecoin', 'fiat')"""
+        if symbol in self.by_symbol:
+            return symbol in self.by_category.get(category, ())
+        quote = self.quote_of(symbol)
+        return category in _categories(symbol[:-len(quote)], quote)
+
+    def __contains__(self, symbol) -> bool:
+        return (symbol or '').upper() in self.by_symbol
+
+    def __len__(self) -> int:
+        return len(self.by_symbol)
+
+    def __bool__(self) -> bool:
+        return bool(self.by_symbol)
@@ -0,0 +1 @@
+"""Tests des services Binance (un module par composant, bouchon local : base.py)"""
@@ -0,0 +1,95 @@
+"""
+Socle des tests : bouchon Binance local (stub_server) et état partagé remis à zéro
+Chaque classe démarre son propre bouchon ; chaque test part de caches vides,
+de disjoncteurs fermés et d'un budget de poids plein, et BinanceAPIService /
+AsyncBinanceAPIService visent le bouchon. Aucun test n'appelle Binance.
+"""
+import os
+from unittest import mock
+
+import requests
+from django.core.cache import caches
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from .. import http
+from ..async_binance_service import AsyncBinanceAPIService
+from ..binance_service import BinanceAPIService, _cache
+from ..circuit_breaker import breakers, last_known_good
+from ..rate_limit import limiter
+from ..stub_server import StubConfig, start_stub_server
+
+
+# Caches isolés : ni données publiées par un démon de flux, ni réponses conservées sur disque
+TEST_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'tests-default'},
+    'market_data': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'tests-market-data'},
+    'lkg': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'tests-lkg'},
+}
+
+
+def reset_market_data_state() -> None:
+    """Vide les caches et remet disjoncteurs, limiteur et dernières réponses à l'état initial"""
+    _cache.invalidate()
+    breakers.reset()
+    limiter.reset()
+    last_known_good.reset()
+    for alias in TEST_CACHES:
+        caches[alias].clear()
+
+
+class StubServerMixin:
+    """
+    Bouchon Binance démarré une fois par classe (stub_config : StubConfig de la
+    classe) ; self.get(path, params) l'interroge directement.
+    """
+
+    stub_config = None
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.stub, cls.stub_url = start_stub_server(config=cls.stub_config or StubConfig())
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.stub.shutdown()
+        cls.stub.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        super().setUp()
+        for service in (BinanceAPIService, AsyncBinanceAPIService):
+            patcher = mock.patch.object(service, 'BASE_URL', self.stub_url)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.stub.reset()
+        reset_market_data_state()
+        self.addCleanup(reset_market_data_state)
+
+    def use_http_session(self, **overrides):
+        """Session partagée reconstruite avec ces settings (ex. BINANCE_HTTP_RETRIES=0) le temps du test"""
+        with override_settings(**overrides):
+            session = http._build_session()
+        self.addCleanup(session.close)
+        for name, value in (('_session', session), ('_session_pid', os.getpid())):
+            patcher = mock.patch.object(http, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def get(self, path, params=None):
+        response = requests.get(f"{self.stub_url}{path}", params=params, timeout=5)
+        response.raise_for_status()
+        return response.json()
+
+
+@override_settings(CACHES=TEST_CACHES)
+class StubServerTestCase(StubServerMixin, TestCase):
+    pass
+
+
+@override_settings(CACHES=TEST_CACHES)
+class StubServerTransactionTestCase(StubServerMixin, TransactionTestCase):
+    """
+    Pour les tests dont les threads des pools écrivent en base (klines
+    stockées) : ces écritures échappent à la transaction d'un TestCase.
+    """
@@ -0,0 +1,52 @@
+"""
+Appels de BinanceAPIService contre le bouchon local : les vérifications de
+l'ancien script test_binance_api.py (ping, heure, prix, tickers 24h, klines,
+carnet d'ordres, exchangeInfo), sans réseau.
+"""
+import time
+
+from ..binance_service import BinanceAPIService
+from .base import StubServerTestCase
+
+
+class BinanceAPITests(StubServerTestCase):
+
+    def test_ping_and_server_time(self):
+        self.assertEqual(self.get('/api/v3/ping'), {})
+        server_time = self.get('/api/v3/time')['serverTime']
+        self.assertAlmostEqual(server_time / 1000, time.time(), delta=5)
+
+    def test_ticker_price(self):
+        price = BinanceAPIService.get_ticker_price('BTCUSDT')
+        self.assertEqual(price['symbol'], 'BTCUSDT')
+        self.assertGreater(float(price['price']), 0)
+
+    def test_24hr_tickers_of_main_pairs(self):
+        for symbol in ('BTCUSDT', 'ETHUSDT', 'BNBUSDT'):
+            with self.subTest(symbol=symbol):
+                ticker = BinanceAPIService.get_24hr_ticker(symbol)
+                self.assertEqual(ticker.symbol, symbol)
+                self.assertGreater(ticker.last_price, 0)
+                self.assertGreater(ticker.volume, 0)
+                self.assertIsNotNone(ticker.price_change_percent)
+
+    def test_unknown_symbol(self):
+        self.assertEqual(BinanceAPIService.get_24hr_ticker('NOPEUSDT'), {})
+
+    def test_hourly_klines(self):
+        klines = BinanceAPIService.get_klines('BTCUSDT', '1h', 5)
+        self.assertEqual(len(klines), 5)
+        for kline in klines:
+            self.assertEqual(kline.close_time - kline.open_time + 1, 3_600_000)
+            self.assertLessEqual(kline.low, min(kline.open, kline.close))
+            self.assertGreaterEqual(kline.high, max(kline.open, kline.close))
+
+    def test_order_book(self):
+        depth = BinanceAPIService.get_order_book('BTCUSDT', 5)
+        self.assertEqual((len(depth['bids']), len(depth['asks'])), (5, 5))
+        self.assertLess(float(depth['bids'][0][0]), float(depth['asks'][0][0]))
+
+    def test_exchange_info(self):
+        symbols = BinanceAPIService.get_exchange_info()['symbols']
+        self.assertTrue(any(s['symbol'] == 'BTCUSDT' for s in symbols))
+        self.assertTrue(all(s['status'] == 'TRADING' for s in symbols))
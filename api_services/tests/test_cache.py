@@ -0,0 +1,173 @@
+"""
+MarketDataCache : single-flight entre threads, TTL, éviction LRU et
+stale-while-revalidate, avec un chargeur qui compte ses appels.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.test import TestCase
+
+from ..cache import MarketDataCache
+
+
+class CountingLoader:
+    """Chargeur qui compte ses appels ; bloqué sur self.release tant que blocking est vrai"""
+
+    def __init__(self, blocking=False):
+        self.calls = 0
+        self.blocking = blocking
+        self.release = threading.Event()
+        self.error = None
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            self.calls += 1
+            value = f"v{self.calls}"
+        if self.blocking:
+            self.release.wait(5)
+        if self.error is not None:
+            raise self.error
+        return value
+
+
+def wait_until(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition jamais atteinte")
+        time.sleep(0.005)
+
+
+class SingleFlightTests(TestCase):
+    """Un seul appel amont pour des défauts concurrents sur une même clé"""
+
+    THREADS = 16
+
+    def setUp(self):
+        self.cache = MarketDataCache()
+        self.loader = CountingLoader(blocking=True)
+        self.results, self.errors = [], []
+
+    def call(self):
+        try:
+            self.results.append(self.cache.get_or_fetch('k', 10, self.loader))
+        except Exception as e:
+            self.errors.append(e)
+
+    def run_concurrent_misses(self):
+        threads = [threading.Thread(target=self.call) for _ in range(self.THREADS)]
+        for thread in threads:
+            thread.start()
+        # Tous les suiveurs attendent le leader avant qu'il ne termine
+        wait_until(lambda: self.cache.coalesced == self.THREADS - 1)
+        self.loader.release.set()
+        for thread in threads:
+            thread.join(5)
+
+    def test_concurrent_misses_trigger_one_fetch(self):
+        self.run_concurrent_misses()
+
+        self.assertEqual(self.loader.calls, 1)
+        self.assertEqual(self.results, ['v1'] * self.THREADS)
+        stats = self.cache.stats()
+        self.assertEqual((stats['misses'], stats['coalesced'], stats['in_flight']), (1, self.THREADS - 1, 0))
+        self.assertEqual(self.cache.get_or_fetch('k', 10, self.loader), 'v1')
+        self.assertEqual(self.loader.calls, 1)
+
+    def test_error_is_shared_and_not_cached(self):
+        self.loader.error = RuntimeError('Binance indisponible')
+        self.run_concurrent_misses()
+
+        self.assertEqual(self.loader.calls, 1)
+        self.assertEqual(len(self.errors), self.THREADS)
+        self.assertTrue(all(e is self.loader.error for e in self.errors))
+
+        self.loader.error = None
+        self.assertEqual(self.cache.get_or_fetch('k', 10, self.loader), 'v2')
+
+    def test_distinct_keys_are_fetched_separately(self):
+        self.loader.blocking = False
+        self.cache.get_or_fetch('a', 10, self.loader)
+        self.cache.get_or_fetch('b', 10, self.loader)
+
+        self.assertEqual(self.loader.calls, 2)
+
+
+class ExpiryAndEvictionTests(TestCase):
+    """Expiration après ttl, limite LRU"""
+
+    def setUp(self):
+        self.loader = CountingLoader()
+
+    def test_value_expires_after_ttl(self):
+        cache = MarketDataCache()
+        self.assertEqual(cache.get_or_fetch('k', 0.05, self.loader), 'v1')
+        self.assertEqual(cache.get_or_fetch('k', 0.05, self.loader), 'v1')
+
+        time.sleep(0.08)
+
+        self.assertEqual(cache.get_or_fetch('k', 0.05, self.loader), 'v2')
+        self.assertEqual(self.loader.calls, 2)
+
+    def test_zero_ttl_is_never_cached(self):
+        cache = MarketDataCache()
+        cache.get_or_fetch('k', 0, self.loader)
+        cache.get_or_fetch('k', 0, self.loader)
+
+        self.assertEqual(self.loader.calls, 2)
+        self.assertEqual(cache.stats()['size'], 0)
+
+    def test_least_recently_used_key_is_evicted(self):
+        cache = MarketDataCache(max_entries=2)
+        cache.get_or_fetch('a', 10, self.loader)
+        cache.get_or_fetch('b', 10, self.loader)
+        cache.get_or_fetch('a', 10, self.loader)  # 'a' redevient la plus récente
+        cache.get_or_fetch('c', 10, self.loader)
+
+        self.assertEqual(cache.lookup('a'), (True, 'v1'))
+        self.assertEqual(cache.lookup('b'), (False, None))
+        self.assertEqual(cache.stats()['evictions'], 1)
+        cache.get_or_fetch('b', 10, self.loader)
+        self.assertEqual(self.loader.calls, 4)
+
+
+class StaleWhileRevalidateTests(TestCase):
+    """Valeur périmée servie immédiatement, un seul rafraîchissement en arrière-plan"""
+
+    def setUp(self):
+        self.cache = MarketDataCache()
+        self.loader = CountingLoader()
+        self.executor = ThreadPoolExecutor(max_workers=4)
+        self.addCleanup(self.executor.shutdown)
+        self.get = lambda: self.cache.get_or_fetch('k', 0.05, self.loader, 10, self.executor)
+        self.assertEqual(self.get(), 'v1')
+        time.sleep(0.08)
+
+    def test_stale_value_served_during_single_refresh(self):
+        self.loader.blocking = True
+        started = time.monotonic()
+        served = [self.get() for _ in range(10)]
+
+        self.assertLess(time.monotonic() - started, 1)
+        self.assertEqual(served, ['v1'] * 10)
+        wait_until(lambda: self.loader.calls == 2)
+        self.assertEqual(self.cache.refreshes, 1)
+        self.assertEqual(self.cache.stale_hits, 10)
+
+        self.loader.release.set()
+        wait_until(lambda: self.cache.lookup('k') == (True, 'v2'))
+        self.assertEqual(self.loader.calls, 2)
+
+    def test_failed_refresh_keeps_stale_value(self):
+        self.loader.error = RuntimeError('Binance indisponible')
+        self.assertEqual(self.get(), 'v1')
+        wait_until(lambda: self.cache.refresh_errors == 1)
+
+        self.assertEqual(self.cache.lookup('k', stale_ok=True), (True, 'v1'))
+        self.assertEqual(self.cache.stats()['in_flight'], 0)
+
+    def test_without_executor_expired_value_is_reloaded(self):
+        self.assertEqual(self.cache.get_or_fetch('k', 0.05, self.loader, 10), 'v2')
+        self.assertEqual(self.cache.refreshes, 0)
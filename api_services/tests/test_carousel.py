@@ -0,0 +1,88 @@
+"""
+Carrousel de la page d'accueil : une seule construction à la fois par
+processus, délai après un échec, rafraîchissement en arrière-plan.
+"""
+import threading
+import time
+from unittest import mock
+
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+
+from .. import carousel
+from .base import TEST_CACHES, reset_market_data_state
+
+
+ITEMS = [{'symbol': 'BTCUSDT'}]
+
+
+@override_settings(CACHES=TEST_CACHES, BINANCE_CAROUSEL_CACHE='market_data', BINANCE_CAROUSEL_RETRY_DELAY=0.2)
+class CarouselTests(TestCase):
+
+    def setUp(self):
+        reset_market_data_state()
+        carousel._build, carousel._retry_at = None, 0.0
+        self.builds = 0
+        self.result = ITEMS
+        self.release = threading.Event()
+        self.release.set()
+        patcher = mock.patch.object(carousel, 'build_carousel', self.build)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def build(self):
+        self.builds += 1
+        self.release.wait(5)
+        return list(self.result)
+
+    def in_threads(self, count):
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(carousel.get_carousel())) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        return threads, results
+
+    def test_concurrent_first_displays_share_one_build(self):
+        self.release.clear()
+        threads, results = self.in_threads(5)
+        time.sleep(0.1)
+        self.release.set()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(self.builds, 1)
+        self.assertEqual(results, [ITEMS] * 5)
+        self.assertEqual(carousel.read_carousel()['data'], ITEMS)
+        self.assertIsNone(carousel._build)
+
+    def test_failed_build_is_not_retried_before_the_delay(self):
+        self.result = []
+        self.release.clear()
+        threads, results = self.in_threads(3)
+        time.sleep(0.1)
+        self.release.set()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual((self.builds, results), (1, [[]] * 3))
+        self.assertEqual(carousel.get_carousel(), [])
+        self.assertEqual(self.builds, 1)
+
+        time.sleep(0.25)
+        self.result = ITEMS
+        self.assertEqual(carousel.get_carousel(), ITEMS)
+        self.assertEqual(self.builds, 2)
+
+    def test_old_carousel_is_served_while_one_refresh_runs(self):
+        caches['market_data'].set(carousel.CAROUSEL_KEY, {'data': [{'symbol': 'OLD'}], 'published_at': 0})
+        self.release.clear()
+
+        for _ in range(3):
+            self.assertEqual(carousel.get_carousel(), [{'symbol': 'OLD'}])
+        self.release.set()
+        deadline = time.monotonic() + 5
+        while carousel._build is not None and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        self.assertEqual(self.builds, 1)
+        self.assertEqual(carousel.get_carousel(), ITEMS)
@@ -0,0 +1,167 @@
+"""
+Disjoncteurs : états fermé / ouvert / semi-ouvert, erreurs 4xx, et repli sur
+la dernière réponse valide pendant une panne injectée dans le bouchon.
+"""
+import time
+
+import requests
+from django.test import TestCase
+
+from ..binance_service import BinanceAPIService
+from ..circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpen, breakers
+from ..rate_limit import RateLimitExceeded
+from .base import StubServerTestCase
+
+
+def http_error(status):
+    response = requests.Response()
+    response.status_code = status
+    return requests.exceptions.HTTPError(f"{status}", response=response)
+
+
+class CircuitBreakerTests(TestCase):
+    """Machine à états d'un disjoncteur"""
+
+    def setUp(self):
+        self.breaker = CircuitBreaker('test', failure_threshold=3, reset_timeout=0.05, latency_slo=1.0)
+
+    def fail(self, error=None, elapsed=0.01):
+        self.breaker.before_call()
+        self.breaker.record(elapsed, error or requests.exceptions.ConnectTimeout('timeout'))
+
+    def succeed(self):
+        self.breaker.before_call()
+        self.breaker.record(0.01)
+
+    def open_breaker(self):
+        for _ in range(3):
+            self.fail()
+        self.assertEqual(self.breaker.state, OPEN)
+
+    def test_opens_after_consecutive_failures(self):
+        self.fail()
+        self.fail(http_error(503))
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.fail(http_error(429))
+
+        self.assertEqual(self.breaker.state, OPEN)
+        with self.assertRaises(CircuitOpen) as raised:
+            self.breaker.before_call()
+        self.assertGreater(raised.exception.retry_after, 0)
+        self.assertEqual(self.breaker.status()['rejected'], 1)
+
+    def test_success_resets_failures(self):
+        self.fail()
+        self.fail()
+        self.succeed()
+        self.fail()
+        self.fail()
+
+        self.assertEqual(self.breaker.state, CLOSED)
+
+    def test_slow_calls_count_as_failures(self):
+        for _ in range(3):
+            self.breaker.before_call()
+            self.breaker.record(1.5)
+
+        self.assertEqual(self.breaker.state, OPEN)
+        self.assertEqual(self.breaker.status()['slow_calls'], 3)
+
+    def test_single_probe_when_half_open(self):
+        self.open_breaker()
+        time.sleep(0.06)
+
+        self.breaker.before_call()  # appel de test
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+        with self.assertRaises(CircuitOpen):
+            self.breaker.before_call()
+
+        self.breaker.record(0.01)
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.breaker.before_call()
+
+    def test_failed_probe_reopens(self):
+        self.open_breaker()
+        time.sleep(0.06)
+
+        self.fail()
+
+        self.assertEqual(self.breaker.state, OPEN)
+        self.assertEqual(self.breaker.status()['opens'], 2)
+        with self.assertRaises(CircuitOpen):
+            self.breaker.before_call()
+
+    def test_released_probe_frees_the_slot(self):
+        self.open_breaker()
+        time.sleep(0.06)
+        self.breaker.before_call()
+
+        self.breaker.release()
+
+        self.breaker.before_call()
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+
+    def test_client_error_is_neutral_when_closed(self):
+        self.fail()
+        self.fail()
+        self.fail(http_error(400))  # ni succès ni échec
+
+        self.assertEqual(self.breaker.status()['failures'], 2)
+        self.fail()
+        self.assertEqual(self.breaker.state, OPEN)
+
+    def test_client_error_closes_half_open_breaker(self):
+        self.open_breaker()
+        time.sleep(0.06)
+
+        self.fail(http_error(400))
+
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.assertEqual(self.breaker.status()['failures'], 0)
+
+    def test_local_refusals_teach_nothing(self):
+        self.fail()
+        self.fail()
+        self.fail(RateLimitExceeded('budget épuisé'))
+        self.fail(CircuitOpen('autre'))
+
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.assertEqual(self.breaker.status()['failures'], 2)
+
+
+class LastKnownGoodTests(StubServerTestCase):
+    """Panne injectée dans le bouchon : disjoncteur ouvert, dernière réponse valide servie"""
+
+    def setUp(self):
+        super().setUp()
+        self.use_http_session(BINANCE_HTTP_RETRIES=0)
+
+    def test_outage_serves_last_known_good_response(self):
+        ticker = BinanceAPIService.get_24hr_ticker('BTCUSDT')
+        fetched_at = BinanceAPIService.get_as_of('ticker_24hr', {'symbol': 'BTCUSDT'})
+        self.stub.inject(503, count=100)
+
+        for _ in range(5):
+            BinanceAPIService.clear_cache()
+            fallback = BinanceAPIService.get_24hr_ticker('BTCUSDT')
+            self.assertEqual(fallback.to_api(), ticker.to_api())
+
+        # Ouvert après 3 échecs : les appels suivants n'atteignent plus Binance
+        self.assertEqual(self.stub.hits['/api/v3/ticker/24hr'], 1 + 3)
+        self.assertEqual(BinanceAPIService.get_degraded_endpoints(), ['ticker_24hr'])
+        # Réponse datée de son enregistrement, pas du repli
+        self.assertAlmostEqual(BinanceAPIService.get_as_of('ticker_24hr', {'symbol': 'BTCUSDT'}),
+                               fetched_at, delta=0.5)
+
+    def test_outage_without_saved_response(self):
+        self.stub.inject(503, count=100)
+
+        self.assertEqual(BinanceAPIService.get_24hr_ticker('ETHUSDT'), {})
+
+    def test_unknown_symbol_does_not_trip_the_breaker(self):
+        for _ in range(5):
+            BinanceAPIService.clear_cache()
+            self.assertEqual(BinanceAPIService.get_24hr_ticker('NOPEUSDT'), {})
+
+        self.assertEqual(breakers.get('ticker_24hr').state, CLOSED)
+        self.assertEqual(self.stub.hits['/api/v3/ticker/24hr'], 5)
@@ -0,0 +1,78 @@
+"""
+Réduction LTTB (comparée à l'algorithme d'origine) et chemins SVG des
+mini-courbes du carrousel.
+"""
+import numpy as np
+from django.test import TestCase
+
+from ..downsample import lttb, lttb_indices, sparkline_path
+
+
+def _reference_lttb(data, threshold):
+    """LTTB d'origine (Steinarsson, 2013), une boucle par point ; bornes des seaux entières"""
+    size = len(data)
+    if threshold >= size or threshold < 3:
+        return list(range(size))
+
+    def edge(i):
+        return min(i * (size - 2) // (threshold - 2) + 1, size)
+
+    selected, a = [0], 0
+    for i in range(threshold - 2):
+        start, stop = edge(i + 1), edge(i + 2) if i < threshold - 3 else size
+        avg_x = sum(range(start, stop)) / (stop - start)
+        avg_y = sum(data[start:stop]) / (stop - start)
+        best, best_area = edge(i), -1.0
+        for j in range(edge(i), edge(i + 1)):
+            area = abs((a - avg_x) * (data[j] - data[a]) - (a - j) * (avg_y - data[a]))
+            if area > best_area:
+                best, best_area = j, area
+        selected.append(best)
+        a = best
+    selected.append(size - 1)
+    return selected
+
+
+class LttbTests(TestCase):
+    """Version NumPy de LTTB comparée à l'algorithme d'origine"""
+
+    def test_matches_reference_implementation(self):
+        rng = np.random.default_rng(42)
+        for size in (5, 24, 97, 500, 1001, 4999):
+            series = np.cumsum(rng.normal(size=size)).tolist()
+            for points in (3, 4, 10, 24, 99, size - 1):
+                if 3 <= points < size:
+                    with self.subTest(size=size, points=points):
+                        self.assertEqual(lttb_indices(series, points).tolist(),
+                                         _reference_lttb(series, points))
+
+    def test_keeps_spikes_and_endpoints(self):
+        series = [1.0] * 1000
+        series[337] = 50.0
+        series[700] = -20.0
+
+        reduced = lttb(series, 20)
+
+        self.assertEqual(len(reduced), 20)
+        self.assertIn(50.0, reduced)
+        self.assertIn(-20.0, reduced)
+        self.assertEqual((reduced[0], reduced[-1]), (series[0], series[-1]))
+
+    def test_short_series_unchanged(self):
+        self.assertEqual(lttb([3.0, 1.0, 2.0], 10), [3.0, 1.0, 2.0])
+        self.assertEqual(lttb([3.0, 1.0, 2.0, 4.0], 2), [3.0, 1.0, 2.0, 4.0])
+
+
+
+class SparklinePathTests(TestCase):
+
+    def test_line_spans_the_view_box(self):
+        path = sparkline_path([1.0, 3.0, 2.0], width=100, height=50, padding=2)
+
+        self.assertEqual(path['line'], 'M0 48L50 2L100 25')
+        self.assertTrue(path['area'].startswith(path['line']))
+        self.assertTrue(path['area'].endswith('Z'))
+
+    def test_flat_and_empty_series(self):
+        self.assertEqual(sparkline_path([5.0, 5.0], width=10, height=20)['line'], 'M0 10L10 10')
+        self.assertEqual(sparkline_path([]), {'line': '', 'area': ''})
@@ -0,0 +1,60 @@
+"""
+BinanceAPIService.fetch_many : appels parallèles, échéance du lot, erreurs
+isolées. Les appels lents sont des délais injectés dans le bouchon.
+"""
+import time
+
+from ..binance_service import BinanceAPIService
+from ..records import Ticker
+from .base import StubServerTransactionTestCase
+
+
+class FetchManyTests(StubServerTransactionTestCase):
+
+    def test_results_by_name(self):
+        results = BinanceAPIService.fetch_many({
+            'ticker': (BinanceAPIService.get_24hr_ticker, 'BTCUSDT'),
+            'klines': (BinanceAPIService.get_klines, 'BTCUSDT', '1h', 24),
+            'depth': (BinanceAPIService.get_order_book, 'BTCUSDT', 5),
+        })
+
+        self.assertEqual(set(results), {'ticker', 'klines', 'depth'})
+        self.assertIsInstance(results['ticker'], Ticker)
+        self.assertEqual(len(results['klines']), 24)
+        self.assertEqual(len(results['depth']['bids']), 5)
+
+    def test_calls_run_in_parallel(self):
+        self.stub.inject(delay=0.3, count=4)
+        started = time.monotonic()
+
+        results = BinanceAPIService.fetch_many({
+            f"ping{i}": (self.get, '/api/v3/ping') for i in range(4)
+        }, deadline=5)
+
+        self.assertEqual(list(results.values()), [{}] * 4)
+        self.assertLess(time.monotonic() - started, 0.9)
+
+    def test_deadline_returns_partial_results(self):
+        self.stub.inject(delay=1.5)  # la première requête reçue : 'slow'
+        started = time.monotonic()
+
+        results = BinanceAPIService.fetch_many({
+            'slow': (self.get, '/api/v3/ping'),
+            'fast': (lambda: time.sleep(0.1) or self.get('/api/v3/time'),),
+        }, deadline=0.5)
+
+        elapsed = time.monotonic() - started
+        self.assertGreaterEqual(elapsed, 0.5)
+        self.assertLess(elapsed, 1.2)
+        self.assertIsNone(results['slow'])
+        self.assertIn('serverTime', results['fast'])
+
+    def test_error_only_voids_its_own_call(self):
+        self.stub.inject(503)
+
+        results = BinanceAPIService.fetch_many({
+            'broken': (self.get, '/api/v3/ping'),
+            'local': (sum, [1, 2, 3]),
+        }, deadline=5)
+
+        self.assertEqual(results, {'broken': None, 'local': 6})
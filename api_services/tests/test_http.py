@@ -0,0 +1,108 @@
+"""
+Session HTTP partagée : retries sur 429/5xx, plafond de Retry-After, pas de
+retry sur timeout de lecture, session recréée après un fork. Les erreurs sont
+injectées dans le bouchon (BinanceStubServer.inject).
+"""
+import time
+from unittest import mock
+
+import requests
+from django.test import override_settings
+
+from .. import http
+from .base import StubServerTestCase
+
+
+@override_settings(BINANCE_HTTP_RETRIES=3, BINANCE_HTTP_BACKOFF=0, BINANCE_HTTP_BACKOFF_JITTER=0)
+class BinanceRetryTests(StubServerTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.session = http._build_session()
+        self.addCleanup(self.session.close)
+
+    def ping(self, timeout=(1, 2)):
+        return self.session.get(f"{self.stub_url}/api/v3/ping", timeout=timeout)
+
+    def test_server_errors_are_retried(self):
+        self.stub.inject(503, count=2)
+        self.stub.inject(502)
+
+        response = self.ping()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.stub.hits['/api/v3/ping'], 4)
+
+    def test_last_error_is_returned_when_retries_run_out(self):
+        self.stub.inject(500, count=10)
+
+        response = self.ping()
+
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(self.stub.hits['/api/v3/ping'], 4)  # 1 appel + 3 retries
+        with self.assertRaises(requests.exceptions.HTTPError):
+            response.raise_for_status()
+
+    def test_client_errors_are_not_retried(self):
+        response = self.session.get(f"{self.stub_url}/api/v3/klines", params={'symbol': 'NOPEUSDT'}, timeout=2)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.stub.hits['/api/v3/klines'], 1)
+
+    def test_short_retry_after_is_respected(self):
+        self.stub.inject(429, retry_after=1)
+        started = time.monotonic()
+
+        response = self.ping()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertGreaterEqual(time.monotonic() - started, 0.9)
+        self.assertEqual(self.stub.hits['/api/v3/ping'], 2)
+
+    def test_long_retry_after_gives_up_at_once(self):
+        self.stub.inject(429, retry_after=http.BinanceRetry.MAX_RETRY_AFTER + 55)
+        started = time.monotonic()
+
+        response = self.ping()
+
+        # La réponse 429 est rendue sans attendre ; raise_for_status() la signale
+        self.assertEqual(response.status_code, 429)
+        self.assertLess(time.monotonic() - started, 1)
+        self.assertEqual(self.stub.hits['/api/v3/ping'], 1)
+
+    def test_read_timeout_is_not_retried(self):
+        self.stub.inject(delay=0.5)
+
+        # read=0 : urllib3 abandonne au premier timeout, requests le signale en ConnectionError
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            self.ping(timeout=(1, 0.2))
+
+        self.assertEqual(self.stub.hits['/api/v3/ping'], 1)
+
+
+class SessionTests(StubServerTestCase):
+
+    def setUp(self):
+        super().setUp()
+        saved = http._session, http._session_pid
+        self.addCleanup(setattr, http, '_session', saved[0])
+        self.addCleanup(setattr, http, '_session_pid', saved[1])
+
+    def test_session_is_shared_within_a_process(self):
+        self.assertIs(http.get_session(), http.get_session())
+
+    def test_forked_process_gets_its_own_session(self):
+        parent = http.get_session()
+        with mock.patch.object(http.os, 'getpid', return_value=http._session_pid + 1):
+            child = http.get_session()
+            self.assertIs(http.get_session(), child)
+
+        self.assertIsNot(child, parent)
+        self.assertEqual(child.get(f"{self.stub_url}/api/v3/ping", timeout=2).json(), {})
+
+    def test_timeouts_per_endpoint(self):
+        with override_settings(BINANCE_HTTP_TIMEOUTS={'default': (1, 2), 'klines': (1, 8)}):
+            self.assertEqual(http.get_timeout('klines'), (1, 8))
+            self.assertEqual(http.get_timeout('depth'), (1, 2))
+        with override_settings(BINANCE_HTTP_TIMEOUTS={}):
+            self.assertEqual(http.get_timeout('depth'), http.DEFAULT_TIMEOUT)
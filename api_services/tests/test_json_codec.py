@@ -0,0 +1,57 @@
+"""
+Codec JSON : mêmes octets avec orjson et avec le module json standard,
+NaN et infinis compris.
+"""
+import json
+import math
+from decimal import Decimal
+from unittest import mock, skipIf
+
+from django.test import TestCase
+
+from .. import json_codec
+from ..records import tickers_from_api
+
+
+class CodecTestsMixin:
+    """Tests communs, exécutés pour chaque moteur (BACKEND)"""
+
+    BACKEND = None
+
+    def setUp(self):
+        patcher = mock.patch.object(json_codec, 'BACKEND', self.BACKEND)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_decimals_and_records_are_written_as_numbers_and_binance_strings(self):
+        ticker = tickers_from_api([{'symbol': 'BTCUSDT', 'lastPrice': '64000.01000000'}])[0]
+
+        data = json_codec.dumps({'price': Decimal('1.50'), 'ticker': ticker, 'name': 'Réseau'})
+
+        self.assertEqual(data, '{"price":1.5,"ticker":{"symbol":"BTCUSDT","lastPrice":"64000.01000000"},'
+                               '"name":"Réseau"}'.encode('utf-8'))
+
+    def test_non_finite_numbers_are_written_as_null(self):
+        data = json_codec.dumps({
+            'nan': math.nan, 'inf': [1.5, math.inf, -math.inf], 'decimal': Decimal('NaN'),
+        })
+
+        self.assertEqual(json.loads(data), {'nan': None, 'inf': [1.5, None, None], 'decimal': None})
+
+    def test_non_finite_constants_are_rejected_on_read(self):
+        self.assertEqual(json_codec.loads(b'{"a":[1,"NaN"]}'), {'a': [1, 'NaN']})
+        for document in (b'[NaN]', b'{"a":Infinity}', '[-Infinity]'):
+            with self.assertRaises(ValueError):
+                json_codec.loads(document)
+
+    def test_integer_keys(self):
+        self.assertEqual(json_codec.dumps({1: 'a'}), b'{"1":"a"}')
+
+
+class JsonCodecTests(CodecTestsMixin, TestCase):
+    BACKEND = 'json'
+
+
+@skipIf(json_codec.orjson is None, "orjson n'est pas installé")
+class OrjsonCodecTests(CodecTestsMixin, TestCase):
+    BACKEND = 'orjson'
@@ -0,0 +1,140 @@
+"""
+Stockage local des klines : planification des appels (fenêtre complète ou
+incrémentale), fusion, historique court et connexions des threads de fond.
+"""
+import time
+from unittest import mock
+
+import requests
+
+from .. import kline_store
+from ..binance_service import BinanceAPIService
+from ..kline_store import INTERVAL_MS, MAX_KLINES_PER_CALL
+from ..models import Kline as StoredKline
+from .base import StubServerTestCase, StubServerTransactionTestCase
+
+
+class KlineStoreTests(StubServerTestCase):
+    """Planification des appels (fenêtre complète / incrémentale) et fusion"""
+
+    def setUp(self):
+        super().setUp()
+        self.calls = []
+
+    def fetch(self, params):
+        self.calls.append(params)
+        return self.get('/api/v3/klines', params)
+
+    def test_empty_store_loads_full_window_and_keeps_closed_klines(self):
+        klines = kline_store.get_klines('BTCUSDT', '1h', 24, self.fetch)
+
+        self.assertEqual(self.calls, [{'symbol': 'BTCUSDT', 'interval': '1h', 'limit': 24}])
+        self.assertEqual(len(klines), 24)
+        # Le dernier chandelier est en cours : seuls les 23 autres sont stockés
+        self.assertEqual(StoredKline.objects.filter(symbol='BTCUSDT', interval='1h').count(), 23)
+        self.assertFalse(StoredKline.objects.filter(first=True).exists())
+
+    def test_complete_window_only_fetches_newer_klines(self):
+        first = kline_store.get_klines('BTCUSDT', '1h', 24, self.fetch)
+        second = kline_store.get_klines('BTCUSDT', '1h', 24, self.fetch)
+
+        last_stored = first[-2][0]
+        self.assertEqual(self.calls[1], {
+            'symbol': 'BTCUSDT', 'interval': '1h',
+            'startTime': last_stored + INTERVAL_MS['1h'], 'limit': MAX_KLINES_PER_CALL,
+        })
+        self.assertEqual([k[0] for k in second], [k[0] for k in first])
+        self.assertEqual(second[:-1], first[:-1])
+
+    def test_gap_in_stored_window_reloads_full_window(self):
+        klines = kline_store.get_klines('BTCUSDT', '1h', 24, self.fetch)
+        StoredKline.objects.filter(symbol='BTCUSDT', interval='1h', open_time=klines[10][0]).delete()
+
+        stored, params = kline_store.plan('BTCUSDT', '1h', 24, int(time.time() * 1000))
+
+        self.assertEqual(stored, [])
+        self.assertEqual(params, {'symbol': 'BTCUSDT', 'interval': '1h', 'limit': 24})
+        # La fenêtre rechargée comble le trou
+        kline_store.get_klines('BTCUSDT', '1h', 24, self.fetch)
+        self.assertTrue(StoredKline.objects.filter(open_time=klines[10][0]).exists())
+
+    def test_too_many_missing_klines_reloads_full_window(self):
+        kline_store.get_klines('BTCUSDT', '1m', 10, self.fetch)
+        later = int(time.time() * 1000) + (MAX_KLINES_PER_CALL + 5) * INTERVAL_MS['1m']
+
+        stored, params = kline_store.plan('BTCUSDT', '1m', 10, later)
+
+        self.assertEqual(stored, [])
+        self.assertEqual(params, {'symbol': 'BTCUSDT', 'interval': '1m', 'limit': 10})
+
+    def test_merge_skips_klines_already_stored(self):
+        now_ms = int(time.time() * 1000)
+        fetched = self.fetch({'symbol': 'ETHUSDT', 'interval': '1h', 'limit': 5})
+        stored = fetched[:3]
+
+        merged = kline_store.merge('ETHUSDT', '1h', stored, fetched[2:], 4, now_ms)
+
+        self.assertEqual([k[0] for k in merged], [k[0] for k in fetched[1:]])
+        self.assertEqual(StoredKline.objects.filter(symbol='ETHUSDT').count(), 2)
+
+    def test_upstream_error_serves_stored_klines(self):
+        klines = kline_store.get_klines('BTCUSDT', '1h', 24, self.fetch)
+
+        def failing(params):
+            raise requests.exceptions.ConnectionError('Binance injoignable')
+
+        self.assertEqual(kline_store.get_klines('BTCUSDT', '1h', 24, failing), klines[:-1])
+
+
+class ShortHistoryTests(StubServerTestCase):
+    """Paire cotée depuis moins longtemps que la fenêtre demandée"""
+
+    LISTED_HOURS_AGO = 30
+
+    def setUp(self):
+        super().setUp()
+        self.calls = []
+        now_ms = int(time.time() * 1000)
+        self.listed_at = now_ms - now_ms % INTERVAL_MS['1h'] - (self.LISTED_HOURS_AGO - 1) * INTERVAL_MS['1h']
+
+    def fetch(self, params):
+        """Comme Binance : rien avant la cotation de la paire"""
+        self.calls.append(params)
+        return [k for k in self.get('/api/v3/klines', params) if k[0] >= self.listed_at]
+
+    def test_short_answer_is_the_whole_history(self):
+        klines = kline_store.get_klines('SOLUSDT', '1h', 100, self.fetch)
+        again = kline_store.get_klines('SOLUSDT', '1h', 100, self.fetch)
+
+        self.assertEqual(len(klines), self.LISTED_HOURS_AGO)
+        self.assertEqual(klines[0][0], self.listed_at)
+        self.assertEqual(list(StoredKline.objects.filter(first=True).values_list('open_time', flat=True)),
+                         [self.listed_at])
+        # Deuxième appel : seuls les chandeliers postérieurs au dernier stocké
+        self.assertIn('startTime', self.calls[1])
+        self.assertEqual(again[:-1], klines[:-1])
+
+    def test_full_answer_is_not_a_history_start(self):
+        kline_store.get_klines('SOLUSDT', '1h', 10, self.fetch)
+
+        stored, params = kline_store.plan('SOLUSDT', '1h', 100, int(time.time() * 1000))
+
+        self.assertEqual(stored, [])
+        self.assertNotIn('startTime', params)
+
+
+class WorkerConnectionTests(StubServerTransactionTestCase):
+    """Les tâches des pools ferment leurs connexions comme une requête Django"""
+
+    def test_pool_tasks_close_old_connections(self):
+        with mock.patch.object(kline_store, 'close_old_connections') as close:
+            results = BinanceAPIService.fetch_many({'a': (sum, [1, 2]), 'b': (max, [1, 2])}, deadline=5)
+
+        self.assertEqual(results, {'a': 3, 'b': 2})
+        self.assertEqual(close.call_count, 4)
+
+    def test_klines_loaded_in_pool_are_stored(self):
+        results = BinanceAPIService.fetch_many({'klines': (BinanceAPIService.get_klines, 'BTCUSDT', '1h', 24)})
+
+        self.assertEqual(len(results['klines']), 24)
+        self.assertEqual(StoredKline.objects.filter(symbol='BTCUSDT', interval='1h').count(), 23)
@@ -0,0 +1,61 @@
+"""
+Données publiées par le démon de flux : lecture par les vues, signalement
+des symboles consultés (uniquement quand le démon publie, écritures limitées).
+"""
+import time
+from unittest import mock
+
+from django.core.cache import caches
+
+from .. import market_data
+from ..binance_service import BinanceAPIService
+from .base import StubServerTestCase
+
+
+class PublishedDataTests(StubServerTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.store = caches['market_data']
+        market_data._watch_marks.clear()
+        self.addCleanup(market_data._watch_marks.clear)
+
+    def publish(self, key, data):
+        self.store.set(key, {'data': data, 'published_at': time.time()})
+
+    def publish_tickers(self):
+        self.publish(market_data.TICKERS_KEY, self.get('/api/v3/ticker/24hr'))
+
+    def test_without_daemon_nothing_is_written(self):
+        with mock.patch.object(self.store, 'set', wraps=self.store.set) as store_set:
+            for _ in range(3):
+                depth = BinanceAPIService.get_order_book('BTCUSDT', 5)
+                BinanceAPIService.get_recent_trades('BTCUSDT', 5)
+
+        self.assertEqual(len(depth['bids']), 5)  # servi en REST
+        store_set.assert_not_called()
+        self.assertEqual(market_data.watched_symbols(), [])
+
+    def test_running_daemon_serves_depth_and_is_told_once(self):
+        self.publish_tickers()
+        self.publish(market_data.depth_key('BTCUSDT'), {
+            'lastUpdateId': 7, 'bids': [['10.0', '1.0'], ['9.0', '2.0']], 'asks': [['11.0', '1.0']],
+        })
+
+        with mock.patch.object(self.store, 'set', wraps=self.store.set) as store_set:
+            for _ in range(10):
+                depth = BinanceAPIService.get_order_book('BTCUSDT', 1)
+                BinanceAPIService.get_recent_trades('BTCUSDT', 5)
+
+        self.assertEqual(depth, {'lastUpdateId': 7, 'bids': [['10.0', '1.0']], 'asks': [['11.0', '1.0']]})
+        self.assertEqual([c.args[0] for c in store_set.call_args_list], [market_data.WATCHED_KEY])
+        self.assertEqual(market_data.watched_symbols(), ['BTCUSDT'])
+
+    def test_stale_publication_means_no_daemon(self):
+        self.store.set(market_data.TICKERS_KEY, {
+            'data': self.get('/api/v3/ticker/24hr'), 'published_at': time.time() - 3600,
+        })
+
+        BinanceAPIService.get_order_book('BTCUSDT', 5)
+
+        self.assertEqual(market_data.watched_symbols(), [])
@@ -0,0 +1,148 @@
+"""
+Carnets d'ordres locaux : séquencement des mises à jour diff-depth,
+instantané REST (bouchon) et resynchronisation, flux combiné rejoué.
+"""
+import threading
+
+import numpy as np
+from django.test import TestCase
+
+from ..order_book import (
+    BinanceDepthStreamSource, LocalOrderBook, OrderBookManager, OrderBookOutOfSync, ReplayDepthSource,
+)
+from ..streams import ReplayTransport
+from .base import StubServerTestCase
+
+
+class LocalOrderBookTests(TestCase):
+    """Séquencement des mises à jour diff-depth (U / u) sur un carnet"""
+
+    def setUp(self):
+        self.book = LocalOrderBook('BTCUSDT')
+
+    def event(self, first_id, last_id, bids=(), asks=()):
+        return {'s': 'BTCUSDT', 'U': first_id, 'u': last_id, 'b': list(bids), 'a': list(asks)}
+
+    def test_buffered_events_replayed_after_snapshot(self):
+        self.book.apply(self.event(95, 99, bids=[['9.0', '5']]))     # inclus dans l'instantané
+        self.book.apply(self.event(100, 102, bids=[['10.5', '1']]))  # chevauche lastUpdateId + 1
+        self.book.apply(self.event(103, 103, asks=[['11.0', '0']]))
+
+        self.book.load_snapshot({'lastUpdateId': 100, 'bids': [['10.0', '2'], ['9.0', '1']],
+                                 'asks': [['11.0', '3'], ['12.0', '1']]})
+
+        self.assertEqual(self.book.last_update_id, 103)
+        self.assertEqual(self.book.to_api(5), {
+            'lastUpdateId': 103,
+            'bids': [['10.5', '1'], ['10.0', '2'], ['9.0', '1']],
+            'asks': [['12.0', '1']],
+        })
+
+    def test_gap_in_sequence_invalidates_book(self):
+        self.book.load_snapshot({'lastUpdateId': 10, 'bids': [['1.0', '1']], 'asks': []})
+        self.book.apply(self.event(11, 12))
+
+        with self.assertRaises(OrderBookOutOfSync):
+            self.book.apply(self.event(14, 15))
+        self.assertFalse(self.book.synced)
+
+    def test_snapshot_older_than_buffered_events_is_rejected(self):
+        self.book.apply(self.event(50, 60))
+        with self.assertRaises(OrderBookOutOfSync):
+            self.book.load_snapshot({'lastUpdateId': 10, 'bids': [], 'asks': []})
+
+    def test_levels_stay_sorted(self):
+        self.book.load_snapshot({'lastUpdateId': 1, 'bids': [], 'asks': []})
+        prices = [f"{p:.2f}" for p in np.random.default_rng(3).uniform(1, 100, 500)]
+        for i, price in enumerate(prices):
+            self.book.apply(self.event(i + 2, i + 2, bids=[[price, '1']], asks=[[price, '1']]))
+
+        bids = [float(p) for p, _ in self.book.bids.top(1000)]
+        asks = [float(p) for p, _ in self.book.asks.top(1000)]
+        self.assertEqual(bids, sorted({float(p) for p in prices}, reverse=True))
+        self.assertEqual(asks, sorted({float(p) for p in prices}))
+
+
+class OrderBookManagerTests(StubServerTestCase):
+    """Instantané REST (bouchon) + flux rejoué, resynchronisation après un trou"""
+
+    def setUp(self):
+        super().setUp()
+        self.source = ReplayDepthSource()
+        self.snapshots = []
+        self.manager = OrderBookManager(self.source, self.fetch_snapshot)
+
+    def fetch_snapshot(self, symbol):
+        snapshot = self.get('/api/v3/depth', {'symbol': symbol, 'limit': 50})
+        self.snapshots.append(snapshot)
+        return snapshot
+
+    def push(self, first_id, last_id, bids=()):
+        self.source.push({'e': 'depthUpdate', 's': 'BTCUSDT', 'U': first_id, 'u': last_id,
+                          'b': list(bids), 'a': []})
+
+    def test_serves_snapshot_then_stream_updates(self):
+        depth = self.manager.get_depth('BTCUSDT', 5)
+        snapshot_id = self.snapshots[0]['lastUpdateId']
+        self.assertEqual(depth['lastUpdateId'], snapshot_id)
+        self.assertEqual(depth['bids'], self.snapshots[0]['bids'][:5])
+
+        best_bid = float(depth['bids'][0][0])
+        self.push(snapshot_id - 5, snapshot_id - 1)  # déjà inclus : ignoré
+        self.push(snapshot_id, snapshot_id + 2, bids=[[f"{best_bid * 1.001:.8f}", '7.00000000']])
+
+        depth = self.manager.get_depth('BTCUSDT', 5)
+        self.assertEqual(depth['lastUpdateId'], snapshot_id + 2)
+        self.assertEqual(depth['bids'][0][1], '7.00000000')
+        self.assertEqual(self.manager.served, 2)
+
+    def test_gap_triggers_snapshot_reload(self):
+        self.manager.get_depth('BTCUSDT')
+        snapshot_id = self.snapshots[0]['lastUpdateId']
+        self.push(snapshot_id + 1, snapshot_id + 1)
+        self.push(snapshot_id + 5, snapshot_id + 6)  # trou : 2 à 4 manquants
+
+        self.assertEqual(self.manager.resyncs, 1)
+        depth = self.manager.get_depth('BTCUSDT')
+        self.assertEqual(len(self.snapshots), 2)
+        self.assertEqual(depth['lastUpdateId'], self.snapshots[1]['lastUpdateId'])
+
+    def test_disconnect_stops_serving_until_reloaded(self):
+        self.manager.get_depth('BTCUSDT')
+        self.source.disconnect()
+        self.assertIsNone(self.manager.get_depth('BTCUSDT'))
+
+        self.source.reconnect()
+        self.assertIsNotNone(self.manager.get_depth('BTCUSDT'))
+        self.assertEqual(len(self.snapshots), 2)
+
+
+class BinanceDepthStreamSourceTests(TestCase):
+    """Flux diff-depth reçu par StreamClient (transport de rejeu), reconnexion après coupure"""
+
+    def setUp(self):
+        self.transport = ReplayTransport()
+        self.source = BinanceDepthStreamSource('ws://binance.test', transport=self.transport)
+        self.addCleanup(self.source.close)
+        self.events, self.resets = [], threading.Semaphore(0)
+        self.received = threading.Semaphore(0)
+
+    def on_event(self, event):
+        self.events.append(event)
+        self.received.release()
+
+    def test_events_and_reconnection(self):
+        event = {'e': 'depthUpdate', 's': 'BTCUSDT', 'U': 1, 'u': 2, 'b': [], 'a': []}
+        self.transport.messages = [{'stream': 'btcusdt@depth@100ms', 'data': event}]
+        self.source.subscribe('BTCUSDT')
+        self.source.start(self.on_event, self.resets.release)
+
+        self.assertTrue(self.received.acquire(timeout=5))
+        self.assertEqual(self.events, [event])
+        self.assertIn('btcusdt@depth@100ms', self.transport.current.url)
+
+        self.transport.drop()
+        self.assertTrue(self.resets.acquire(timeout=5))
+        self.assertTrue(self.received.acquire(timeout=5))  # reconnecté, flux rejoué
+        self.assertEqual(len(self.transport.connections), 2)
+        self.assertEqual(self.source.client.reconnects, 1)
@@ -0,0 +1,95 @@
+"""
+Classement des paires : éligibilité (référentiel exchangeInfo), top par volume
+et par variation, et recalcul quand l'instantané ou le référentiel change.
+"""
+from django.test import TestCase
+
+from .. import ranking
+from ..binance_service import BinanceAPIService
+from ..ranking import BY_CHANGE, PairRanking, get_pair_ranking
+from ..snapshot import TickerSnapshot
+from ..symbols import SymbolRegistry
+from .base import StubServerTestCase
+
+
+def _snapshot(volumes, changes=None, fetched_at=None):
+    changes = changes or {}
+    return TickerSnapshot([
+        {'symbol': symbol, 'quoteVolume': f"{volume:.8f}",
+         'priceChangePercent': f"{changes.get(symbol, 0.0):.3f}"}
+        for symbol, volume in volumes.items()
+    ], fetched_at=fetched_at)
+
+
+def _registry(halted=(), fetched_at=None):
+    pairs = [('BTCUSDT', 'BTC', 'USDT'), ('ETHUSDT', 'ETH', 'USDT'), ('SOLUSDT', 'SOL', 'USDT'),
+             ('USDCUSDT', 'USDC', 'USDT'), ('ETHBTC', 'ETH', 'BTC')]
+    return SymbolRegistry({'symbols': [
+        {'symbol': symbol, 'baseAsset': base, 'quoteAsset': quote,
+         'status': 'BREAK' if symbol in halted else 'TRADING'}
+        for symbol, base, quote in pairs
+    ]}, fetched_at=fetched_at)
+
+
+VOLUMES = {'BTCUSDT': 900.0, 'ETHUSDT': 500.0, 'SOLUSDT': 100.0, 'USDCUSDT': 2000.0, 'ETHBTC': 3000.0}
+
+
+class PairRankingTests(TestCase):
+
+    def test_top_by_volume_skips_other_quotes_stablecoins_and_halted_pairs(self):
+        pair_ranking = PairRanking(registry=_registry(halted=['SOLUSDT']))
+        pair_ranking.update(_snapshot(VOLUMES))
+
+        self.assertEqual(pair_ranking.top(), ['BTCUSDT', 'ETHUSDT'])
+
+    def test_movers_need_enough_volume(self):
+        pair_ranking = PairRanking(min_quote_volume=200.0, registry=_registry())
+        pair_ranking.update(_snapshot(VOLUMES, {'BTCUSDT': 1.0, 'ETHUSDT': -4.0, 'SOLUSDT': 30.0}))
+
+        self.assertEqual(pair_ranking.top(by=BY_CHANGE), ['ETHUSDT', 'BTCUSDT'])
+        self.assertEqual(pair_ranking.top(1), ['BTCUSDT'])
+
+    def test_without_registry_quotes_come_from_suffixes(self):
+        pair_ranking = PairRanking()
+        pair_ranking.update(_snapshot(VOLUMES))
+
+        self.assertEqual(pair_ranking.top(), ['BTCUSDT', 'ETHUSDT', 'SOLUSDT'])
+
+
+class SharedRankingTests(TestCase):
+
+    def setUp(self):
+        self.addCleanup(setattr, ranking, '_ranking', None)
+
+    def test_refreshed_registry_invalidates_eligibility(self):
+        snapshot = _snapshot(VOLUMES)
+        self.assertEqual(get_pair_ranking(snapshot, registry=_registry(fetched_at=1.0)).top(),
+                         ['BTCUSDT', 'ETHUSDT', 'SOLUSDT'])
+
+        halted = _registry(halted=['ETHUSDT'], fetched_at=2.0)
+
+        self.assertEqual(get_pair_ranking(snapshot, registry=halted).top(), ['BTCUSDT', 'SOLUSDT'])
+        # Sans référentiel (exchangeInfo indisponible), le précédent reste en place
+        self.assertEqual(get_pair_ranking(snapshot).top(), ['BTCUSDT', 'SOLUSDT'])
+
+    def test_new_snapshot_with_same_date_and_size_is_ranked(self):
+        registry = _registry()
+        get_pair_ranking(_snapshot(VOLUMES, fetched_at=1.0), registry=registry)
+
+        moved = dict(VOLUMES, SOLUSDT=5000.0)
+
+        self.assertEqual(get_pair_ranking(_snapshot(moved, fetched_at=1.0), registry=registry).top(1), ['SOLUSDT'])
+
+
+class PopularPairsServiceTests(StubServerTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.addCleanup(setattr, ranking, '_ranking', None)
+
+    def test_service_ranks_with_the_shared_registry(self):
+        pairs = BinanceAPIService.get_popular_pairs(5)
+
+        self.assertEqual(len(pairs), 5)
+        self.assertIs(ranking._ranking.registry, BinanceAPIService.get_symbol_registry())
+        self.assertEqual(self.stub.hits['/api/v3/exchangeInfo'], 1)
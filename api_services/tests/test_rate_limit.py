@@ -0,0 +1,91 @@
+"""
+Limiteur de poids : poids des requêtes, token bucket, recalage sur les
+en-têtes Binance et pause après un 429 renvoyé par le bouchon.
+"""
+import time
+
+from django.test import TestCase
+
+from ..binance_service import BinanceAPIService
+from ..rate_limit import RateLimitExceeded, WeightLimiter, limiter, request_weight
+from .base import StubServerTestCase
+
+
+class RequestWeightTests(TestCase):
+
+    def test_weights_follow_binance_documentation(self):
+        self.assertEqual(request_weight('/api/v3/ticker/24hr', {'symbol': 'BTCUSDT'}), 2)
+        self.assertEqual(request_weight('/api/v3/ticker/24hr'), 80)
+        self.assertEqual(request_weight('/api/v3/depth', {'limit': 100}), 5)
+        self.assertEqual(request_weight('/api/v3/depth', {'limit': 1000}), 50)
+        self.assertEqual(request_weight('/api/v3/depth', {'limit': 5000}), 250)
+        self.assertEqual(request_weight('/api/v3/klines', {'limit': 1000}), 2)
+        self.assertEqual(request_weight('/api/v3/ping'), 1)
+
+
+class WeightLimiterTests(TestCase):
+    """Budget de 600 * 0.5 = 300 par minute, soit 5 jetons par seconde"""
+
+    def setUp(self):
+        self.limiter = WeightLimiter(limit=600, safety_ratio=0.5, max_wait=1.0)
+
+    def test_spends_tokens_then_waits_then_refuses(self):
+        self.assertEqual(self.limiter.reserve(295), 0)
+        self.assertAlmostEqual(self.limiter.reserve(8), 0.6, delta=0.05)  # 3 jetons manquants
+
+        with self.assertRaises(RateLimitExceeded) as raised:
+            self.limiter.reserve(50)
+        self.assertAlmostEqual(raised.exception.retry_after, 10.6, delta=0.1)
+        self.assertEqual((self.limiter.spent, self.limiter.rejected), (303, 1))
+
+    def test_tokens_refill_over_time(self):
+        self.limiter.reserve(300)
+        self.assertFalse(self.limiter.has_budget(1))
+
+        time.sleep(0.3)
+
+        self.assertTrue(self.limiter.has_budget(1))
+        self.assertAlmostEqual(self.limiter.remaining(), 1.5, delta=0.3)
+
+    def test_used_weight_header_caps_the_bucket(self):
+        self.limiter.update_from_headers(200, {'X-MBX-USED-WEIGHT-1M': '250'})
+
+        self.assertAlmostEqual(self.limiter.remaining(), 50, delta=0.5)
+        self.assertEqual(self.limiter.status()['used_weight_1m'], 250)
+
+    def test_rate_limited_response_pauses_all_calls(self):
+        self.limiter.update_from_headers(429, {'Retry-After': '30'})
+
+        with self.assertRaises(RateLimitExceeded) as raised:
+            self.limiter.reserve(1)
+        self.assertAlmostEqual(raised.exception.retry_after, 30, delta=0.5)
+        self.assertAlmostEqual(self.limiter.wait_time(1), 30, delta=0.5)
+
+        self.limiter.reset()
+        self.assertEqual(self.limiter.reserve(1), 0)
+
+
+class LimiterServiceTests(StubServerTestCase):
+    """Le service recale le limiteur sur les réponses du bouchon"""
+
+    def setUp(self):
+        super().setUp()
+        self.use_http_session(BINANCE_HTTP_RETRIES=0)
+
+    def test_used_weight_is_read_from_responses(self):
+        BinanceAPIService.get_24hr_ticker('BTCUSDT')
+
+        status = BinanceAPIService.get_rate_limit_status()
+        self.assertEqual(status['spent'], 2)
+        self.assertIsNotNone(status['used_weight_1m'])
+
+    def test_rate_limited_response_stops_upstream_calls(self):
+        self.stub.inject(429, retry_after=30)
+
+        self.assertEqual(BinanceAPIService.get_24hr_ticker('BTCUSDT'), {})
+        self.assertEqual(BinanceAPIService.get_order_book('BTCUSDT', 5), {})
+
+        # Le 429 met tout le client en pause : le carnet n'a pas été demandé
+        self.assertEqual(self.stub.hits['/api/v3/depth'], 0)
+        self.assertGreater(limiter.status()['paused_for'], 25)
+        self.assertFalse(BinanceAPIService.has_budget('/api/v3/depth', {'limit': 5}))
@@ -0,0 +1,60 @@
+"""
+Enregistrements Ticker / Kline : attributs numériques, chaînes Binance
+restituées à l'identique, et conservation en cache (pickle).
+"""
+import pickle
+from array import array
+
+from django.test import TestCase
+
+from ..records import Kline, Ticker
+
+
+ROW = [1700000000000, '1.5', '2.00000000', '1.00000000', '1.25000000', '99999999999.123456789',
+       1700003599999, '10.00000000', 7, '5.00000000', '6.00000000', '0']
+
+
+class RecordTests(TestCase):
+    """Les enregistrements restituent les chaînes Binance à l'identique"""
+
+    def test_original_strings_are_kept(self):
+        ticker = Ticker.from_api({
+            'symbol': 'BTCUSDT', 'lastPrice': '64000.01000000', 'priceChangePercent': '-1.835',
+            'quoteVolume': '123456789012345.12345678', 'volume': '12.5', 'count': 42,
+        })
+
+        self.assertEqual(ticker.get('quoteVolume'), '123456789012345.12345678')
+        self.assertEqual(ticker.get('volume'), '12.5')
+        self.assertEqual(ticker.to_api()['lastPrice'], '64000.01000000')
+        self.assertEqual(ticker['priceChangePercent'], '-1.835')
+        self.assertEqual(ticker.get('count'), 42)
+        self.assertIsNone(ticker.get('askPrice'))
+        self.assertEqual(ticker.last_price, 64000.01)
+
+    def test_kline_attributes_and_api_list(self):
+        kline = Kline.from_api(ROW)
+
+        self.assertEqual((kline.open_time, kline.open, kline.close, kline.trades), (1700000000000, 1.5, 1.25, 7))
+        self.assertEqual(kline.to_api(), ROW[:11])
+        with self.assertRaises(TypeError):
+            kline[4]
+
+    def test_records_built_from_numbers_are_formatted(self):
+        kline = Kline(array('d', [1700000000000, 1.5, 2, 1, 1.25, 3, 1700003599999, 10, 7, 5, 6]))
+
+        self.assertEqual(kline.to_api()[:3], [1700000000000, '1.50000000', '2.00000000'])
+        self.assertEqual(Kline([1, None]).to_api()[1:3], [None, None])
+
+    def test_pickle_round_trip(self):
+        ticker = Ticker.from_api({'symbol': 'ETHUSDT', 'lastPrice': '3200.1', 'count': 3})
+        kline = Kline.from_api(ROW)
+
+        self.assertEqual(pickle.loads(pickle.dumps(ticker)).to_api(), ticker.to_api())
+        self.assertEqual(pickle.loads(pickle.dumps(kline)).to_api(), ROW[:11])
+
+    def test_previous_cache_format_is_still_read(self):
+        kline = Kline.__new__(Kline)
+        kline.__setstate__((array('d', [float(v) for v in ROW[:11]]), (), {5: '99999999999.123456789'}))
+
+        self.assertEqual(kline.to_api()[5], '99999999999.123456789')
+        self.assertEqual(kline.to_api()[1], '1.50000000')
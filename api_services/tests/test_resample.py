@@ -0,0 +1,96 @@
+"""
+Agrégation locale des klines : seaux alignés comme chez Binance, extrêmes et
+sommes par seau, chandeliers incomplets ignorés.
+"""
+from datetime import datetime, timezone
+
+from ..records import Kline, klines_from_api
+from ..resample import can_resample, resample
+from .base import StubServerTestCase
+
+
+def _ms(year, month, day):
+    return int(datetime(year, month, day, tzinfo=timezone.utc).timestamp() * 1000)
+
+
+class ResampleTests(StubServerTestCase):
+    """Seaux alignés comme chez Binance : semaines du lundi, mois calendaires"""
+
+    def daily(self, end_ms, limit):
+        return klines_from_api(self.get('/api/v3/klines', {
+            'symbol': 'BTCUSDT', 'interval': '1d', 'endTime': end_ms, 'limit': limit,
+        }))
+
+    def test_weeks_start_on_monday_like_binance(self):
+        days = self.daily(_ms(2024, 3, 10), 40)  # du jeudi 1er février au dimanche 10 mars
+        weeks = resample(days, '1d', '1w')
+
+        starts = [datetime.fromtimestamp(k.open_time / 1000, timezone.utc) for k in weeks]
+        self.assertTrue(all(start.weekday() == 0 for start in starts))
+        self.assertEqual(starts[0], datetime(2024, 2, 5, tzinfo=timezone.utc))  # semaine partielle écartée
+        self.assertEqual(len(weeks), 5)
+        # Mêmes bornes que les klines 1w du bouchon
+        binance_weeks = self.get('/api/v3/klines', {
+            'symbol': 'BTCUSDT', 'interval': '1w', 'endTime': _ms(2024, 3, 10), 'limit': 5,
+        })
+        self.assertEqual([k.open_time for k in weeks], [k[0] for k in binance_weeks])
+        self.assertEqual([k.close_time for k in weeks], [k[6] for k in binance_weeks])
+
+    def test_week_aggregates_its_days(self):
+        days = self.daily(_ms(2024, 3, 10), 40)
+        week = resample(days, '1d', '1w')[0]
+        members = [k for k in days if _ms(2024, 2, 5) <= k.open_time < _ms(2024, 2, 12)]
+
+        self.assertEqual(len(members), 7)
+        self.assertEqual(week.open, members[0].open)
+        self.assertEqual(week.close, members[-1].close)
+        self.assertEqual(week.high, max(k.high for k in members))
+        self.assertEqual(week.low, min(k.low for k in members))
+        self.assertAlmostEqual(week.volume, sum(k.volume for k in members))
+        self.assertEqual(week.trades, sum(k.trades for k in members))
+
+    def test_months_follow_the_calendar(self):
+        days = self.daily(_ms(2024, 3, 10), 56)  # du 15 janvier au 10 mars (année bissextile)
+        months = resample(days, '1d', '1M')
+
+        self.assertEqual([k.open_time for k in months], [_ms(2024, 2, 1), _ms(2024, 3, 1)])
+        self.assertEqual(months[0].close_time, _ms(2024, 3, 1) - 1)
+        self.assertEqual(months[1].close_time, _ms(2024, 4, 1) - 1)
+        february = [k for k in days if _ms(2024, 2, 1) <= k.open_time < _ms(2024, 3, 1)]
+        self.assertEqual(len(february), 29)
+        self.assertEqual(months[0].open, february[0].open)
+        self.assertEqual(months[0].close, february[-1].close)
+
+    def test_limit_and_partial_first_bucket(self):
+        days = self.daily(_ms(2024, 3, 10), 56)
+
+        self.assertEqual(len(resample(days, '1d', '1M', drop_partial=False)), 3)
+        self.assertEqual([k.open_time for k in resample(days, '1d', '1M', limit=1)], [_ms(2024, 3, 1)])
+
+    def test_can_resample(self):
+        self.assertTrue(can_resample('1h', '1w'))
+        self.assertTrue(can_resample('1d', '1M'))
+        self.assertFalse(can_resample('3d', '1w'))  # le décalage de 4 jours n'est pas un multiple de 3
+        self.assertFalse(can_resample('1d', '1h'))
+        with self.assertRaises(ValueError):
+            resample([], '3d', '1w')
+
+    def test_incomplete_klines_do_not_draw_zero_wicks(self):
+        days = self.daily(_ms(2024, 2, 18), 14)  # deux semaines complètes
+        broken = Kline([days[3].open_time, days[3].open, days[3].high, None, days[3].close, 1.0,
+                        days[3].close_time, 1.0, 1, None, None])
+        weeks = resample(days[:3] + [broken] + days[4:], '1d', '1w')
+
+        self.assertEqual(len(weeks), 2)
+        self.assertEqual(weeks[0].low, min(k.low for i, k in enumerate(days[:7]) if i != 3))
+        self.assertGreater(weeks[0].low, 0)
+        self.assertAlmostEqual(weeks[0].volume, sum(k.volume for i, k in enumerate(days[:7]) if i != 3))
+
+    def test_bucket_without_complete_kline_is_dropped(self):
+        days = self.daily(_ms(2024, 2, 18), 14)
+        blank = [Kline([k.open_time, None, None, None, None, None, k.close_time]) for k in days[7:]]
+
+        weeks = resample(days[:7] + blank, '1d', '1w')
+
+        self.assertEqual([k.open_time for k in weeks], [_ms(2024, 2, 5)])
+        self.assertEqual(resample(blank, '1d', '1w'), [])
@@ -0,0 +1,88 @@
+"""
+Index de recherche des symboles : qualité des correspondances, recherche
+approchée, mise à jour par différence et index partagé du processus.
+"""
+from django.test import TestCase
+
+from .. import search_index
+from ..search_index import (
+    EXACT, FUZZY, NAME_PREFIX, PREFIX, SUBSTRING, SymbolSearchIndex, get_search_index,
+)
+from ..snapshot import TickerSnapshot
+
+
+class SymbolSearchIndexTests(TestCase):
+    """Préfixes, sous-chaînes (trigrammes), recherche approchée et mise à jour par différence"""
+
+    NAMES = {'BTC': 'Bitcoin', 'ETH': 'Ethereum', 'SHIB': 'Shiba Inu', 'DOGE': 'Dogecoin'}
+    PAIRS = {
+        'BTCUSDT': ('BTC', 'USDT'), 'BTCEUR': ('BTC', 'EUR'), 'ETHBTC': ('ETH', 'BTC'),
+        'ETHUSDT': ('ETH', 'USDT'), 'SHIBUSDT': ('SHIB', 'USDT'), 'DOGEUSDT': ('DOGE', 'USDT'),
+    }
+    VOLUMES = {'BTCUSDT': 900.0, 'BTCEUR': 50.0, 'ETHBTC': 20.0, 'ETHUSDT': 500.0,
+               'SHIBUSDT': 80.0, 'DOGEUSDT': 70.0}
+
+    def setUp(self):
+        self.index = SymbolSearchIndex(self.NAMES)
+        self.index.update(self.PAIRS)
+
+    def search(self, query, **kwargs):
+        return self.index.search(query, volume=lambda symbol: self.VOLUMES.get(symbol, 0.0), **kwargs)
+
+    def test_exact_then_prefix_by_volume(self):
+        self.assertEqual(self.search('BTCUSDT')[0], ('BTCUSDT', EXACT))
+        self.assertEqual(self.search('btc', limit=2), [('BTCUSDT', PREFIX), ('BTCEUR', PREFIX)])
+
+    def test_name_prefix_and_name_words(self):
+        self.assertEqual(self.search('bitc'), [('BTCUSDT', NAME_PREFIX), ('BTCEUR', NAME_PREFIX)])
+        self.assertEqual(self.search('inu'), [('SHIBUSDT', NAME_PREFIX)])
+
+    def test_substring_through_trigrams(self):
+        results = dict(self.search('USDT', limit=None))
+        self.assertEqual(set(results), {'BTCUSDT', 'ETHUSDT', 'SHIBUSDT', 'DOGEUSDT'})
+        self.assertEqual(set(results.values()), {SUBSTRING})
+        # Moins de trois caractères : parcours direct
+        self.assertIn(('ETHBTC', SUBSTRING), self.search('HB', limit=None))
+
+    def test_fuzzy_match_for_typos(self):
+        self.assertEqual(dict(self.search('BITCION')), {'BTCUSDT': FUZZY, 'BTCEUR': FUZZY})
+        self.assertEqual(self.search('BITCION', fuzzy=False), [])
+        self.assertEqual(self.search('ZZZZ'), [])
+
+    def test_incremental_update(self):
+        pairs = dict(self.PAIRS)
+        del pairs['DOGEUSDT']
+        pairs['SOLUSDT'] = ('SOL', 'USDT')
+        pairs['ETHBTC'] = ('ETH', 'BTC')
+
+        self.assertEqual(self.index.update(pairs), (1, 1))
+        self.assertEqual(self.index.update(pairs), (0, 0))
+        self.assertNotIn('DOGEUSDT', self.index)
+        self.assertEqual(self.search('doge'), [])
+        self.assertEqual(self.search('SOL'), [('SOLUSDT', PREFIX)])
+        # Plus aucune trace du symbole retiré dans les trigrammes
+        self.assertFalse(any('DOGEUSDT' in symbols for symbols in self.index._trigrams.values()))
+
+    def test_changed_pair_is_reindexed(self):
+        pairs = dict(self.PAIRS, ETHBTC=('ETHB', 'TC'))
+
+        self.assertEqual(self.index.update(pairs), (1, 1))
+        self.assertEqual(self.index.describe('ETHBTC')['base_asset'], 'ETHB')
+
+
+class SharedIndexTests(TestCase):
+    """Sans référentiel, l'index partagé suit l'instantané des tickers"""
+
+    def setUp(self):
+        self.addCleanup(setattr, search_index, '_index_source', None)
+        self.addCleanup(search_index._index.update, {})
+
+    def test_new_snapshot_of_same_size_updates_the_index(self):
+        first = TickerSnapshot([{'symbol': 'BTCUSDT'}, {'symbol': 'ETHUSDT'}], fetched_at=1.0)
+        self.assertIn('ETHUSDT', get_search_index(None, first))
+
+        second = TickerSnapshot([{'symbol': 'BTCUSDT'}, {'symbol': 'SOLUSDT'}], fetched_at=1.0)
+        index = get_search_index(None, second)
+
+        self.assertIn('SOLUSDT', index)
+        self.assertNotIn('ETHUSDT', index)
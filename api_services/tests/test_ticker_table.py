@@ -0,0 +1,99 @@
+"""
+Table colonne des tickers : masques de la recherche, top-N par volume et
+réutilisation de la table tant que l'instantané ne change pas.
+"""
+from django.test import TestCase
+
+from ..snapshot import TickerSnapshot
+from ..symbols import SymbolRegistry
+from ..ticker_table import TickerTable, get_ticker_table
+
+
+def _ticker(symbol, price, change, quote_volume):
+    return {
+        'symbol': symbol, 'lastPrice': f"{price:.8f}", 'priceChangePercent': f"{change:.3f}",
+        'volume': '1.00000000', 'quoteVolume': f"{quote_volume:.8f}",
+    }
+
+
+TICKERS = [
+    _ticker('BTCUSDT', 64000.0, 2.5, 900.0),
+    _ticker('ETHBTC', 0.05, -1.0, 300.0),
+    _ticker('BTCEUR', 59000.0, 0.0, 500.0),
+    _ticker('USDCUSDT', 1.0, -0.01, 700.0),
+]
+
+EXCHANGE_INFO = {'symbols': [
+    {'symbol': 'BTCUSDT', 'baseAsset': 'BTC', 'quoteAsset': 'USDT', 'status': 'TRADING'},
+    {'symbol': 'ETHBTC', 'baseAsset': 'ETH', 'quoteAsset': 'BTC', 'status': 'TRADING'},
+    {'symbol': 'BTCEUR', 'baseAsset': 'BTC', 'quoteAsset': 'EUR', 'status': 'TRADING'},
+    {'symbol': 'USDCUSDT', 'baseAsset': 'USDC', 'quoteAsset': 'USDT', 'status': 'TRADING'},
+]}
+
+
+class TickerTableTests(TestCase):
+
+    def setUp(self):
+        self.table = TickerTable(TickerSnapshot(TICKERS), SymbolRegistry(EXCHANGE_INFO))
+
+    def selected(self, **filters):
+        return sorted(self.table.symbol[self.table.mask(**filters)].tolist())
+
+    def test_no_filter_keeps_every_row(self):
+        self.assertEqual(len(self.selected()), 4)
+
+    def test_category(self):
+        self.assertEqual(self.selected(category='fiat'), ['BTCEUR'])
+        self.assertEqual(self.selected(category='stablecoin'), ['BTCUSDT', 'USDCUSDT'])
+        self.assertEqual(self.selected(category='inconnue'), self.selected())
+
+    def test_price_bounds_and_volume(self):
+        self.assertEqual(self.selected(min_price=1.0, max_price=60000.0), ['BTCEUR', 'USDCUSDT'])
+        self.assertEqual(self.selected(min_volume=600.0), ['BTCUSDT', 'USDCUSDT'])
+
+    def test_change_sign(self):
+        self.assertEqual(self.selected(change='positive'), ['BTCUSDT'])
+        self.assertEqual(self.selected(change='negative'), ['ETHBTC', 'USDCUSDT'])
+
+    def test_quote_asset(self):
+        self.assertEqual(self.selected(quote='USDT'), ['BTCUSDT', 'USDCUSDT'])
+        self.assertEqual(self.selected(quote='GBP'), [])
+
+    def test_symbols_from_search_index(self):
+        self.assertEqual(self.selected(symbols=['ETHBTC', 'NOPE', 'BTCEUR']), ['BTCEUR', 'ETHBTC'])
+        self.assertEqual(self.selected(symbols=[]), [])
+        self.assertEqual(self.selected(symbols=['BTCUSDT', 'BTCEUR'], change='positive'), ['BTCUSDT'])
+
+    def test_top_orders_by_quote_volume(self):
+        top = self.table.top(self.table.mask(), 3)
+
+        self.assertEqual(self.table.symbol[top].tolist(), ['BTCUSDT', 'USDCUSDT', 'BTCEUR'])
+        self.assertEqual(len(self.table.top(self.table.mask(quote='GBP'), 3)), 0)
+        self.assertEqual(self.table.quote_volume_of('ETHBTC'), 300.0)
+        self.assertEqual(self.table.quote_volume_of('NOPE'), 0.0)
+
+
+class GetTickerTableTests(TestCase):
+
+    def test_same_snapshot_reuses_the_table(self):
+        snapshot, registry = TickerSnapshot(TICKERS), SymbolRegistry(EXCHANGE_INFO)
+
+        self.assertIs(get_ticker_table(snapshot, registry), get_ticker_table(snapshot, registry))
+
+    def test_new_snapshot_with_same_date_and_size_rebuilds(self):
+        registry = SymbolRegistry(EXCHANGE_INFO)
+        first = get_ticker_table(TickerSnapshot(TICKERS, fetched_at=1.0), registry)
+
+        moved = [dict(t, lastPrice='1.00000000') for t in TICKERS]
+        second = get_ticker_table(TickerSnapshot(moved, fetched_at=1.0), registry)
+
+        self.assertIsNot(first, second)
+        self.assertEqual(second.price.tolist(), [1.0] * 4)
+
+    def test_refreshed_registry_rebuilds(self):
+        snapshot, registry = TickerSnapshot(TICKERS), SymbolRegistry(EXCHANGE_INFO)
+        first = get_ticker_table(snapshot, registry)
+
+        registry.fetched_at += 60
+
+        self.assertIsNot(get_ticker_table(snapshot, registry), first)
@@ -0,0 +1,135 @@
+"""
+Table colonne des tickers 24h (NumPy) pour la recherche
+Les champs numériques de l'instantané (records.Ticker) sont copiés une
+seule fois en tableaux float64 ; les filtres de la recherche deviennent des masques
+booléens vectorisés et le top-N par volume un argpartition, au lieu d'un
+parcours Python de tous les tickers à chaque requête.
+"""
+import threading
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from .records import Ticker
+from .snapshot import TickerSnapshot
+from .symbols import CATEGORIES, SymbolRegistry
+
+
+def _column(tickers: List[Ticker], attr: str) -> np.ndarray:
+    """Colonne float64 d'un attribut numérique des tickers (0.0 si absent)"""
+    return np.fromiter((getattr(t, attr) or 0.0 for t in tickers), dtype=np.float64, count=len(tickers))
+
+
+class TickerTable:
+    """
+    Instantané des tickers en colonnes : symbol, price, volume, quote_volume,
+    change (en %), quote (code de l'actif de cotation, indice dans `quotes`)
+    et un masque par catégorie de la recherche.
+    La ligne i correspond à tickers[i].
+    """
+
+    def __init__(self, snapshot: TickerSnapshot, registry: Optional[SymbolRegistry] = None):
+        registry = registry or SymbolRegistry()
+        self.tickers = [t for t in snapshot.tickers if t.symbol]
+        self.fetched_at = snapshot.fetched_at
+
+        symbols = [t.symbol for t in self.tickers]
+        self.symbol = np.array(symbols, dtype=str)
+        self.rows: Dict[str, int] = {symbol: i for i, symbol in enumerate(symbols)}
+        self.price = _column(self.tickers, 'last_price')
+        self.volume = _column(self.tickers, 'volume')
+        self.quote_volume = _column(self.tickers, 'quote_volume')
+        self.change = _column(self.tickers, 'price_change_percent')
+
+        quotes = [registry.quote_of(symbol) for symbol in symbols]
+        unique, codes = np.unique(np.array(quotes, dtype=str), return_inverse=True)
+        self.quotes: List[str] = unique.tolist()
+        self.quote = codes.astype(np.int32)
+
+        self.categories: Dict[str, np.ndarray] = {
+            name: np.fromiter(
+                (registry.in_category(symbol, name) for symbol in symbols),
+                dtype=bool, count=len(self.tickers),
+            )
+            for name in CATEGORIES
+        }
+
+    def __len__(self) -> int:
+        return len(self.tickers)
+
+    def quote_volume_of(self, symbol: str) -> float:
+        """Volume 24h en actif de cotation d'un symbole (0.0 s'il est absent)"""
+        row = self.rows.get(symbol)
+        return float(self.quote_volume[row]) if row is not None else 0.0
+
+    def mask(self, category: Optional[str] = None,
+             min_price: Optional[float] = None, max_price: Optional[float] = None,
+             min_volume: Optional[float] = None, change: str = '',
+             quote: Optional[str] = None, symbols: Optional[Iterable[str]] = None) -> np.ndarray:
+        """
+        Masque des lignes retenues par les filtres de la recherche :
+        catégorie, bornes de prix, volume
+        minimal (en actif de cotation), signe de la variation
+        ('positive' | 'negative'), actif de cotation et liste de symboles
+        (résultats de l'index de recherche).
+        """
+        selected = np.ones(len(self.tickers), dtype=bool)
+        if symbols is not None:
+            wanted = np.zeros(len(self.tickers), dtype=bool)
+            wanted[[self.rows[s] for s in symbols if s in self.rows]] = True
+            selected &= wanted
+        if category in self.categories:
+            selected &= self.categories[category]
+        if min_price is not None:
+            selected &= self.price >= min_price
+        if max_price is not None:
+            selected &= self.price <= max_price
+        if min_volume is not None:
+            selected &= self.quote_volume >= min_volume
+        if change == 'positive':
+            selected &= self.change > 0
+        elif change == 'negative':
+            selected &= self.change < 0
+        if quote is not None:
+            if quote not in self.quotes:
+                return np.zeros(len(self.tickers), dtype=bool)
+            selected &= self.quote == self.quotes.index(quote)
+        return selected
+
+    def top(self, mask: np.ndarray, n: int, by: str = 'quote_volume') -> np.ndarray:
+        """Indices des n lignes retenues ayant la plus grande valeur de la colonne `by`, triés"""
+        rows = np.flatnonzero(mask)
+        if n <= 0 or not len(rows):
+            return rows[:0]
+        values = getattr(self, by)[rows]
+        if len(rows) > n:
+            keep = np.argpartition(-values, n - 1)[:n]
+            rows, values = rows[keep], values[keep]
+        return rows[np.argsort(-values, kind='stable')]
+
+
+_table: Optional[TickerTable] = None
+# (instantané, référentiel, date du référentiel) de _table. Les objets sont
+# gardés en référence : comparés par identité, ils ne peuvent pas être
+# confondus avec un nouvel instantané qui réutiliserait la même adresse.
+_table_source = None
+_table_lock = threading.Lock()
+
+
+def get_ticker_table(snapshot: TickerSnapshot, registry: Optional[SymbolRegistry] = None) -> TickerTable:
+    """
+    Table de l'instantané donné, reconstruite seulement quand l'instantané
+    (ou le référentiel) change : les requêtes suivantes réutilisent les colonnes.
+    """
+    global _table, _table_source
+    registry_fetched_at = getattr(registry, 'fetched_at', None)
+    with _table_lock:
+        if _table is not None and _table_source is not None:
+            cached_snapshot, cached_registry, cached_fetched_at = _table_source
+            if (cached_snapshot is snapshot and cached_registry is registry
+                    and cached_fetched_at == registry_fetched_at):
+                return _table
+    table = TickerTable(snapshot, registry)
+    with _table_lock:
+        _table, _table_source = table, (snapshot, registry, registry_fetched_at)
+    return table
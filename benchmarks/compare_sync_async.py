@@ -0,0 +1,97 @@
+"""
+Comparaison de charge : vues synchrones vs vues asynchrones
+
+Lance N requêtes concurrentes sur chaque couple de pages (sync / async)
+d'un serveur déjà démarré, et affiche débit et latences.
+
+Exemple (serveur ASGI, un seul worker, Binance simulé en local) :
+    python manage.py binance_stub --port 9000 --latency 300 --symbols 2500
+    export BINANCE_API_BASE_URL=http://127.0.0.1:9000
+    python manage.py migrate
+    python manage.py shell -c "from django.contrib.auth.models import User; \
+        from django.test import Client; c = Client(); \
+        c.force_login(User.objects.get_or_create(username='bench')[0]); \
+        print(c.cookies['sessionid'].value)"
+    pip install uvicorn
+    uvicorn crypto_monitor.asgi:application --workers 1
+    python benchmarks/compare_sync_async.py --base-url http://127.0.0.1:8000 \
+        --sessionid <valeur affichée par la commande shell> --concurrency 50 --requests 500
+
+Le cache des données de marché reste actif (réglages par défaut) : la
+latence amont n'est payée qu'aux expirations, le débit mesure surtout
+le rendu des pages.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+PAGES = [
+    # (nom, url synchrone, url asynchrone)
+    ('Page paire', '/pairs/{symbol}/', '/pairs/async/{symbol}/'),
+    ('API paire', '/pairs/api/{symbol}/', '/pairs/async/api/{symbol}/'),
+    ('Accueil', '/home/', '/home/async/'),
+]
+
+
+async def run_load(client, url, total, concurrency):
+    """Envoie `total` requêtes GET avec au plus `concurrency` en vol"""
+    latencies = []
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                response = await client.get(url)
+                if response.status_code != 200:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        'rps': total / elapsed if elapsed else 0.0,
+        'p50': statistics.median(latencies) * 1000,
+        'p95': latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        'p99': latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        'errors': errors,
+    }
+
+
+async def main(args):
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(
+        base_url=args.base_url,
+        cookies={'sessionid': args.sessionid},
+        limits=limits,
+        timeout=60,
+        follow_redirects=False,
+    ) as client:
+        print(f"{'Page':<12} {'Mode':<6} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'erreurs':>8}")
+        for name, sync_url, async_url in PAGES:
+            for mode, url in (('sync', sync_url), ('async', async_url)):
+                url = url.format(symbol=args.symbol)
+                await run_load(client, url, min(args.concurrency, args.requests), args.concurrency)  # chauffe
+                r = await run_load(client, url, args.requests, args.concurrency)
+                print(f"{name:<12} {mode:<6} {r['rps']:>8.1f} {r['p50']:>8.1f} {r['p95']:>8.1f} {r['p99']:>8.1f} {r['errors']:>8}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--base-url', default='http://127.0.0.1:8000')
+    parser.add_argument('--sessionid', required=True, help="cookie de session d'un utilisateur connecté")
+    parser.add_argument('--symbol', default='BTCUSDT')
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--requests', type=int, default=500)
+    asyncio.run(main(parser.parse_args()))
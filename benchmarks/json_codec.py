@@ -0,0 +1,95 @@
+"""
+Benchmark du codec JSON (api_services.json_codec) contre le chemin actuel
+
+Hors ligne, sur des données synthétiques du bouchon Binance :
+- décodage de /api/v3/ticker/24hr complet (json.loads vs codec)
+- conversion des seuls champs utiles (prix et volume) plutôt que de tous les
+  champs numériques (chaînes chez Binance)
+- sérialisation d'une réponse de vue (JsonResponse vs FastJsonResponse)
+
+Exemple :
+    python benchmarks/json_codec.py --symbols 2500 --repeat 50
+    python benchmarks/json_codec.py --codec json   # repli sans orjson
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'crypto_monitor.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.http import JsonResponse  # noqa: E402
+
+from api_services.stub_server import MarketFixtures, StubConfig  # noqa: E402
+
+
+def timed(func, repeat):
+    """Durée médiane (ms) d'un appel"""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+    durations.sort()
+    return durations[len(durations) // 2] * 1000
+
+
+def main(args):
+    if args.codec:
+        settings.JSON_CODEC = args.codec
+    from api_services import json_codec
+    from api_services.json_codec import FastJsonResponse
+
+    fixtures = MarketFixtures(StubConfig(symbol_count=args.symbols))
+    raw = json.dumps(fixtures.all_tickers()).encode('utf-8')
+    tickers = json.loads(raw)
+
+    # Réponse type d'une vue : ticker, carnet d'ordres, trades et soldes Decimal
+    depth = fixtures.depth('BTCUSDT', 100)
+    trades = fixtures.trades('BTCUSDT', 50)
+    payload = {
+        'success': True,
+        'ticker': tickers[0],
+        'order_book': depth,
+        'recent_trades': trades,
+        'balance': Decimal('10234.56789012'),
+        'positions': [{'symbol': t['symbol'], 'quantity': Decimal('0.125'), 'price': Decimal(t['lastPrice'])}
+                      for t in tickers[:50]],
+    }
+    stock_payload = json.loads(json.dumps(payload, default=float))  # JsonResponse : Decimal déjà convertis
+
+    fields = ('lastPrice', 'quoteVolume')
+    numeric = [f for f, v in tickers[0].items() if isinstance(v, str) and f != 'symbol']
+    results = [
+        ('Décodage ticker/24hr', 'json.loads', timed(lambda: json.loads(raw), args.repeat)),
+        ('Décodage ticker/24hr', f'codec ({json_codec.BACKEND})', timed(lambda: json_codec.loads(raw), args.repeat)),
+        ('Conversion numérique', 'tous les champs', timed(
+            lambda: [{f: float(t[f]) for f in numeric} for t in tickers], args.repeat)),
+        ('Conversion numérique', 'champs utiles', timed(
+            lambda: [json_codec.numbers(t, fields) for t in tickers], args.repeat)),
+        ('Réponse de vue', 'JsonResponse', timed(lambda: JsonResponse(stock_payload), args.repeat * 20)),
+        ('Réponse de vue', 'FastJsonResponse', timed(lambda: FastJsonResponse(payload), args.repeat * 20)),
+    ]
+
+    print(f"{len(tickers)} tickers, {len(raw) / 1024:.0f} Ko ; codec : {json_codec.BACKEND}")
+    print(f"{'Opération':<22} {'Chemin':<22} {'médiane ms':>11}")
+    for name, path, ms in results:
+        print(f"{name:<22} {path:<22} {ms:>11.3f}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--symbols', type=int, default=2500)
+    parser.add_argument('--repeat', type=int, default=30)
+    parser.add_argument('--codec', choices=['auto', 'orjson', 'json'], default=None,
+                        help="force le codec (défaut : setting JSON_CODEC)")
+    main(parser.parse_args())
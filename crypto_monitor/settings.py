@@ -2,6 +2,7 @@
 Django settings for crypto_monitor project.
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project
@@ -57,6 +58,7 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'api_services.context_processors.market_status',
             ],
         },
     },
@@ -110,7 +112,148 @@ SESSION_ENGINE = 'django.contrib.sessions.backends.db'
 SESSION_COOKIE_AGE = 86400  # 24 hours
 
 # Binance API Configuration
-BINANCE_API_BASE_URL = 'https://api.binance.com'
+# Surchargeable pour pointer vers le bouchon local (python manage.py binance_stub)
+BINANCE_API_BASE_URL = os.environ.get('BINANCE_API_BASE_URL', 'https://api.binance.com')
+
+# Client HTTP Binance (api_services.http)
+BINANCE_HTTP_POOL_SIZE = 20          # connexions keep-alive par hôte
+BINANCE_HTTP_RETRIES = 3             # sur erreurs de connexion et réponses 429/5xx
+BINANCE_HTTP_BACKOFF = 0.3           # backoff exponentiel : 0.3s, 0.6s, 1.2s...
+BINANCE_HTTP_BACKOFF_JITTER = 0.2    # + aléa uniforme [0, 0.2s]
+BINANCE_HTTP_MAX_RETRY_AFTER = 5     # au-delà, on n'attend pas le Retry-After
+BINANCE_HTTP_TIMEOUTS = {  # (connexion, lecture) en secondes
+    'default': (3.05, 5),
+    'ticker_24hr': (3.05, 10),
+    'exchange_info': (3.05, 15),
+}
+
+# Limiteur de poids Binance (api_services.rate_limit)
+BINANCE_WEIGHT_LIMIT = 6000          # REQUEST_WEIGHT par minute et par IP côté Binance
+BINANCE_WEIGHT_SAFETY_RATIO = 0.8    # part de la limite que l'on s'autorise à consommer
+BINANCE_WEIGHT_MAX_WAIT = 1.0        # attente max (s) dans la file avant de refuser un appel
+
+# Appels amont concurrents (BinanceAPIService.fetch_many)
+# Un appel encore en cours à l'échéance du lot occupe son thread jusqu'au
+# timeout HTTP : prévoir de quoi absorber les lots de plusieurs requêtes
+# simultanées pendant une panne (le disjoncteur coupe ensuite ces appels)
+BINANCE_FETCH_WORKERS = 32
+BINANCE_FETCH_DEADLINE = 8  # secondes pour l'ensemble d'un lot
+# Pool séparé des tâches de fond (rafraîchissements du cache, instantanés des carnets)
+BINANCE_BACKGROUND_WORKERS = 8
+
+# Stockage local des klines clôturées (api_services.kline_store)
+BINANCE_KLINE_STORE = True
+
+# Carnets d'ordres tenus localement via le flux diff-depth (api_services.order_book)
+# Désactivé par défaut (source vide : appel REST /api/v3/depth à chaque requête) ;
+# BINANCE_ORDER_BOOK_SOURCE=api_services.order_book.BinanceDepthStreamSource
+# l'active face au vrai Binance (le bouchon local ne fournit pas de flux).
+BINANCE_WS_BASE_URL = os.environ.get('BINANCE_WS_BASE_URL', 'wss://stream.binance.com:9443')
+BINANCE_ORDER_BOOK_SOURCE = os.environ.get('BINANCE_ORDER_BOOK_SOURCE', '')
+BINANCE_ORDER_BOOK_MAX_SYMBOLS = 20       # carnets suivis simultanément (LRU)
+BINANCE_ORDER_BOOK_IDLE_TIMEOUT = 60      # secondes sans consultation avant désabonnement
+BINANCE_ORDER_BOOK_SNAPSHOT_LIMIT = 1000  # profondeur de l'instantané initial
+
+# Démon de flux temps réel (python manage.py stream_market_data, api_services.market_data)
+# Il publie prix, carnets, trades et chandeliers en cours dans le cache partagé
+# BINANCE_STREAM_CACHE ; les vues les y lisent tant qu'ils ont moins de
+# BINANCE_STREAM_MAX_AGE secondes, sinon elles appellent l'API REST.
+BINANCE_STREAM_CACHE = 'market_data'
+BINANCE_STREAM_MAX_AGE = 10              # secondes
+BINANCE_STREAM_PUBLISH_INTERVAL = 1      # secondes entre deux publications
+BINANCE_STREAM_WATCH_TTL = 60            # un symbole reste suivi 60 s après sa dernière consultation
+BINANCE_STREAM_MAX_SYMBOLS = 20          # symboles suivis en détail (carnet, trades, klines)
+BINANCE_STREAM_KLINE_INTERVALS = ['1h', '1d']
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # Partagé entre le démon de flux et les processus de l'application
+    'market_data': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('MARKET_DATA_CACHE_DIR', str(BASE_DIR / 'market_data_cache')),
+    },
+    # Dernières réponses valides (BINANCE_LKG_CACHE) : à part, pour qu'elles ne
+    # soient pas évincées au hasard avec les données publiées (MAX_ENTRIES
+    # par défaut : 300) ; une entrée par appel conservé (symbole, paramètres)
+    'lkg': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('LKG_CACHE_DIR', str(BASE_DIR / 'lkg_cache')),
+        'TIMEOUT': None,
+        'OPTIONS': {'MAX_ENTRIES': 20000},
+    },
+}
+
+# Cache des données de marché (api_services.cache)
+BINANCE_CACHE_MAX_ENTRIES = 1024
+BINANCE_CACHE_TTL = {  # secondes
+    'ticker_24hr': 3,
+    'ticker_price': 2,
+    'klines': 15,
+    'order_book': 2,
+    'order_book_snapshot': 0,  # instantané d'initialisation : toujours frais
+    'recent_trades': 2,
+    'exchange_info': 3600,
+}
+# Stale-while-revalidate : au-delà du TTL, la dernière réponse reste servie
+# pendant cette durée (secondes) et un seul rafraîchissement part en arrière-plan
+BINANCE_CACHE_STALE = {
+    'ticker_24hr': 30,
+    'ticker_price': 10,
+    'klines': 60,
+    'exchange_info': 86400,
+}
+
+# Disjoncteurs par endpoint (api_services.circuit_breaker)
+BINANCE_BREAKER_FAILURES = 3          # échecs consécutifs avant ouverture
+BINANCE_BREAKER_RESET_TIMEOUT = 30    # secondes d'ouverture avant un appel de test
+BINANCE_BREAKER_LATENCY_SLO = {       # au-delà (secondes), un appel réussi compte comme un échec
+    'default': 2.5,
+    'ticker_24hr': 6,
+    'exchange_info': 10,
+}
+# Dernières réponses valides, servies pendant une panne (cache persistant)
+BINANCE_LKG_CACHE = 'lkg'
+BINANCE_LKG_ENDPOINTS = ['ticker_24hr', 'ticker_price', 'klines', 'order_book', 'recent_trades', 'exchange_info']
+BINANCE_LKG_WRITE_INTERVAL = 30       # secondes entre deux écritures d'une même réponse
+BINANCE_LKG_MAX_AGE = 7 * 24 * 3600   # au-delà, la réponse conservée est oubliée
+
+# Paires populaires (carrousel) : top du volume 24h de l'instantané des tickers
+# (api_services.ranking) ; by='change' : plus fortes variations parmi les paires
+# d'au moins BINANCE_MOVERS_MIN_QUOTE_VOLUME de volume en actif de cotation
+BINANCE_POPULAR_PAIRS_COUNT = 15
+BINANCE_POPULAR_QUOTES = ['USDT']
+BINANCE_MOVERS_MIN_QUOTE_VOLUME = 1_000_000
+
+# Carrousel de la page d'accueil précalculé (api_services.carousel), rafraîchi par
+# python manage.py refresh_carousel, ou à défaut en arrière-plan par les vues
+BINANCE_CAROUSEL_CACHE = 'market_data'
+BINANCE_CAROUSEL_SIZE = 10
+BINANCE_CAROUSEL_REFRESH_INTERVAL = 30   # secondes
+BINANCE_CAROUSEL_RETRY_DELAY = 10        # secondes sans nouvelle construction après un échec
+BINANCE_CAROUSEL_MAX_AGE = 600           # au-delà, le carrousel publié est oublié
+
+# Mini-courbes SVG précalculées (api_services.downsample) : BINANCE_SPARKLINE_LIMIT
+# klines BINANCE_SPARKLINE_INTERVAL réduites par LTTB à BINANCE_SPARKLINE_POINTS points
+BINANCE_SPARKLINE_INTERVAL = '15m'
+BINANCE_SPARKLINE_LIMIT = 96             # 24h
+BINANCE_SPARKLINE_POINTS = 48
+# Séries des graphiques de la page d'une paire, réduites au-delà de ce nombre de points
+BINANCE_CHART_POINTS = 120
+
+# Flux temps réel de la page d'une paire (Server-Sent Events, ASGI uniquement ;
+# api_services.live_feed) : une lecture amont par symbole, partagée entre pages
+BINANCE_LIVE_FEED = True
+BINANCE_LIVE_FEED_INTERVAL = 1.0         # secondes entre deux lectures d'un symbole
+BINANCE_LIVE_FEED_HEARTBEAT = 15         # commentaire de maintien de la connexion
+BINANCE_LIVE_FEED_MAX_AGE = 300          # durée max d'un flux, le navigateur se reconnecte
+
+# Cotations groupées (pairs/api/quotes/?symbols=...) : symboles par requête
+BINANCE_QUOTES_MAX_SYMBOLS = 200
+
+# Codec JSON (api_services.json_codec) : 'auto' = orjson s'il est installé, sinon json
+JSON_CODEC = os.environ.get('JSON_CODEC', 'auto')
 
 
 LOGIN_URL = '/accounts/login/'
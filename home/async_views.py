@@ -0,0 +1,42 @@
+"""
+Variante asynchrone de la page d'accueil, pour un déploiement ASGI
+"""
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.shortcuts import render
+from django.views import View
+
+from accounts.mixins import AsyncLoginRequiredMixin, aget_or_create_profile
+from api_services.async_binance_service import AsyncBinanceAPIService
+from api_services.carousel import get_carousel
+from watchlist.models import Watchlist
+from .views import _watchlist_item
+
+
+class AsyncHomeView(AsyncLoginRequiredMixin, View):
+    """Page d'accueil avec carrousel et watchlist (version asynchrone)"""
+
+    async def get(self, request):
+        # Carrousel commun à tous les utilisateurs, précalculé (api_services.carousel) ;
+        # hors de la boucle : sa première construction fait des appels bloquants
+        profile, snapshot, carousel_data = await asyncio.gather(
+            aget_or_create_profile(request),
+            AsyncBinanceAPIService.get_ticker_snapshot(),
+            sync_to_async(get_carousel, thread_sensitive=False)(),
+        )
+
+        # Watchlist de l'utilisateur (ORM async)
+        watchlist_data = []
+        async for item in Watchlist.objects.filter(user_profile=profile):
+            ticker = snapshot.get(item.symbol)
+            if ticker:
+                watchlist_data.append(_watchlist_item(item, ticker))
+
+        context = {
+            'profile': profile,
+            'carousel_items': carousel_data,
+            'watchlist': watchlist_data,
+        }
+
+        return await sync_to_async(render)(request, 'home/index.html', context)
@@ -1,9 +1,11 @@
 from django.urls import path
 from . import views
+from . import async_views
 
 app_name = 'home'
 
 urlpatterns = [
     path('', views.HomeView.as_view(), name='index'),
+    path('async/', async_views.AsyncHomeView.as_view(), name='index_async'),
 ]
 
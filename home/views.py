@@ -5,6 +5,18 @@ from django.contrib.auth.mixins import LoginRequiredMixin
 from accounts.models import UserProfile
 from watchlist.models import Watchlist
 from api_services.binance_service import BinanceAPIService
+from api_services.carousel import get_carousel
+
+
+def _watchlist_item(item, ticker):
+    """Ligne de watchlist à partir de l'élément en base et de son ticker 24h"""
+    return {
+        'id': item.id,
+        'symbol': item.symbol,
+        'price': ticker.get('lastPrice', '0'),
+        'change': ticker.get('priceChangePercent', '0'),
+        'volume': BinanceAPIService.format_volume(ticker.get('volume', '0')),
+    }
 
 
 class HomeView(LoginRequiredMixin, View):
@@ -57,41 +69,20 @@ class HomeView(LoginRequiredMixin, View):
             # Dernier recours: on renvoie vers la landing (ou signup) si vraiment pas de profil
             return redirect('landing:index')
 
-        # Récupérer les paires populaires pour le carrousel
-        popular_pairs = BinanceAPIService.get_popular_pairs()
-        carousel_data = []
+        # Carrousel commun à tous les utilisateurs, précalculé (api_services.carousel)
+        carousel_data = get_carousel()
 
-        for symbol in popular_pairs[:10]:  # Top 10 pour le carrousel
-            ticker = BinanceAPIService.get_24hr_ticker(symbol)
-            if ticker:
-                # Récupérer les mini klines pour le graphique
-                klines = BinanceAPIService.get_klines(symbol, '1h', 24)
-                prices = [float(k[4]) for k in klines] if klines else []  # Prix de clôture
-
-                carousel_data.append({
-                    'symbol': symbol,
-                    'price': ticker.get('lastPrice', '0'),
-                    'change': ticker.get('priceChangePercent', '0'),
-                    'volume': BinanceAPIService.format_volume(ticker.get('volume', '0')),
-                    'high': ticker.get('highPrice', '0'),
-                    'low': ticker.get('lowPrice', '0'),
-                    'prices': prices,
-                })
+        # Un seul appel amont pour tous les tickers de la watchlist
+        snapshot = BinanceAPIService.get_ticker_snapshot()
 
         # Récupérer la watchlist de l'utilisateur
         watchlist_items = Watchlist.objects.filter(user_profile=profile)
         watchlist_data = []
 
         for item in watchlist_items:
-            ticker = BinanceAPIService.get_24hr_ticker(item.symbol)
+            ticker = snapshot.get(item.symbol)
             if ticker:
-                watchlist_data.append({
-                    'id': item.id,
-                    'symbol': item.symbol,
-                    'price': ticker.get('lastPrice', '0'),
-                    'change': ticker.get('priceChangePercent', '0'),
-                    'volume': BinanceAPIService.format_volume(ticker.get('volume', '0')),
-                })
+                watchlist_data.append(_watchlist_item(item, ticker))
 
         context = {
             'profile': profile,
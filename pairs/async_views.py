@@ -0,0 +1,114 @@
+"""
+Variantes asynchrones des vues de paires, pour un déploiement ASGI
+(crypto_monitor/asgi.py) : les appels Binance sont lancés en parallèle sur la
+boucle d'événements et les lectures en base passent par l'ORM async, sans
+immobiliser un thread pendant l'attente réseau.
+"""
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from django.shortcuts import render
+from django.views import View
+
+from accounts.mixins import AsyncLoginRequiredMixin, aget_or_create_profile
+from api_services.async_binance_service import AsyncBinanceAPIService
+from api_services.json_codec import FastJsonResponse
+from api_services.live_feed import stream_events
+from watchlist.models import TradingAccount, Portfolio
+from .views import (
+    _build_market_context, _api_calls, _build_api_payload, _ticker_as_of, live_feed_url,
+)
+
+
+class AsyncPairDetailView(AsyncLoginRequiredMixin, View):
+    """Page détaillée d'une paire de trading (version asynchrone)"""
+
+    async def get(self, request, symbol):
+        sym = (symbol or "").upper()
+
+        # Profil et ticker 24h en parallèle (squelette de la page, voir PairDetailView)
+        profile, ticker_24h = await asyncio.gather(
+            aget_or_create_profile(request),
+            AsyncBinanceAPIService.get_24hr_ticker(sym),
+        )
+        as_of = _ticker_as_of(sym)
+        if not ticker_24h:
+            return await sync_to_async(render)(request, 'pairs/not_found.html', {'symbol': sym})
+
+        # Informations de trading (compte Trading par défaut)
+        trading_account, _ = await TradingAccount.objects.aget_or_create(
+            user_profile=profile,
+            account_type='trading',
+            defaults={
+                'balance': 10000.00,
+                'initial_balance': 10000.00,
+            }
+        )
+        portfolio_item = await Portfolio.objects.filter(
+            account=trading_account,
+            symbol=sym
+        ).afirst()
+
+        context = _build_market_context(sym, ticker_24h, as_of)
+        context.update({
+            'profile': profile,
+            'trading_balance': float(trading_account.balance),
+            'held_quantity': float(portfolio_item.quantity) if portfolio_item else 0.0,
+            'avg_purchase_price': float(portfolio_item.purchase_price) if portfolio_item else 0.0,
+            'live_feed_url': live_feed_url(request, sym),
+        })
+
+        # Le rendu reste synchrone (filtres/templates), on le sort de la boucle
+        return await sync_to_async(render)(request, 'pairs/detail.html', context)
+
+
+class AsyncPairAPIView(AsyncLoginRequiredMixin, View):
+    """API temps réel d'une paire (version asynchrone)"""
+
+    async def get(self, request, symbol):
+        sym = (symbol or "").upper()
+
+        data = await AsyncBinanceAPIService.fetch_many(_api_calls(AsyncBinanceAPIService, sym))
+
+        ticker_24h, as_of = data['ticker_24h'], _ticker_as_of(sym)
+        if not ticker_24h:
+            return FastJsonResponse({'error': 'Symbole non trouvé'}, status=404)
+
+        return FastJsonResponse(_build_api_payload(sym, ticker_24h, data, as_of))
+
+
+async def _live_sections(sym):
+    """
+    Sections du flux temps réel d'une paire (mêmes données que AsyncPairAPIView) ;
+    chacune n'est poussée aux pages que si elle a changé.
+    """
+    data = await AsyncBinanceAPIService.fetch_many(_api_calls(AsyncBinanceAPIService, sym))
+    ticker_24h = data['ticker_24h']
+    if not ticker_24h:
+        return {}
+    payload = _build_api_payload(sym, ticker_24h, data)
+    return {
+        'ticker': {'ticker': payload['ticker']},
+        'order_book': {'order_book': payload['order_book']},
+        'recent_trades': {'recent_trades': payload['recent_trades']},
+    }
+
+
+class AsyncPairStreamView(AsyncLoginRequiredMixin, View):
+    """
+    Flux temps réel d'une paire (Server-Sent Events, ASGI uniquement) :
+    une seule lecture amont par symbole, partagée par toutes les pages ouvertes
+    (api_services/live_feed.py). Hors ASGI, 503 : la page revient au polling.
+    """
+
+    async def get(self, request, symbol):
+        if not isinstance(request, ASGIRequest):
+            return FastJsonResponse({'error': 'Flux disponible uniquement en ASGI'}, status=503)
+        sym = (symbol or "").upper()
+
+        response = StreamingHttpResponse(stream_events(sym, _live_sections), content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'  # pas de mise en tampon par un proxy nginx
+        return response
@@ -0,0 +1,183 @@
+// Rafraîchissement des cotations sur place (static/js/app.js), dans Node
+// avec un DOM minimal : node pairs/js_tests/app_quotes.test.js
+// (lancé par pairs/tests.py)
+"use strict";
+
+const assert = require("assert");
+const fs = require("fs");
+const path = require("path");
+const vm = require("vm");
+
+// --- DOM minimal : attributs data-*, classList, textContent, querySelectorAll
+
+class FakeElement {
+  constructor(attributes = {}, classes = [], children = []) {
+    this.attributes = attributes;
+    this.classList = new FakeClassList(classes);
+    this.children = children;
+    this.textContent = "";
+  }
+
+  get dataset() {
+    const dataset = {};
+    for (const [name, value] of Object.entries(this.attributes)) {
+      if (name.startsWith("data-")) {
+        dataset[name.slice(5).replace(/-([a-z])/g, (_, c) => c.toUpperCase())] = value;
+      }
+    }
+    return dataset;
+  }
+
+  matches(selector) {
+    const match = /^\[([\w-]+)(?:="([^"]*)")?\]$/.exec(selector);
+    if (!match) throw new Error("Sélecteur non géré: " + selector);
+    const [, name, value] = match;
+    return name in this.attributes && (value === undefined || this.attributes[name] === value);
+  }
+
+  querySelectorAll(selector) {
+    const found = [];
+    const visit = (element) => {
+      for (const child of element.children) {
+        if (child.matches(selector)) found.push(child);
+        visit(child);
+      }
+    };
+    visit(this);
+    return found;
+  }
+
+  querySelector(selector) {
+    return this.querySelectorAll(selector)[0] || null;
+  }
+}
+
+class FakeClassList {
+  constructor(classes) {
+    this.classes = new Set(classes);
+  }
+  contains(name) {
+    return this.classes.has(name);
+  }
+  toggle(name, force) {
+    if (force) this.classes.add(name);
+    else this.classes.delete(name);
+  }
+  toString() {
+    return [...this.classes].sort().join(" ");
+  }
+}
+
+function field(name, text) {
+  const element = new FakeElement({ "data-quote-field": name });
+  element.textContent = text;
+  return element;
+}
+
+function card(symbol) {
+  return new FakeElement({ "data-quote": symbol }, [], [
+    field("price", "1.00"),
+    field("change", "2.000"),
+    new FakeElement({ "data-quote-trend": "" }, ["badge", "bg-success"], [
+      new FakeElement({ "data-quote-trend": "" }, ["bi", "bi-arrow-up-circle"]),
+    ]),
+    new FakeElement({ "data-quote-trend": "" }, ["price-up"]),
+    new FakeElement({ "data-quote-trend": "" }, ["text-muted"]),
+  ]);
+}
+
+function load(root) {
+  const requests = [];
+  const errors = [];
+  const timers = [];
+  const context = {
+    document: Object.assign(root, { hidden: false, addEventListener() {} }),
+    console: { error: (...args) => errors.push(args) },
+    setInterval: (fn, delay) => timers.push({ fn, delay }),
+    encodeURIComponent,
+    fetch: async (url) => {
+      requests.push(url);
+      const symbols = decodeURIComponent(url.split("symbols=")[1]).split(",");
+      if (symbols.includes("BROKEN")) return { ok: false };
+      const quotes = {};
+      if (symbols.includes("BTCUSDT")) {
+        quotes.BTCUSDT = { price: "64000.01000000", change: "-1.500", high: "65000", low: "63000", volume: "1.2K" };
+      }
+      return { ok: true, json: async () => ({ success: true, quotes, missing: [] }) };
+    },
+  };
+  vm.createContext(context);
+  const source = fs.readFileSync(path.join(__dirname, "..", "..", "static", "js", "app.js"), "utf8");
+  vm.runInContext(source, context);
+  return { context, requests, errors, timers };
+}
+
+const tests = {
+  async "met à jour toutes les occurrences d'une paire en une requête"() {
+    const btcCard = card("BTCUSDT");
+    const btcRow = card("BTCUSDT");
+    const ethCard = card("ETHUSDT");
+    const { context, requests } = load(new FakeElement({}, [], [btcCard, btcRow, ethCard]));
+
+    await context.refreshQuotes();
+
+    assert.deepStrictEqual(requests, ["/pairs/api/quotes/?symbols=BTCUSDT%2CETHUSDT"]);
+    for (const container of [btcCard, btcRow]) {
+      const [price, change, badge, cell, muted] = container.children;
+      assert.strictEqual(price.textContent, "64000.01000000");
+      assert.strictEqual(change.textContent, "-1.500");
+      assert.strictEqual(String(badge.classList), "badge bg-danger");
+      assert.strictEqual(String(badge.children[0].classList), "bi bi-arrow-down-circle");
+      assert.strictEqual(String(cell.classList), "price-down");
+      assert.strictEqual(String(muted.classList), "text-muted");
+    }
+    // Paire absente de la réponse : inchangée
+    assert.strictEqual(ethCard.children[0].textContent, "1.00");
+    assert.strictEqual(String(ethCard.children[2].classList), "badge bg-success");
+  },
+
+  async "découpe les symboles en lots"() {
+    const cards = Array.from({ length: 450 }, (_, i) => card("SYM" + i));
+    const { context, requests } = load(new FakeElement({}, [], cards));
+
+    await context.refreshQuotes();
+
+    assert.strictEqual(requests.length, 3);
+    assert.strictEqual(decodeURIComponent(requests[2].split("symbols=")[1]).split(",").length, 50);
+  },
+
+  async "une erreur réseau est journalisée sans interrompre les lots suivants"() {
+    const btcCard = card("BTCUSDT");
+    const cards = [card("BROKEN"), ...Array.from({ length: 199 }, (_, i) => card("SYM" + i)), btcCard];
+    const { context, requests, errors } = load(new FakeElement({}, [], cards));
+
+    await context.refreshQuotes();
+
+    assert.strictEqual(requests.length, 2);
+    assert.strictEqual(errors.length, 1);
+    assert.strictEqual(btcCard.children[0].textContent, "64000.01000000");
+  },
+
+  async "pas de minuterie sans paire affichée"() {
+    const empty = load(new FakeElement());
+    empty.context.setupAutoRefresh();
+    assert.strictEqual(empty.timers.length, 0);
+
+    const listed = load(new FakeElement({}, [], [card("BTCUSDT")]));
+    listed.context.setupAutoRefresh(5);
+    assert.deepStrictEqual(listed.timers.map((t) => t.delay), [5000]);
+  },
+};
+
+(async () => {
+  let failed = 0;
+  for (const [name, test] of Object.entries(tests)) {
+    try {
+      await test();
+    } catch (error) {
+      failed += 1;
+      console.error("ÉCHEC: " + name + "\n" + error.stack);
+    }
+  }
+  process.exit(failed ? 1 : 0);
+})();
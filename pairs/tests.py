@@ -0,0 +1,158 @@
+"""
+Page détail d'une paire et ses sections chargées à la demande (stats,
+graphiques, carnet, trades, paires similaires), cotations groupées
+(/pairs/api/quotes/), servies par le bouchon Binance local (stub_server),
+et leur rafraîchissement sur place par static/js/app.js (Node).
+"""
+import shutil
+import subprocess
+from pathlib import Path
+from unittest import mock, skipIf
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+
+from api_services.binance_service import BinanceAPIService
+from api_services.tests.base import StubServerTestCase, StubServerTransactionTestCase
+
+
+class PairDetailSectionsTests(StubServerTransactionTestCase):
+    """Squelette rendu avec le ticker 24h seul, sections en JSON à la demande"""
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(User.objects.create_user('alice', password='secret'))
+
+    def api(self, name, *args, status=200):
+        response = self.client.get(reverse(f'pairs:{name}', args=args))
+        self.assertEqual(response.status_code, status)
+        return response.json()
+
+    def test_shell_only_needs_the_24h_ticker(self):
+        response = self.client.get(reverse('pairs:detail', args=['btcusdt']))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['symbol'], 'BTCUSDT')
+        self.assertEqual(self.stub.hits['/api/v3/ticker/24hr'], 1)
+        for path in ('/api/v3/klines', '/api/v3/depth', '/api/v3/trades', '/api/v3/exchangeInfo'):
+            self.assertEqual(self.stub.hits[path], 0, path)
+
+    def test_unknown_symbol(self):
+        response = self.client.get(reverse('pairs:detail', args=['NOPEUSDT']))
+
+        self.assertTemplateUsed(response, 'pairs/not_found.html')
+        self.assertEqual(self.api('api_stats', 'NOPEUSDT', status=404), {'error': 'Symbole non trouvé'})
+
+    def test_stats(self):
+        stats = self.api('api_stats', 'BTCUSDT')
+
+        self.assertEqual(stats['symbol'], 'BTCUSDT')
+        self.assertLessEqual(stats['atl'], stats['ath'])
+        for field in ('change_1h', 'change_7d'):
+            self.assertRegex(stats[field], r'^[+-]\d+\.\d{2}$')
+
+    def test_charts(self):
+        hourly = self.api('api_chart', 'BTCUSDT', '1h')
+        self.assertEqual(len(hourly['prices']), 24)
+        self.assertEqual(hourly['labels'], list(range(24)))
+
+        self.assertEqual(len(self.api('api_chart', 'BTCUSDT', '1d')['prices']), 30)
+        # Semaines agrégées à partir de la série 1d déjà chargée : aucun appel supplémentaire
+        klines_calls = self.stub.hits['/api/v3/klines']
+        weekly = self.api('api_chart', 'BTCUSDT', '1w')
+        self.assertTrue(0 < len(weekly['prices']) <= 52)
+        self.assertEqual(self.stub.hits['/api/v3/klines'], klines_calls)
+
+        self.assertEqual(self.api('api_chart', 'BTCUSDT', '5m', status=400), {'error': 'Intervalle non supporté'})
+
+    def test_order_book_and_trades(self):
+        order_book = self.api('api_order_book', 'BTCUSDT')['order_book']
+        self.assertEqual((len(order_book['bids']), len(order_book['asks'])), (10, 10))
+
+        trades = self.api('api_trades', 'BTCUSDT')['recent_trades']
+        self.assertEqual(len(trades), 10)
+        self.assertEqual(set(trades[0]), {'price', 'qty', 'time'})
+
+    def test_similar_pairs_share_the_quote_asset(self):
+        similar = self.api('api_similar', 'BTCUSDT')['similar_pairs']
+
+        self.assertEqual(len(similar), 5)
+        self.assertTrue(all(p['symbol'].endswith('USDT') and p['symbol'] != 'BTCUSDT' for p in similar))
+
+    def test_sections_require_login(self):
+        self.client.logout()
+
+        response = self.client.get(reverse('pairs:api_stats', args=['BTCUSDT']))
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(self.stub.hits['/api/v3/klines'], 0)
+
+
+class PairQuotesAPIViewTests(StubServerTestCase):
+    """Cotations de plusieurs paires lues dans un seul instantané des tickers"""
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(User.objects.create_user('trader', password='secret'))
+        self.url = reverse('pairs:quotes')
+
+    def test_quotes_and_missing_symbols(self):
+        with mock.patch.object(BinanceAPIService, '_request', wraps=BinanceAPIService._request) as request:
+            response = self.client.get(self.url, {'symbols': 'BTCUSDT, ethusdt,NOPEUSDT,BTCUSDT'})
+
+        self.assertEqual(response.status_code, 200)
+        payload = response.json()
+        self.assertTrue(payload['success'])
+        self.assertEqual(list(payload['quotes']), ['BTCUSDT', 'ETHUSDT'])
+        self.assertEqual(payload['missing'], ['NOPEUSDT'])
+        # Un seul appel amont, quel que soit le nombre de symboles
+        self.assertEqual([call.args[0] for call in request.call_args_list], ['ticker_24hr'])
+
+        snapshot = BinanceAPIService.get_ticker_snapshot()
+        quote = payload['quotes']['BTCUSDT']
+        self.assertEqual(set(quote), {'price', 'change', 'high', 'low', 'volume'})
+        self.assertEqual(quote['price'], snapshot.get('BTCUSDT').get('lastPrice'))
+        self.assertEqual(quote['change'], snapshot.get('BTCUSDT').get('priceChangePercent'))
+        self.assertEqual(payload['as_of'], int(snapshot.fetched_at * 1000))
+
+    def test_all_symbols_missing(self):
+        payload = self.client.get(self.url, {'symbols': 'NOPEUSDT,NOPEEUR'}).json()
+
+        self.assertEqual(payload['quotes'], {})
+        self.assertEqual(payload['missing'], ['NOPEUSDT', 'NOPEEUR'])
+
+    def test_symbols_parameter_is_required(self):
+        self.assertEqual(self.client.get(self.url).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'symbols': ' , '}).status_code, 400)
+
+    @override_settings(BINANCE_QUOTES_MAX_SYMBOLS=2)
+    def test_too_many_symbols(self):
+        response = self.client.get(self.url, {'symbols': 'BTCUSDT,ETHUSDT,BNBUSDT'})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('2 symboles', response.json()['error'])
+
+    def test_login_required(self):
+        self.client.logout()
+        response = self.client.get(self.url, {'symbols': 'BTCUSDT'})
+
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(response['Location'].startswith('/accounts/login/'))
+
+
+@skipIf(shutil.which('node') is None, "Node.js n'est pas installé")
+class QuotesRefreshScriptTests(SimpleTestCase):
+    """static/js/app.js : cotations appliquées sur place, par lots (pairs/js_tests)"""
+
+    def node(self, *args):
+        return subprocess.run(['node', *args], cwd=settings.BASE_DIR, capture_output=True, text=True, timeout=60)
+
+    def test_script_parses(self):
+        result = self.node('--check', str(Path('static') / 'js' / 'app.js'))
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+    def test_quotes_are_applied_in_place(self):
+        result = self.node(str(Path(__file__).resolve().parent / 'js_tests' / 'app_quotes.test.js'))
+        self.assertEqual(result.returncode, 0, result.stderr)
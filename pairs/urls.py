@@ -1,10 +1,29 @@
 # pairs/urls.py
 from django.urls import path
-from .views import PairDetailView, PairAPIView
+from .views import (
+    PairDetailView, PairAPIView, PairStatsAPIView, PairChartAPIView,
+    PairOrderBookAPIView, PairTradesAPIView, PairSimilarAPIView, PairQuotesAPIView,
+)
+from .async_views import AsyncPairDetailView, AsyncPairAPIView, AsyncPairStreamView
 
 app_name = 'pairs'
 
 urlpatterns = [
+    # Variantes asynchrones (déploiement ASGI)
+    path('async/<str:symbol>/', AsyncPairDetailView.as_view(), name='detail_async'),
+    path('async/api/<str:symbol>/', AsyncPairAPIView.as_view(), name='api_async'),
+    # Flux temps réel (Server-Sent Events)
+    path('stream/<str:symbol>/', AsyncPairStreamView.as_view(), name='stream'),
+
     path('<str:symbol>/', PairDetailView.as_view(), name='detail'),
+    # Cotations de plusieurs paires (avant api/<symbol>/, qui capturerait « quotes »)
+    path('api/quotes/', PairQuotesAPIView.as_view(), name='quotes'),
     path('api/<str:symbol>/', PairAPIView.as_view(), name='api'),
+
+    # Sections de la page détail, chargées à la demande
+    path('api/<str:symbol>/stats/', PairStatsAPIView.as_view(), name='api_stats'),
+    path('api/<str:symbol>/chart/<str:interval>/', PairChartAPIView.as_view(), name='api_chart'),
+    path('api/<str:symbol>/order-book/', PairOrderBookAPIView.as_view(), name='api_order_book'),
+    path('api/<str:symbol>/trades/', PairTradesAPIView.as_view(), name='api_trades'),
+    path('api/<str:symbol>/similar/', PairSimilarAPIView.as_view(), name='api_similar'),
 ]
@@ -1,12 +1,25 @@
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
 from django.shortcuts import render
+from django.urls import reverse
 from django.views import View
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.http import JsonResponse
+import time
 from datetime import datetime
 
 from accounts.models import UserProfile
 from watchlist.models import TradingAccount, Portfolio
 from api_services.binance_service import BinanceAPIService
+from api_services.json_codec import FastJsonResponse
+from api_services.downsample import downsample_klines
+from api_services.resample import resample
+from api_services.snapshot import TickerSnapshot
+from api_services.symbols import SymbolRegistry
+
+
+# Série de base 1d : 30 jours affichés et 52 semaines reconstruites localement
+# (+ une semaine pour compléter la première semaine et la semaine en cours)
+DAILY_KLINES_LIMIT = 7 * 53
 
 
 def _get_or_create_profile(request):
@@ -28,6 +41,131 @@ def _get_or_create_profile(request):
     return profile
 
 
+def _chart_data(klines, points):
+    """Série de prix de clôture d'un graphique, réduite à `points` points au plus"""
+    prices = downsample_klines(klines, points)
+    return {'labels': list(range(len(prices))), 'prices': prices}
+
+
+def _ticker_as_of(sym):
+    """
+    Date (timestamp) du ticker 24h de la paire servi par le cache, même périmé
+    (stale-while-revalidate) ; maintenant si la réponse ne vient pas du cache
+    (données publiées par le démon de flux, relues chaque seconde).
+    """
+    as_of = BinanceAPIService.get_as_of('ticker_24hr', {'symbol': sym})
+    return as_of or time.time()
+
+
+def live_feed_url(request, sym):
+    """
+    URL du flux temps réel (SSE) de la paire, ou '' : le flux n'est servi que
+    sous ASGI et si BINANCE_LIVE_FEED est actif ; sinon la page interroge
+    l'API toutes les 3 secondes.
+    """
+    if not getattr(settings, 'BINANCE_LIVE_FEED', True) or not isinstance(request, ASGIRequest):
+        return ''
+    return reverse('pairs:stream', args=[sym])
+
+
+def _build_market_context(sym, ticker_24h, as_of=None):
+    """Contexte « marché » du squelette de la page détail (ticker 24h uniquement)"""
+    current = ticker_24h.last_price or 0.0
+
+    return {
+        'symbol': sym,
+        'ticker': ticker_24h,
+        'current_price': {'symbol': sym, 'price': ticker_24h.get('lastPrice', '0')},
+        'current_price_formatted': BinanceAPIService.format_price(str(current)),
+        'current_price_value': current,
+        # Pour 24h on utilise directement le % du ticker (plus fiable côté Binance)
+        'change_24h': ticker_24h.get('priceChangePercent', '0'),
+        'volume': BinanceAPIService.format_volume(ticker_24h.get('volume', '0')),
+        'quote_volume': BinanceAPIService.format_volume(ticker_24h.get('quoteVolume', '0')),
+        'high_24h': ticker_24h.get('highPrice', '0'),
+        'high_24h_formatted': BinanceAPIService.format_price(ticker_24h.get('highPrice', '0')),
+        'low_24h': ticker_24h.get('lowPrice', '0'),
+        'low_24h_formatted': BinanceAPIService.format_price(ticker_24h.get('lowPrice', '0')),
+        'as_of': datetime.fromtimestamp(as_of or time.time()),
+    }
+
+
+# Séries des graphiques de la page détail : 1h et 1d lues telles quelles,
+# 1w agrégée à partir de la série 1d (pas d'appel 1w)
+CHART_INTERVALS = ('1h', '1d', '1w')
+
+
+def _chart_klines(sym, interval):
+    """Klines (records.Kline) du graphique `interval` de la page détail"""
+    if interval == '1h':
+        return BinanceAPIService.get_klines(sym, '1h', 24)
+    daily = BinanceAPIService.get_klines(sym, '1d', DAILY_KLINES_LIMIT)
+    if interval == '1d':
+        return daily[-30:]
+    return resample(daily, '1d', '1w', limit=52)
+
+
+def _build_stats_payload(sym, ticker_24h, klines_1h, daily):
+    """Variations 1h / 7j et extrêmes sur 52 semaines, à partir des klines 1h et 1d"""
+    klines_1d = daily[-30:]
+    klines_1w = resample(daily, '1d', '1w', limit=52)
+
+    # Variations 1h / 7j
+    current = ticker_24h.last_price or 0.0
+
+    price_1h = (klines_1h[-1].close or 0.0) if klines_1h else 0.0
+    if len(klines_1d) > 7:
+        price_7d = klines_1d[-7].close or 0.0
+    else:
+        price_7d = price_1h or current
+
+    change_1h = ((current - price_1h) / price_1h * 100) if price_1h > 0 else 0.0
+    change_7d = ((current - price_7d) / price_7d * 100) if price_7d > 0 else 0.0
+
+    # ATH / ATL sur 52 semaines (via klines 1w)
+    highs = [k.high for k in klines_1w if k.high is not None]
+    lows = [k.low for k in klines_1w if k.low is not None]
+
+    ath = max(highs) if highs else current
+    atl = min(lows) if lows else current
+
+    return {
+        'success': True,
+        'symbol': sym,
+        'change_1h': f"{change_1h:+.2f}",
+        'change_24h': ticker_24h.get('priceChangePercent', '0'),
+        'change_7d': f"{change_7d:+.2f}",
+        'ath': ath,
+        'ath_formatted': BinanceAPIService.format_price(str(ath)),
+        'atl': atl,
+        'atl_formatted': BinanceAPIService.format_price(str(atl)),
+    }
+
+
+def _similar_pairs(sym, snapshot, registry, limit=5):
+    """Paires de même actif de cotation, via le référentiel exchangeInfo"""
+    registry = registry or SymbolRegistry()
+    snapshot = snapshot or TickerSnapshot()
+    quote_currency = registry.quote_of(sym)
+    if registry:
+        candidates = registry.symbols_for_quote(quote_currency)
+    else:
+        candidates = [t.symbol for t in snapshot.tickers if t.symbol.endswith(quote_currency)]
+
+    similar_pairs = []
+    for tsym in candidates:
+        t = snapshot.get(tsym)
+        if t and tsym != sym:
+            similar_pairs.append({
+                'symbol': tsym,
+                'price': t.get('lastPrice', '0'),
+                'change': t.get('priceChangePercent', '0'),
+            })
+            if len(similar_pairs) >= limit:
+                break
+    return similar_pairs
+
+
 class PairDetailView(LoginRequiredMixin, View):
     """Page détaillée d'une paire de trading (connexion obligatoire)"""
 
@@ -40,120 +178,13 @@ class PairDetailView(LoginRequiredMixin, View):
 
         sym = (symbol or "").upper()
 
-        # 24h ticker
+        # Squelette de la page : le ticker 24h seul ; graphiques, carnet, trades et
+        # paires similaires sont chargés ensuite par la page (endpoints JSON)
         ticker_24h = BinanceAPIService.get_24hr_ticker(sym)
+        as_of = _ticker_as_of(sym)
         if not ticker_24h:
             return render(request, 'pairs/not_found.html', {'symbol': sym})
 
-        # Prix actuel
-        current_price = BinanceAPIService.get_ticker_price(sym)
-
-        # Kliness (peuvent être vides)
-        klines_1h = BinanceAPIService.get_klines(sym, '1h', 24) or []
-        klines_1d = BinanceAPIService.get_klines(sym, '1d', 30) or []
-        klines_1w = BinanceAPIService.get_klines(sym, '1w', 52) or []
-
-        # Helpers sécurisés
-        def safe_close(k):  # kline item -> close price float
-            try:
-                return float(k[4])
-            except Exception:
-                return 0.0
-
-        def list_close(kl):
-            return [safe_close(k) for k in kl]
-
-        # Données graphiques
-        chart_data_1h = {
-            'labels': list(range(len(klines_1h))),
-            'prices': list_close(klines_1h),
-        }
-        chart_data_1d = {
-            'labels': list(range(len(klines_1d))),
-            'prices': list_close(klines_1d),
-        }
-        chart_data_1w = {
-            'labels': list(range(len(klines_1w))),
-            'prices': list_close(klines_1w),
-        }
-
-        # Carnet d'ordres & trades récents
-        order_book = BinanceAPIService.get_order_book(sym, 10) or {}
-        recent_trades = BinanceAPIService.get_recent_trades(sym, 20) or []
-
-        # Variations 1h / 7j
-        try:
-            current = float(ticker_24h.get('lastPrice', 0) or 0)
-        except Exception:
-            current = 0.0
-
-        price_1h = safe_close(klines_1h[-1]) if klines_1h else 0.0
-        # Pour 24h on utilise directement le % du ticker (plus fiable côté Binance)
-        if len(klines_1d) > 7:
-            price_7d = safe_close(klines_1d[-7])
-        else:
-            price_7d = price_1h or current
-
-        change_1h = ((current - price_1h) / price_1h * 100) if price_1h > 0 else 0.0
-        change_24h = ticker_24h.get('priceChangePercent', '0')
-        change_7d = ((current - price_7d) / price_7d * 100) if price_7d > 0 else 0.0
-
-        # ATH / ATL sur 52 semaines (via klines 1w)
-        def safe_high(k):
-            try:
-                return float(k[2])
-            except Exception:
-                return None
-
-        def safe_low(k):
-            try:
-                return float(k[3])
-            except Exception:
-                return None
-
-        highs = [h for h in (safe_high(k) for k in klines_1w) if h is not None]
-        lows = [l for l in (safe_low(k) for k in klines_1w) if l is not None]
-
-        ath = max(highs) if highs else current
-        atl = min(lows) if lows else current
-
-        # Paires similaires (même quote currency)
-        # On détecte la quote via une liste de suffixes fréquents
-        known_quotes = ['USDT', 'BUSD', 'USDC', 'DAI', 'BTC', 'ETH', 'BNB', 'EUR', 'GBP', 'AUD', 'CAD', 'JPY', 'TRY', 'BRL', 'RUB']
-        quote_currency = None
-        for q in sorted(known_quotes, key=len, reverse=True):
-            if sym.endswith(q):
-                quote_currency = q
-                break
-        if not quote_currency:
-            # fallback sur 4 derniers caractères (ex. 'USDT')
-            quote_currency = sym[-4:] if len(sym) >= 4 else 'USDT'
-
-        all_tickers = BinanceAPIService.get_24hr_ticker() or []
-        similar_pairs = []
-        for t in all_tickers:
-            tsym = t.get('symbol') or ''
-            if tsym.endswith(quote_currency) and tsym != sym:
-                similar_pairs.append({
-                    'symbol': tsym,
-                    'price': t.get('lastPrice', '0'),
-                    'change': t.get('priceChangePercent', '0'),
-                })
-                if len(similar_pairs) >= 5:
-                    break
-
-        # Formatages pratiques
-        volume_fmt = BinanceAPIService.format_volume(ticker_24h.get('volume', '0'))
-        quote_volume_fmt = BinanceAPIService.format_volume(ticker_24h.get('quoteVolume', '0'))
-        
-        # Formater les prix pour l'affichage
-        current_price_value = float(ticker_24h.get('lastPrice', 0) or 0)
-        current_price_formatted = BinanceAPIService.format_price(str(current_price_value))
-        high_24h_formatted = BinanceAPIService.format_price(ticker_24h.get('highPrice', '0'))
-        low_24h_formatted = BinanceAPIService.format_price(ticker_24h.get('lowPrice', '0'))
-        ath_formatted = BinanceAPIService.format_price(str(ath))
-        atl_formatted = BinanceAPIService.format_price(str(atl))
-        
         # Récupérer les informations de trading (compte Trading par défaut)
         trading_account, _ = TradingAccount.objects.get_or_create(
             user_profile=profile,
@@ -175,41 +206,65 @@ class PairDetailView(LoginRequiredMixin, View):
         held_quantity = float(portfolio_item.quantity) if portfolio_item else 0.0
         avg_purchase_price = float(portfolio_item.purchase_price) if portfolio_item else 0.0
 
-        context = {
+        context = _build_market_context(sym, ticker_24h, as_of)
+        context.update({
             'profile': profile,
-            'symbol': sym,
-            'ticker': ticker_24h,
-            'current_price': current_price,
-            'current_price_formatted': current_price_formatted,
-            'current_price_value': current_price_value,
-            'change_1h': f"{change_1h:+.2f}",
-            'change_24h': change_24h,
-            'change_7d': f"{change_7d:+.2f}",
-            'volume': volume_fmt,
-            'quote_volume': quote_volume_fmt,
-            'high_24h': ticker_24h.get('highPrice', '0'),
-            'high_24h_formatted': high_24h_formatted,
-            'low_24h': ticker_24h.get('lowPrice', '0'),
-            'low_24h_formatted': low_24h_formatted,
-            'ath': ath,
-            'ath_formatted': ath_formatted,
-            'atl': atl,
-            'atl_formatted': atl_formatted,
-            'order_book': order_book,
-            'recent_trades': recent_trades[:10],
-            'chart_data_1h': chart_data_1h,
-            'chart_data_1d': chart_data_1d,
-            'chart_data_1w': chart_data_1w,
-            'similar_pairs': similar_pairs,
             # Informations de trading
             'trading_balance': trading_balance,
             'held_quantity': held_quantity,
             'avg_purchase_price': avg_purchase_price,
-        }
+            'live_feed_url': live_feed_url(request, sym),
+        })
 
         return render(request, 'pairs/detail.html', context)
 
 
+def _api_calls(service, sym):
+    """
+    Appels amont de l'endpoint temps réel et du flux SSE (ticker de la paire,
+    carnet et trades), au format de fetch_many
+    """
+    return {
+        'ticker_24h': (service.get_24hr_ticker, sym),
+        'order_book': (service.get_order_book, sym, 10),
+        'recent_trades': (service.get_recent_trades, sym, 20),
+    }
+
+
+def _format_trades(recent_trades, limit=10):
+    """Trades récents (records.Trade, convertis par le service) au format de la page"""
+    return [
+        {
+            'price': trade.get('price', '0'),
+            'qty': trade.get('qty', '0'),
+            'time': datetime.fromtimestamp(trade.time / 1000).strftime('%H:%M:%S') if trade.time else '',
+        }
+        for trade in recent_trades[:limit]
+    ]
+
+
+def _build_api_payload(sym, ticker_24h, data, as_of=None):
+    """Réponse JSON de l'endpoint temps réel d'une paire"""
+    order_book = data['order_book'] or {}
+    formatted_trades = _format_trades(data['recent_trades'] or [])
+    
+    return {
+        'success': True,
+        'symbol': sym,
+        'ticker': {
+            'lastPrice': ticker_24h.get('lastPrice', '0'),
+            'priceChangePercent': ticker_24h.get('priceChangePercent', '0'),
+            'highPrice': ticker_24h.get('highPrice', '0'),
+            'lowPrice': ticker_24h.get('lowPrice', '0'),
+            'volume': ticker_24h.get('volume', '0'),
+            'quoteVolume': ticker_24h.get('quoteVolume', '0'),
+        },
+        'order_book': order_book,
+        'recent_trades': formatted_trades,
+        'as_of': int((as_of or time.time()) * 1000),
+    }
+
+
 class PairAPIView(LoginRequiredMixin, View):
     """API endpoint pour récupérer les données en temps réel d'une paire"""
     
@@ -218,51 +273,148 @@ class PairAPIView(LoginRequiredMixin, View):
     def get(self, request, symbol):
         sym = (symbol or "").upper()
         
-        # Récupérer le ticker 24h
-        ticker_24h = BinanceAPIService.get_24hr_ticker(sym)
-        if not ticker_24h:
-            return JsonResponse({'error': 'Symbole non trouvé'}, status=404)
+        # Ticker 24h, carnet d'ordres et trades récents en parallèle
+        data = BinanceAPIService.fetch_many(_api_calls(BinanceAPIService, sym))
         
-        # Récupérer le carnet d'ordres
-        order_book = BinanceAPIService.get_order_book(sym, 10) or {}
-        
-        # Récupérer les trades récents
-        recent_trades = BinanceAPIService.get_recent_trades(sym, 20) or []
+        ticker_24h, as_of = data['ticker_24h'], _ticker_as_of(sym)
+        if not ticker_24h:
+            return FastJsonResponse({'error': 'Symbole non trouvé'}, status=404)
         
-        # Formater les trades récents
-        # Binance API retourne: [id, price, qty, quoteQty, time, isBuyerMaker, ...]
-        formatted_trades = []
-        for trade in recent_trades[:10]:
-            if isinstance(trade, list):
-                # Format liste [id, price, qty, quoteQty, time, ...]
-                price = str(trade[1]) if len(trade) > 1 else '0'
-                qty = str(trade[2]) if len(trade) > 2 else '0'
-                time_ms = trade[4] if len(trade) > 4 else 0
-                time_str = datetime.fromtimestamp(time_ms / 1000).strftime('%H:%M:%S') if time_ms else ''
+        return FastJsonResponse(_build_api_payload(sym, ticker_24h, data, as_of))
+
+
+def _quote(ticker):
+    """Cotation compacte d'un ticker 24h, aux mêmes formats que les pages"""
+    return {
+        'price': ticker.get('lastPrice', '0'),
+        'change': ticker.get('priceChangePercent', '0'),
+        'high': ticker.get('highPrice', '0'),
+        'low': ticker.get('lowPrice', '0'),
+        'volume': BinanceAPIService.format_volume(ticker.get('volume', '0')),
+    }
+
+
+class PairQuotesAPIView(LoginRequiredMixin, View):
+    """
+    Cotations de plusieurs paires en une requête (?symbols=BTCUSDT,ETHUSDT),
+    lues dans un seul instantané des tickers : les pages listant plusieurs
+    paires (accueil, watchlist, recherche) rafraîchissent leurs prix sur place.
+    """
+
+    login_url = '/accounts/login/'
+
+    def get(self, request):
+        symbols = []
+        for sym in request.GET.get('symbols', '').upper().split(','):
+            sym = sym.strip()
+            if sym and sym not in symbols:
+                symbols.append(sym)
+        max_symbols = getattr(settings, 'BINANCE_QUOTES_MAX_SYMBOLS', 200)
+        if not symbols:
+            return FastJsonResponse({'error': 'Paramètre symbols manquant'}, status=400)
+        if len(symbols) > max_symbols:
+            return FastJsonResponse({'error': f'{max_symbols} symboles au maximum'}, status=400)
+
+        snapshot = BinanceAPIService.get_ticker_snapshot()
+        quotes = {}
+        missing = []
+        for sym in symbols:
+            ticker = snapshot.get(sym)
+            if ticker:
+                quotes[sym] = _quote(ticker)
             else:
-                # Format dict
-                price = str(trade.get('price', '0'))
-                qty = str(trade.get('qty', '0'))
-                time_ms = trade.get('time', 0)
-                time_str = datetime.fromtimestamp(time_ms / 1000).strftime('%H:%M:%S') if time_ms else ''
-            
-            formatted_trades.append({
-                'price': price,
-                'qty': qty,
-                'time': time_str,
-            })
-        
-        return JsonResponse({
+                missing.append(sym)
+
+        return FastJsonResponse({
+            'success': True,
+            'quotes': quotes,
+            'missing': missing,
+            'as_of': int((snapshot.fetched_at or time.time()) * 1000),
+        })
+
+
+# Sections de la page détail chargées à la demande par la page (squelette
+# rendu avec le ticker 24h seul, voir PairDetailView)
+
+class PairStatsAPIView(LoginRequiredMixin, View):
+    """Variations 1h / 7j et extrêmes 52 semaines d'une paire"""
+
+    login_url = '/accounts/login/'
+
+    def get(self, request, symbol):
+        sym = (symbol or "").upper()
+
+        data = BinanceAPIService.fetch_many({
+            'ticker_24h': (BinanceAPIService.get_24hr_ticker, sym),
+            'klines_1h': (BinanceAPIService.get_klines, sym, '1h', 24),
+            'klines_1d': (BinanceAPIService.get_klines, sym, '1d', DAILY_KLINES_LIMIT),
+        })
+        ticker_24h = data['ticker_24h']
+        if not ticker_24h:
+            return FastJsonResponse({'error': 'Symbole non trouvé'}, status=404)
+
+        return FastJsonResponse(_build_stats_payload(
+            sym, ticker_24h, data['klines_1h'] or [], data['klines_1d'] or [],
+        ))
+
+
+class PairChartAPIView(LoginRequiredMixin, View):
+    """Série de prix de clôture d'un graphique (1h, 1d ou 1w), réduite par LTTB"""
+
+    login_url = '/accounts/login/'
+
+    def get(self, request, symbol, interval):
+        sym = (symbol or "").upper()
+        if interval not in CHART_INTERVALS:
+            return FastJsonResponse({'error': 'Intervalle non supporté'}, status=400)
+
+        chart_points = getattr(settings, 'BINANCE_CHART_POINTS', 120)
+        chart_data = _chart_data(_chart_klines(sym, interval), chart_points)
+        return FastJsonResponse({'success': True, 'symbol': sym, 'interval': interval, **chart_data})
+
+
+class PairOrderBookAPIView(LoginRequiredMixin, View):
+    """Carnet d'ordres d'une paire"""
+
+    login_url = '/accounts/login/'
+
+    def get(self, request, symbol):
+        sym = (symbol or "").upper()
+        return FastJsonResponse({
+            'success': True,
+            'symbol': sym,
+            'order_book': BinanceAPIService.get_order_book(sym, 10) or {},
+        })
+
+
+class PairTradesAPIView(LoginRequiredMixin, View):
+    """Transactions récentes d'une paire"""
+
+    login_url = '/accounts/login/'
+
+    def get(self, request, symbol):
+        sym = (symbol or "").upper()
+        return FastJsonResponse({
+            'success': True,
+            'symbol': sym,
+            'recent_trades': _format_trades(BinanceAPIService.get_recent_trades(sym, 20) or []),
+        })
+
+
+class PairSimilarAPIView(LoginRequiredMixin, View):
+    """Paires similaires (même actif de cotation)"""
+
+    login_url = '/accounts/login/'
+
+    def get(self, request, symbol):
+        sym = (symbol or "").upper()
+
+        data = BinanceAPIService.fetch_many({
+            'snapshot': (BinanceAPIService.get_ticker_snapshot,),
+            'registry': (BinanceAPIService.get_symbol_registry,),
+        })
+        return FastJsonResponse({
             'success': True,
             'symbol': sym,
-            'ticker': {
-                'lastPrice': ticker_24h.get('lastPrice', '0'),
-                'priceChangePercent': ticker_24h.get('priceChangePercent', '0'),
-                'highPrice': ticker_24h.get('highPrice', '0'),
-                'lowPrice': ticker_24h.get('lowPrice', '0'),
-                'volume': ticker_24h.get('volume', '0'),
-                'quoteVolume': ticker_24h.get('quoteVolume', '0'),
-            },
-            'order_book': order_book,
-            'recent_trades': formatted_trades,
-        })
\ No newline at end of file
+            'similar_pairs': _similar_pairs(sym, data['snapshot'], data['registry']),
+        })
@@ -0,0 +1,46 @@
+"""
+Page de recherche servie par le bouchon Binance local : ordre des résultats
+(symbole exact, préfixes, noms, sous-chaînes) et recherche approchée.
+"""
+from django.contrib.auth.models import User
+from django.urls import reverse
+
+from api_services.tests.base import StubServerTestCase
+
+
+class SearchViewTests(StubServerTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(User.objects.create_user('alice', password='secret'))
+
+    def symbols(self, query, **filters):
+        response = self.client.get(reverse('search:index'), dict(filters, q=query))
+        self.assertEqual(response.status_code, 200)
+        return [result['symbol'] for result in response.context['results']]
+
+    def test_exact_symbol_comes_alone(self):
+        self.assertEqual(self.symbols('btcusdt'), ['BTCUSDT'])
+
+    def test_prefix_matches_come_before_substrings(self):
+        symbols = self.symbols('BTC')
+
+        self.assertEqual(set(symbols[:3]), {'BTCUSDT', 'BTCUSDC', 'BTCEUR'})
+        self.assertGreater(len(symbols), 3)
+        self.assertTrue(all(s.endswith('BTC') for s in symbols[3:]))
+
+    def test_full_name_finds_the_base_asset(self):
+        self.assertEqual(set(self.symbols('Cardano')), {'ADAUSDT', 'ADAUSDC', 'ADABTC', 'ADAEUR'})
+        # « Ethereum » est aussi le début d'« Ethereum Classic »
+        self.assertEqual({s[:3] for s in self.symbols('Ethereum')}, {'ETH', 'ETC'})
+
+    def test_fuzzy_only_when_nothing_matches(self):
+        self.assertEqual(set(self.symbols('Bitcion')), {'BTCUSDT', 'BTCUSDC', 'BTCEUR'})
+        # « Solana » correspond exactement : pas de résultats approchés en plus
+        self.assertEqual(set(self.symbols('Solana')), {'SOLUSDT', 'SOLUSDC', 'SOLBTC', 'SOLEUR'})
+
+    def test_filters_keep_the_match_order(self):
+        symbols = self.symbols('BTC', type='fiat')
+
+        self.assertEqual(symbols[0], 'BTCEUR')
+        self.assertTrue(all(s.endswith('EUR') or s.startswith('EUR') for s in symbols))
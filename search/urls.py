@@ -5,5 +5,6 @@ app_name = 'search'
 
 urlpatterns = [
     path('', views.SearchView.as_view(), name='index'),
+    path('autocomplete/', views.AutocompleteView.as_view(), name='autocomplete'),
 ]
 
@@ -4,6 +4,10 @@ from django.contrib.auth.mixins import LoginRequiredMixin
 
 from accounts.models import UserProfile
 from api_services.binance_service import BinanceAPIService
+from api_services.json_codec import FastJsonResponse
+from api_services.symbols import CATEGORIES
+from api_services.search_index import get_search_index
+from api_services.ticker_table import get_ticker_table
 
 
 def _get_or_create_profile(request):
@@ -55,67 +59,56 @@ class SearchView(LoginRequiredMixin, View):
         max_price_f = to_float(max_price)
         min_volume_f = to_float(min_volume)
 
-        # Récupérer tous les tickers (liste de dicts)
-        all_tickers = BinanceAPIService.get_24hr_ticker() or []
+        # Instantané des tickers en colonnes NumPy (reconstruit seulement s'il a changé)
+        snapshot = BinanceAPIService.get_ticker_snapshot()
+        registry = BinanceAPIService.get_symbol_registry()
+        table = get_ticker_table(snapshot, registry)
+
+        # Recherche textuelle via l'index (symbole, actif de base, nom complet),
+        # classée par qualité de correspondance puis par volume ; correspondances
+        # approchées seulement si rien ne correspond exactement
+        matched = None
+        if search_query:
+            index = get_search_index(registry, snapshot)
+            volume = table.quote_volume_of
+            matched = [symbol for symbol, _ in index.search(search_query, limit=None, volume=volume, fuzzy=False)]
+            if not matched:
+                matched = [symbol for symbol, _ in index.search(search_query, limit=None, volume=volume)]
+
+        # Budget Binance épuisé : on l'indique plutôt que d'afficher une liste vide sans explication
+        retry_after = BinanceAPIService.get_budget_wait('/api/v3/ticker/24hr')
+        rate_limited = not len(table) and retry_after > 0
+
+        # Filtres vectorisés (texte, type, prix, volume en actif de cotation, variation)
+        mask = table.mask(
+            symbols=matched,
+            category=currency_type if currency_type in CATEGORIES else None,
+            min_price=min_price_f,
+            max_price=max_price_f,
+            min_volume=min_volume_f,
+            change=price_change,
+        )
 
+        # Avec une requête : ordre de l'index (symbole exact, préfixes, noms,
+        # sous-chaînes) ; sinon les 100 plus gros volumes (quote volume)
+        if matched is None:
+            rows = table.top(mask, 100)
+        else:
+            rows = [table.rows[symbol] for symbol in matched
+                    if symbol in table.rows and mask[table.rows[symbol]]][:100]
         results = []
-        for ticker in all_tickers:
-            symbol = ticker.get('symbol', '') or ''
-            if not symbol:
-                continue
-
-            # Filtrer par texte
-            if search_query and search_query not in symbol:
-                continue
-
-            # Filtrer par type
-            if currency_type == 'crypto':
-                if not (symbol.endswith('USDT') or symbol.endswith('BUSD') or symbol.endswith('BTC')):
-                    continue
-            elif currency_type == 'stablecoin':
-                if not any(stable in symbol for stable in ['USDT', 'USDC', 'BUSD', 'DAI']):
-                    continue
-            elif currency_type == 'fiat':
-                if not any(fiat in symbol for fiat in ['EUR', 'GBP', 'AUD', 'CAD', 'JPY']):
-                    continue
-
-            # Valeurs numériques
-            price = to_float(ticker.get('lastPrice'), 0.0)
-            base_volume = to_float(ticker.get('volume'), 0.0)            # volume base asset
-            quote_volume = to_float(ticker.get('quoteVolume'), 0.0)      # volume quote asset (souvent plus pertinent)
-            change_pct = to_float(ticker.get('priceChangePercent'), 0.0)
-
-            # Filtres numériques
-            if min_price_f is not None and price < min_price_f:
-                continue
-            if max_price_f is not None and price > max_price_f:
-                continue
-            if min_volume_f is not None and (quote_volume or 0) < min_volume_f:
-                # On utilise par défaut le quote_volume pour filtrer
-                continue
-            if price_change == 'positive' and (change_pct or 0) <= 0:
-                continue
-            if price_change == 'negative' and (change_pct or 0) >= 0:
-                continue
-
+        for i in rows:
+            ticker = table.tickers[i]
             results.append({
-                'symbol': symbol,
+                'symbol': ticker['symbol'],
                 'price': ticker.get('lastPrice', '0'),
                 'change': ticker.get('priceChangePercent', '0'),
                 'volume': BinanceAPIService.format_volume(ticker.get('volume', '0')),
                 'high': ticker.get('highPrice', '0'),
                 'low': ticker.get('lowPrice', '0'),
                 'quote_volume': BinanceAPIService.format_volume(ticker.get('quoteVolume', '0')),
-                # champs numériques pour tri fiable
-                '_volume_num': quote_volume if quote_volume is not None else (base_volume or 0.0),
             })
 
-        # Tri par volume (numérique) décroissant
-        results.sort(key=lambda x: x.get('_volume_num', 0.0), reverse=True)
-
-        # Limite des résultats
-        results = results[:100]
-
         context = {
             'profile': profile,
             'results': results,
@@ -127,6 +120,38 @@ class SearchView(LoginRequiredMixin, View):
             'price_change': price_change,
             'view_mode': view_mode,
             'total_results': len(results),
+            'rate_limited': rate_limited,
+            'retry_after': retry_after,
         }
 
-        return render(request, 'search/index.html', context)
\ No newline at end of file
+        return render(request, 'search/index.html', context)
+
+
+class AutocompleteView(LoginRequiredMixin, View):
+    """Suggestions de paires pour la barre de recherche (JSON, à chaque frappe)"""
+
+    login_url = '/accounts/login/'
+
+    def get(self, request):
+        query = (request.GET.get('q') or '').strip()
+        try:
+            limit = max(1, min(int(request.GET.get('limit', 10)), 50))
+        except ValueError:
+            limit = 10
+
+        snapshot = BinanceAPIService.get_ticker_snapshot()
+        registry = BinanceAPIService.get_symbol_registry()
+        table = get_ticker_table(snapshot, registry)
+        index = get_search_index(registry, snapshot)
+
+        results = []
+        for symbol, _ in index.search(query, limit=limit, volume=table.quote_volume_of):
+            entry = index.describe(symbol)
+            ticker = snapshot.get(symbol) or {}
+            entry.update({
+                'price': ticker.get('lastPrice', '0'),
+                'change': ticker.get('priceChangePercent', '0'),
+            })
+            results.append(entry)
+
+        return FastJsonResponse({'query': query, 'results': results})
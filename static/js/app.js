@@ -19,12 +19,70 @@ function showLoading(element) {
   element.innerHTML = '<span class="loading"></span>';
 }
 
-// Auto-refresh price data (optional)
-function setupAutoRefresh(intervalMinutes = 5) {
+// Cotations rafraîchies sur place (sans recharger la page) :
+// un élément data-quote="BTCUSDT" contient des éléments
+// data-quote-field="price|change|high|low|volume" et, optionnellement,
+// data-quote-trend (couleur et flèche selon le signe de la variation)
+const QUOTES_URL = "/pairs/api/quotes/";
+const QUOTES_BATCH_SIZE = 200;
+
+// Appliquer une cotation à tous les éléments de la paire
+function applyQuote(symbol, quote) {
+  document
+    .querySelectorAll(`[data-quote="${symbol}"]`)
+    .forEach((container) => {
+      container.querySelectorAll("[data-quote-field]").forEach((element) => {
+        const value = quote[element.dataset.quoteField];
+        if (value !== undefined) element.textContent = value;
+      });
+
+      const down = String(quote.change).startsWith("-");
+      container.querySelectorAll("[data-quote-trend]").forEach((element) => {
+        [
+          ["price-up", "price-down"],
+          ["bg-success", "bg-danger"],
+          ["bi-arrow-up-circle", "bi-arrow-down-circle"],
+        ].forEach(([up, downClass]) => {
+          if (element.classList.contains(up) || element.classList.contains(downClass)) {
+            element.classList.toggle(up, !down);
+            element.classList.toggle(downClass, down);
+          }
+        });
+      });
+    });
+}
+
+// Récupérer les cotations de toutes les paires affichées (une requête par lot)
+async function refreshQuotes() {
+  const symbols = [
+    ...new Set(
+      [...document.querySelectorAll("[data-quote]")].map((el) => el.dataset.quote)
+    ),
+  ];
+  for (let i = 0; i < symbols.length; i += QUOTES_BATCH_SIZE) {
+    const batch = symbols.slice(i, i + QUOTES_BATCH_SIZE);
+    try {
+      const response = await fetch(
+        QUOTES_URL + "?symbols=" + encodeURIComponent(batch.join(","))
+      );
+      if (!response.ok) throw new Error("Network error");
+      const data = await response.json();
+      Object.entries(data.quotes || {}).forEach(([symbol, quote]) =>
+        applyQuote(symbol, quote)
+      );
+    } catch (error) {
+      console.error("[ERREUR] Cotations non rafraichies:", error);
+    }
+  }
+}
+
+// Rafraîchir les prix affichés toutes les `intervalSeconds` secondes
+// (en pause quand l'onglet est masqué)
+function setupAutoRefresh(intervalSeconds = 10) {
+  if (!document.querySelector("[data-quote]")) return;
   setInterval(() => {
-    console.log("Auto-refreshing data...");
-    location.reload();
-  }, intervalMinutes * 60 * 1000);
+    if (!document.hidden) refreshQuotes();
+  }, intervalSeconds * 1000);
 }
 
 // Initialize tooltips
@@ -35,6 +93,9 @@ document.addEventListener("DOMContentLoaded", function () {
   tooltipTriggerList.map(function (tooltipTriggerEl) {
     return new bootstrap.Tooltip(tooltipTriggerEl);
   });
+
+  // Prix des pages listant plusieurs paires (accueil, watchlist, recherche)
+  setupAutoRefresh();
 });
 
 // Copy to clipboard function
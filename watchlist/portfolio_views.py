@@ -4,7 +4,6 @@ Vues pour la page Portfolio avec comptes multiples et graphiques
 from django.shortcuts import render, redirect, get_object_or_404
 from django.views import View
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.http import JsonResponse
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
 from django.db.models import Sum, Q, DecimalField
@@ -16,6 +15,7 @@ from accounts.models import UserProfile
 from .models import TradingAccount, Trade, WalletHistory, Portfolio
 from .portfolio_utils import initialize_account_history
 from api_services.binance_service import BinanceAPIService
+from api_services.json_codec import FastJsonResponse, number
 
 
 def _get_or_create_profile(request):
@@ -147,10 +147,11 @@ class AccountDetailView(LoginRequiredMixin, View):
         
         # Récupérer les prix actuels pour calculer le P&L non réalisé
         open_positions_data = []
+        snapshot = BinanceAPIService.get_ticker_snapshot()
         for position in open_positions:
-            ticker = BinanceAPIService.get_24hr_ticker(position.symbol)
+            ticker = snapshot.get(position.symbol)
             if ticker:
-                current_price = float(ticker.get('lastPrice', 0))
+                current_price = number(ticker.get('lastPrice'))
                 unrealized_pnl = (current_price - float(position.price)) * float(position.quantity)
                 unrealized_pnl_percent = ((current_price - float(position.price)) / float(position.price) * 100) if float(position.price) > 0 else 0
                 
@@ -228,7 +229,7 @@ class AccountBalanceView(LoginRequiredMixin, View):
     login_url = '/accounts/login/'
     
     def get(self, request, account_type=None):
-        from django.http import JsonResponse
+        from api_services.json_codec import FastJsonResponse
         
         # Si account_type vient de kwargs
         if account_type is None:
@@ -258,7 +259,7 @@ class AccountBalanceView(LoginRequiredMixin, View):
                     'purchase_price': float(portfolio_item.purchase_price),
                 })
         
-        return JsonResponse({
+        return FastJsonResponse({
             'balance': float(account.balance),
             'account_type': account.account_type,
             'positions': positions,
@@ -271,7 +272,7 @@ class MarginPositionView(LoginRequiredMixin, View):
     login_url = '/accounts/login/'
     
     def get(self, request, symbol=None):
-        from django.http import JsonResponse
+        from api_services.json_codec import FastJsonResponse
         from decimal import Decimal
         from .trading_views import calculate_liquidation_price, calculate_margin_ratio
         
@@ -279,7 +280,7 @@ class MarginPositionView(LoginRequiredMixin, View):
             symbol = request.GET.get('symbol', '').upper().strip()
         
         if not symbol:
-            return JsonResponse({
+            return FastJsonResponse({
                 'success': False,
                 'error': 'Symbole manquant'
             }, status=400)
@@ -296,7 +297,7 @@ class MarginPositionView(LoginRequiredMixin, View):
         ).order_by('-executed_at')
         
         if not open_trades.exists():
-            return JsonResponse({
+            return FastJsonResponse({
                 'success': True,
                 'has_position': False,
             })
@@ -309,12 +310,12 @@ class MarginPositionView(LoginRequiredMixin, View):
         # Récupérer le prix actuel depuis Binance
         ticker = BinanceAPIService.get_24hr_ticker(symbol)
         if not ticker:
-            return JsonResponse({
+            return FastJsonResponse({
                 'success': False,
                 'error': 'Impossible de récupérer le prix actuel'
             }, status=500)
         
-        current_price = Decimal(str(ticker.get('lastPrice', 0)))
+        current_price = number(ticker.get('lastPrice'), Decimal('0'), decimal=True)
         current_value = total_quantity * float(current_price)
         
         # Calculer le P&L non réalisé
@@ -365,7 +366,7 @@ class MarginPositionView(LoginRequiredMixin, View):
         if liquidation_price and current_price > 0:
             distance_to_liquidation = ((float(current_price) - float(liquidation_price)) / float(current_price) * 100)
         
-        return JsonResponse({
+        return FastJsonResponse({
             'success': True,
             'has_position': True,
             'symbol': symbol,
@@ -4,7 +4,6 @@ Vues pour le trading (buy/sell) avec intégration au système Portfolio
 from django.shortcuts import render, redirect, get_object_or_404
 from django.views import View
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.http import JsonResponse
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
@@ -16,6 +15,8 @@ from accounts.models import UserProfile
 from .models import TradingAccount, Trade, WalletHistory, Portfolio
 from .portfolio_utils import record_wallet_history
 from api_services.binance_service import BinanceAPIService
+from api_services import json_codec
+from api_services.json_codec import FastJsonResponse
 
 
 def _get_or_create_profile(request):
@@ -118,10 +119,11 @@ def check_margin_requirement(account, quantity, price, leverage=1, current_posit
             )
         
         total_positions_value = Decimal('0')
+        snapshot = BinanceAPIService.get_ticker_snapshot()
         for pos in current_positions:
-            ticker = BinanceAPIService.get_24hr_ticker(pos.symbol)
+            ticker = snapshot.get(pos.symbol)
             if ticker:
-                current_price = Decimal(str(ticker.get('lastPrice', 0)))
+                current_price = json_codec.number(ticker.get('lastPrice'), Decimal('0'), decimal=True)
                 total_positions_value += Decimal(str(pos.quantity)) * current_price
         
         # Ajouter la nouvelle position
@@ -171,7 +173,7 @@ class BuyTradeView(LoginRequiredMixin, View):
             profile = _get_or_create_profile(request)
             
             # Parser les données JSON
-            data = json.loads(request.body)
+            data = json_codec.loads(request.body)
             symbol = data.get('symbol', '').upper().strip()
             quantity = Decimal(str(data.get('quantity', 0)))
             price = Decimal(str(data.get('price', 0)))
@@ -179,7 +181,7 @@ class BuyTradeView(LoginRequiredMixin, View):
             leverage = int(data.get('leverage', 1))  # 1-5 pour margin
             
             if not symbol or quantity <= 0 or price <= 0:
-                return JsonResponse({
+                return FastJsonResponse({
                     'success': False,
                     'error': 'Données invalides'
                 }, status=400)
@@ -200,7 +202,7 @@ class BuyTradeView(LoginRequiredMixin, View):
             if account_type == 'margin' and leverage > 1:
                 can_trade, error_msg = check_margin_requirement(account, quantity, price, leverage)
                 if not can_trade:
-                    return JsonResponse({
+                    return FastJsonResponse({
                         'success': False,
                         'error': error_msg
                     }, status=400)
@@ -215,7 +217,7 @@ class BuyTradeView(LoginRequiredMixin, View):
             
             # Vérifier le solde
             if account.balance < required_margin:
-                return JsonResponse({
+                return FastJsonResponse({
                     'success': False,
                     'error': f'Fonds insuffisants. Solde: ${account.balance:.2f}, Requis: ${required_margin:.2f}'
                 }, status=400)
@@ -281,15 +283,15 @@ class BuyTradeView(LoginRequiredMixin, View):
                 response_data['leverage'] = leverage
                 response_data['margin_warning'] = f"Attention: Prix de liquidation estimé: ${float(liquidation_price):.2f}"
             
-            return JsonResponse(response_data)
+            return FastJsonResponse(response_data)
             
         except json.JSONDecodeError:
-            return JsonResponse({
+            return FastJsonResponse({
                 'success': False,
                 'error': 'JSON invalide'
             }, status=400)
         except Exception as e:
-            return JsonResponse({
+            return FastJsonResponse({
                 'success': False,
                 'error': str(e)
             }, status=500)
@@ -306,7 +308,7 @@ class SellTradeView(LoginRequiredMixin, View):
             profile = _get_or_create_profile(request)
             
             # Parser les données JSON
-            data = json.loads(request.body)
+            data = json_codec.loads(request.body)
             symbol = data.get('symbol', '').upper().strip()
             quantity = Decimal(str(data.get('quantity', 0)))
             price = Decimal(str(data.get('price', 0)))
@@ -314,7 +316,7 @@ class SellTradeView(LoginRequiredMixin, View):
             leverage = int(data.get('leverage', 1))
             
             if not symbol or quantity <= 0 or price <= 0:
-                return JsonResponse({
+                return FastJsonResponse({
                     'success': False,
                     'error': 'Données invalides'
                 }, status=400)
@@ -329,7 +331,7 @@ class SellTradeView(LoginRequiredMixin, View):
             ).first()
             
             if not portfolio_item or portfolio_item.quantity < quantity:
-                return JsonResponse({
+                return FastJsonResponse({
                     'success': False,
                     'error': f'Quantité insuffisante. Vous possédez: {portfolio_item.quantity if portfolio_item else 0} {symbol}'
                 }, status=400)
@@ -384,7 +386,7 @@ class SellTradeView(LoginRequiredMixin, View):
             # Enregistrer l'historique
             record_wallet_history(account)
             
-            return JsonResponse({
+            return FastJsonResponse({
                 'success': True,
                 'message': f'Vente de {quantity} {symbol} effectuée avec succès',
                 'new_balance': float(account.balance),
@@ -393,12 +395,12 @@ class SellTradeView(LoginRequiredMixin, View):
             })
             
         except json.JSONDecodeError:
-            return JsonResponse({
+            return FastJsonResponse({
                 'success': False,
                 'error': 'JSON invalide'
             }, status=400)
         except Exception as e:
-            return JsonResponse({
+            return FastJsonResponse({
                 'success': False,
                 'error': str(e)
             }, status=500)
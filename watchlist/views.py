@@ -1,5 +1,4 @@
 from django.shortcuts import render, redirect, get_object_or_404
-from django.http import JsonResponse
 from django.views import View
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
@@ -8,6 +7,8 @@ from django.contrib.auth.mixins import LoginRequiredMixin
 from accounts.models import UserProfile
 from .models import Watchlist, Portfolio
 from api_services.binance_service import BinanceAPIService
+from api_services import json_codec
+from api_services.json_codec import FastJsonResponse
 
 import json
 
@@ -45,8 +46,11 @@ class WatchlistView(LoginRequiredMixin, View):
         watchlist_items = Watchlist.objects.filter(user_profile=profile)
         watchlist_data = []
 
+        # Un seul appel amont pour la watchlist et le portfolio
+        snapshot = BinanceAPIService.get_ticker_snapshot()
+
         for item in watchlist_items:
-            ticker = BinanceAPIService.get_24hr_ticker(item.symbol)
+            ticker = snapshot.get(item.symbol)
             if ticker:
                 watchlist_data.append({
                     'id': item.id,
@@ -66,9 +70,9 @@ class WatchlistView(LoginRequiredMixin, View):
         total_profit_loss = 0.0
 
         for item in portfolio_items:
-            ticker = BinanceAPIService.get_24hr_ticker(item.symbol)
+            ticker = snapshot.get(item.symbol)
             if ticker:
-                current_price = float(ticker.get('lastPrice', '0') or 0)
+                current_price = json_codec.number(ticker.get('lastPrice'))
                 current_value = item.current_value(current_price)
                 profit_loss = item.profit_loss(current_price)
                 profit_loss_pct = item.profit_loss_percent(current_price)
@@ -114,23 +118,23 @@ class AddToWatchlistView(LoginRequiredMixin, View):
         try:
             profile = _get_or_create_profile(request)
 
-            data = json.loads(request.body or '{}')
+            data = json_codec.loads(request.body or '{}')
             symbol = (data.get('symbol') or '').upper().strip()
 
             if not symbol:
-                return JsonResponse({'error': 'Symbole requis'}, status=400)
+                return FastJsonResponse({'error': 'Symbole requis'}, status=400)
 
             # Déjà présent ?
             if Watchlist.objects.filter(user_profile=profile, symbol=symbol).exists():
-                return JsonResponse({'error': 'Déjà dans la watchlist'}, status=400)
+                return FastJsonResponse({'error': 'Déjà dans la watchlist'}, status=400)
 
             Watchlist.objects.create(user_profile=profile, symbol=symbol)
-            return JsonResponse({'success': True, 'message': 'Ajouté à la watchlist'})
+            return FastJsonResponse({'success': True, 'message': 'Ajouté à la watchlist'})
 
         except json.JSONDecodeError:
-            return JsonResponse({'error': 'JSON invalide'}, status=400)
+            return FastJsonResponse({'error': 'JSON invalide'}, status=400)
         except Exception as e:
-            return JsonResponse({'error': str(e)}, status=500)
+            return FastJsonResponse({'error': str(e)}, status=500)
 
 
 class RemoveFromWatchlistView(LoginRequiredMixin, View):
@@ -148,9 +152,9 @@ class RemoveFromWatchlistView(LoginRequiredMixin, View):
             profile = _get_or_create_profile(request)
             watchlist_item = get_object_or_404(Watchlist, id=watchlist_id, user_profile=profile)
             watchlist_item.delete()
-            return JsonResponse({'success': True, 'message': 'Retiré de la watchlist'})
+            return FastJsonResponse({'success': True, 'message': 'Retiré de la watchlist'})
         except Exception as e:
-            return JsonResponse({'error': str(e)}, status=500)
+            return FastJsonResponse({'error': str(e)}, status=500)
 
 
 class AddToPortfolioView(LoginRequiredMixin, View):
@@ -167,16 +171,16 @@ class AddToPortfolioView(LoginRequiredMixin, View):
         try:
             profile = _get_or_create_profile(request)
 
-            data = json.loads(request.body or '{}')
+            data = json_codec.loads(request.body or '{}')
             symbol = (data.get('symbol') or '').upper().strip()
             quantity = float(data.get('quantity') or 0)
             purchase_price = float(data.get('purchase_price') or 0)
             notes = data.get('notes') or ''
 
             if not symbol:
-                return JsonResponse({'error': 'Symbole requis'}, status=400)
+                return FastJsonResponse({'error': 'Symbole requis'}, status=400)
             if quantity <= 0 or purchase_price <= 0:
-                return JsonResponse({'error': 'Quantité et prix doivent être > 0'}, status=400)
+                return FastJsonResponse({'error': 'Quantité et prix doivent être > 0'}, status=400)
 
             Portfolio.objects.create(
                 user_profile=profile,
@@ -186,12 +190,12 @@ class AddToPortfolioView(LoginRequiredMixin, View):
                 notes=notes
             )
 
-            return JsonResponse({'success': True, 'message': 'Ajouté au portfolio'})
+            return FastJsonResponse({'success': True, 'message': 'Ajouté au portfolio'})
 
         except json.JSONDecodeError:
-            return JsonResponse({'error': 'JSON invalide'}, status=400)
+            return FastJsonResponse({'error': 'JSON invalide'}, status=400)
         except Exception as e:
-            return JsonResponse({'error': str(e)}, status=500)
+            return FastJsonResponse({'error': str(e)}, status=500)
 
 
 class RemoveFromPortfolioView(LoginRequiredMixin, View):
@@ -209,6 +213,6 @@ class RemoveFromPortfolioView(LoginRequiredMixin, View):
             profile = _get_or_create_profile(request)
             portfolio_item = get_object_or_404(Portfolio, id=portfolio_id, user_profile=profile)
             portfolio_item.delete()
-            return JsonResponse({'success': True, 'message': 'Retiré du portfolio'})
+            return FastJsonResponse({'success': True, 'message': 'Retiré du portfolio'})
         except Exception as e:
-            return JsonResponse({'error': str(e)}, status=500)
\ No newline at end of file
+            return FastJsonResponse({'error': str(e)}, status=500)
\ No newline at end of file